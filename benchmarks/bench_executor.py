@@ -0,0 +1,212 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Benchmarks of the hopla client-side overhead.
+
+The suites are written for `asv <https://asv.readthedocs.io>`_ and run
+against the simulated scheduler of the 'local' cluster type, so that only
+the hopla costs are measured:
+
+.. code-block:: bash
+
+    asv run --bench bench_executor
+"""
+
+import json
+import shutil
+import tempfile
+
+import hopla
+from hopla.ccc import DelayedCCCJob
+from hopla.config import Config
+from hopla.local import SimulatedScheduler
+from hopla.pbs import PbsInfoWatcher
+from hopla.slurm import SlurmInfoWatcher
+
+N_JOBS = [1000, 10000, 100000]
+
+
+class OfflineCCCJob(DelayedCCCJob):
+    """ CCC job that does not check the image availability on the hub.
+    """
+    def import_image(self):
+        pass
+
+
+def make_executor(cluster, folder, **kwargs):
+    """ Create an executor that does not require any batch system.
+    """
+    if cluster == "local":
+        kwargs.setdefault("scheduler", SimulatedScheduler())
+    image = f"{folder}/my-img.simg"
+    with open(image, "w"):
+        pass
+    executor = hopla.Executor(
+        cluster=cluster,
+        folder=folder,
+        queue="bench",
+        image=image,
+        project_id="bench",
+        **kwargs
+    )
+    if cluster == "ccc":
+        executor._job_class = OfflineCCCJob
+    return executor
+
+
+class ExecutorSuite:
+    """ Base suite managing a temporary execution folder.
+
+    Each timed call consumes its setup, hence a single call per sample.
+    """
+    timeout = 600
+    number = 1
+    repeat = 3
+    warmup_time = 0
+
+    def setup(self, *args):
+        self.folder = tempfile.mkdtemp(prefix="hopla-bench-")
+
+    def teardown(self, *args):
+        shutil.rmtree(self.folder, ignore_errors=True)
+
+
+class SubmitSuite(ExecutorSuite):
+    """ Cost of the delayed jobs construction.
+    """
+    params = N_JOBS
+    param_names = ["n_jobs"]
+
+    def setup(self, n_jobs):
+        super().setup(n_jobs)
+        self.executor = make_executor("local", self.folder)
+
+    def time_submit(self, n_jobs):
+        for idx in range(n_jobs):
+            self.executor.submit("sleep", idx, execution_parameters="-e")
+
+    def peakmem_submit(self, n_jobs):
+        for idx in range(n_jobs):
+            self.executor.submit("sleep", idx, execution_parameters="-e")
+
+
+class GenerateBatchSuite(ExecutorSuite):
+    """ Throughput of the batch files generation for each backend.
+    """
+    params = (["slurm", "pbs", "ccc", "local"], N_JOBS)
+    param_names = ["cluster", "n_jobs"]
+
+    def setup(self, cluster, n_jobs):
+        super().setup(cluster, n_jobs)
+        self.executor = make_executor(cluster, self.folder)
+        self.jobs = [
+            self.executor.submit("sleep", idx) for idx in range(n_jobs)
+        ]
+
+    def time_generate_batch(self, cluster, n_jobs):
+        for job in self.jobs:
+            job.generate_batch()
+
+
+class ReadInfoSuite:
+    """ Parse time of large scheduler status payloads.
+    """
+    params = (["slurm", "pbs"], N_JOBS)
+    param_names = ["cluster", "n_jobs"]
+
+    def setup(self, cluster, n_jobs):
+        if cluster == "slurm":
+            self.watcher_class = SlurmInfoWatcher
+            scheduler = SimulatedScheduler()
+            for _ in range(n_jobs):
+                scheduler._counter += 1
+                scheduler._jobs[str(scheduler._counter)] = {
+                    "name": "hopla", "stdout": None, "stderr": None,
+                    "state": "RUNNING", "submit": 0, "start": 0,
+                    "end": 2 ** 31, "returncode": 0,
+                }
+            self.payload = scheduler.squeue(list(scheduler._jobs)).encode()
+        else:
+            self.watcher_class = PbsInfoWatcher
+            self.payload = json.dumps({
+                "pbs_version": "2022.1.1",
+                "Jobs": {
+                    f"{idx}.pbsserver": {
+                        "Job_Name": "hopla",
+                        "job_state": "R",
+                        "queue": "bench",
+                        "exec_host": "node001/0",
+                        "qtime": "Mon Jan  1 00:00:00 2024",
+                        "stime": "Mon Jan  1 00:01:00 2024",
+                    }
+                    for idx in range(n_jobs)
+                }
+            }).encode()
+
+    def time_read_info(self, cluster, n_jobs):
+        self.watcher_class.read_info(self.payload)
+
+
+class CallSuite(ExecutorSuite):
+    """ Overhead of the executor submission/monitoring loop.
+    """
+    params = N_JOBS
+    param_names = ["n_jobs"]
+    max_jobs = 1000
+    delay_s = 0.01
+
+    def setup(self, n_jobs):
+        super().setup(n_jobs)
+        self.executor = make_executor("local", self.folder)
+        for idx in range(n_jobs):
+            self.executor.submit("sleep", idx)
+
+    def time_call(self, n_jobs):
+        with Config(delay_s=self.delay_s):
+            self.executor(max_jobs=self.max_jobs)
+
+
+class TickSuite(ExecutorSuite):
+    """ Overhead of one iteration of the executor loop while all jobs are
+    in flight: a status refresh followed by the submission checks.
+    """
+    params = N_JOBS
+    param_names = ["n_jobs"]
+
+    def setup(self, n_jobs):
+        super().setup(n_jobs)
+        self.executor = make_executor(
+            "local", self.folder, scheduler=SimulatedScheduler(runtime=3600))
+        for idx in range(n_jobs):
+            self.executor.submit("sleep", idx)
+        self.executor._tick(max_jobs=n_jobs)
+
+    def time_tick(self, n_jobs):
+        self.executor.watcher.update()
+        self.executor._tick(max_jobs=n_jobs)
+
+
+class ReportSuite(ExecutorSuite):
+    """ Cost of the final report generation.
+    """
+    params = N_JOBS
+    param_names = ["n_jobs"]
+
+    def setup(self, n_jobs):
+        super().setup(n_jobs)
+        self.executor = make_executor(
+            "local", self.folder, scheduler=SimulatedScheduler(
+                failure_rate=0.1, seed=42))
+        for idx in range(n_jobs):
+            self.executor.submit("sleep", idx)
+        with Config(delay_s=0):
+            self.executor(max_jobs=n_jobs)
+
+    def time_report(self, n_jobs):
+        self.executor.report
@@ -7,9 +7,11 @@ CCC-based cluster - flux
 When you're running hundreds or thousands of jobs, automation is a necessity. 
 This is where ``hopla`` can help you.
 
-A simple example of how to use ``hopla`` on a CCC cluster. Please check
-the :ref:`user guide <user_guide>` for a more in depth presentation of all
-functionalities.
+A simple example of how to use ``hopla`` on a CCC cluster. The tasks of
+each job are submitted to the Flux instance of the allocation by a driver
+that keeps a bounded number of tasks in flight and writes the status of
+each task. Please check the :ref:`user guide <user_guide>` for a more in
+depth presentation of all functionalities.
 
 
 Imports
@@ -75,3 +77,25 @@ from hopla.config import Config
 with Config(dryrun=True, delay_s=3):
     executor(max_jobs=2)
     print(executor.report)
+
+
+# %%
+# Tasks Status
+# ------------
+#
+# The driver writes the identifier, return code, runtime and node of each
+# finished task in the `status.tsv` file of the job flux folder, which is
+# read by the report. Without the Flux Python bindings, the driver runs the
+# tasks on the current node: here, we run it with a few shell commands.
+
+import subprocess
+import sys
+
+with open(tasks, "w") as of:
+    of.write("echo task0\necho task1\nexit 3\n")
+subprocess.run([
+    sys.executable, str(jobs[0].paths.worker_file), str(tasks),
+    str(jobs[0].paths.flux_dir), "--max-in-flight", "2"
+])
+pprint(jobs[0].task_status())
+print("\n".join(jobs[0].sub_report()))
@@ -0,0 +1,67 @@
+"""
+Basic example on how to use the simulated local cluster
+=======================================================
+
+Local cluster - simulated scheduler
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to use ``hopla`` without any batch system. The jobs
+are handled by an in-process scheduler that simulates the submission latency,
+the queue wait, the job runtimes and some failures. This is convenient to
+test a campaign or to measure the ``hopla`` overhead. Please check
+the :ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.local import SimulatedScheduler
+from pprint import pprint
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="/tmp/hopla/my-apptainer-img.simg",
+    walltime=1,
+    scheduler=SimulatedScheduler(
+        queue_wait=(0, 0.5),
+        runtime=(0.5, 1.5),
+        failure_rate=0.2,
+        seed=42,
+    ),
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 21)
+]
+pprint(jobs[:2])
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# The simulated scheduler outputs the same information as ``squeue --json``.
+
+from hopla.config import Config
+
+with Config(delay_s=0.5):
+    executor(max_jobs=5)
+print(executor.scheduler.squeue([jobs[0].submission_id]))
+print(executor.report)
@@ -0,0 +1,65 @@
+"""
+Adapt the number of concurrent submissions
+==========================================
+
+Local cluster - adaptive concurrency
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to let ``hopla`` adapt the maximum number of
+concurrent submissions to the scheduler feedback: the limit grows while
+the submitted jobs start quickly, and shrinks when they pile up in the
+queue. Here, the local scheduler only runs four jobs at a time. Please
+check the :ref:`user guide <user_guide>` for a more in depth presentation
+of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+from hopla.local import LocalScheduler
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    scheduler=LocalScheduler(n_workers=4),
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    executor.submit("sleep", 0.2) for _ in range(40)
+]
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# The limit is bounded between 2 and 40 jobs, and at most 2 pending jobs
+# are tolerated in the queue.
+
+controller = hopla.AdaptiveConcurrency(
+    min_jobs=2,
+    max_jobs=40,
+    max_pending=2,
+    max_wait_s=1,
+)
+with Config(delay_s=0.1):
+    executor(max_jobs=controller)
+print(controller)
+print(executor.status)
@@ -0,0 +1,73 @@
+"""
+Basic example on how to drive executors from asyncio
+====================================================
+
+Local cluster - asyncio
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to drive several ``hopla`` executors from a single
+`asyncio` event loop. The submissions and the status queries never block the
+loop, so that the executors and any other I/O are multiplexed. Please check
+the :ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import asyncio
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executors Context
+# -----------------
+
+executors = [
+    hopla.Executor(
+        cluster="local",
+        folder=f"/tmp/hopla/async_{idx}",
+        queue="local",
+        image="",
+    )
+    for idx in range(2)
+]
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    [executor.submit("sleep", k / 10) for k in range(1, 6)]
+    for executor in executors
+]
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# The first executor jobs are consumed as they finish, while the second
+# executor jobs are simply awaited.
+
+async def main():
+    runs = [
+        asyncio.create_task(executor.run(max_jobs=2))
+        for executor in executors
+    ]
+    async for job in executors[0].as_completed():
+        print(f"job {job.job_id} finished: {job.exitcode}")
+    finished = await asyncio.gather(*jobs[1])
+    print([job.exitcode for job in finished])
+    await asyncio.gather(*runs)
+
+
+with Config(delay_s=0.2):
+    asyncio.run(main())
+print(executors[1].report)
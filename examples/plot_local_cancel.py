@@ -0,0 +1,61 @@
+"""
+Cancel a running campaign
+=========================
+
+Local cluster - cancellation
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to cancel, or signal, a part of a running campaign
+with ``hopla``. The scheduler is called with as many jobs as the command
+line length allows, and the canceled jobs are recorded by the executor.
+Please check the :ref:`user guide <user_guide>` for a more in depth
+presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    executor.submit("sleep", 1 if k % 2 else 60) for k in range(1, 7)
+]
+
+
+# %%
+# Cancel Jobs
+# -----------
+#
+# The jobs are started, then the long ones are canceled. With
+# ``signal="USR1"``, the selected jobs would receive a signal instead,
+# e.g. to trigger a checkpoint.
+
+with Config(delay_s=0.2):
+    hopla.wait(jobs, timeout=0.5)
+    canceled = executor.cancel(filter=lambda job: job.job_id % 2 == 0)
+    print([job.job_id for job in canceled])
+    executor()
+print(executor.status)
+print([job.cancelled() for job in jobs])  # codespell:ignore
+print(executor.report)
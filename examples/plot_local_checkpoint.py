@@ -0,0 +1,87 @@
+"""
+Continue the jobs reaching their walltime
+=========================================
+
+Local cluster - checkpoint
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to let ``hopla`` continue the jobs that would be
+killed at their walltime: with the checkpoint protocol, the command
+receives SIGUSR1 before the walltime, saves its state and exits. The job
+is then automatically resubmitted, possibly with a short walltime fitting
+the backfill windows, and the command resumes from its saved state. On
+SLURM and CCC clusters, the signal is requested from the scheduler, here
+it is sent by a timer. Please check the :ref:`user guide <user_guide>` for
+a more in depth presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+from pathlib import Path
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# A Resumable Command
+# -------------------
+#
+# The command counts up to a target, saving its progress when it receives
+# SIGUSR1, and exits with a non-zero code until the work is complete.
+
+script = Path("/tmp/hopla/count.py")
+script.parent.mkdir(parents=True, exist_ok=True)
+script.write_text("""
+import signal, sys, time
+from pathlib import Path
+
+state = Path(sys.argv[1])
+count = int(state.read_text()) if state.exists() else 0
+
+def checkpoint(signum, frame):
+    state.write_text(str(count))
+    print(f"checkpoint at {count}")
+    sys.exit(85)
+
+signal.signal(signal.SIGUSR1, checkpoint)
+while count < 30:
+    time.sleep(0.1)
+    count += 1
+print(f"done at {count}")
+""")
+
+
+# %%
+# Executor Context
+# ----------------
+#
+# The one hour walltime and a checkpoint one second after the start
+# emulate a long job.
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    walltime=1,
+    checkpoint=3600 - 1,
+    max_restarts=5,
+)
+state = Path("/tmp/hopla/count.state")
+state.unlink(missing_ok=True)
+job = executor.submit("python3", script, state)
+
+
+# %%
+# Run Jobs
+# --------
+
+with Config(delay_s=0.2):
+    executor(max_jobs=1)
+print(f"restarts: {job.restarts}")
+print(job.read_stdout())
@@ -0,0 +1,85 @@
+"""
+Basic example on how to chain jobs with dependencies
+====================================================
+
+Local cluster - dependencies
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to describe a pipeline as a graph of jobs: a
+downstream job becomes eligible the moment its own inputs finish. On Slurm,
+CCC and PBS clusters, the dependencies are delegated to the scheduler
+(``afterok``) so that jobs are released without a polling round-trip.
+Please check the :ref:`user guide <user_guide>` for a more in depth
+presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+#
+# A preprocessing, an analysis for each subject, and group statistics. The
+# analysis of the third subject fails, hence the group statistics are never
+# started.
+
+subjects = ["sub-01", "sub-02", "sub-03"]
+preproc_jobs = [
+    executor.submit("sleep", 0.1 * (idx + 1)) for idx in range(len(subjects))
+]
+analysis_jobs = [
+    executor.submit("echo", subject, after=[job])
+    for subject, job in zip(subjects[:2], preproc_jobs[:2])
+]
+analysis_jobs.append(
+    executor.submit("ls", "/nonexistent", after=[preproc_jobs[2]])
+)
+group_job = executor.submit("echo", "group", after=analysis_jobs)
+
+
+# %%
+# Start Jobs
+# ----------
+
+with Config(delay_s=0.2):
+    executor(max_jobs=10)
+print([job.exitcode for job in analysis_jobs])
+print(group_job.report)
+
+
+# %%
+# Scheduler-native Dependencies
+# -----------------------------
+#
+# On a Slurm cluster, the dependencies are passed to the submission command.
+
+slurm_executor = hopla.Executor(
+    cluster="slurm",
+    folder="/tmp/hopla/slurm",
+    queue="Nspin_short",
+    image="/tmp/hopla/my-apptainer-img.simg",
+)
+job = slurm_executor.submit("sleep", 1)
+child_job = slurm_executor.submit("sleep", 2, after=[job])
+job.submission_id = "1234"
+print(child_job.submission_options)
@@ -0,0 +1,57 @@
+"""
+Collapse duplicate submissions
+==============================
+
+Local cluster - deduplication
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to avoid running the same command twice with
+``hopla``: with the ``dedup`` option, submitting a job identical to a
+previous one returns the previous job. The duplicates share its status and
+logs, and are summarized in the report. Please check the
+:ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    dedup=True,
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+#
+# The inputs contain duplicated rows, as a TSV file often does.
+
+inputs = [0.1, 0.2, 0.1, 0.3, 0.2, 0.1]
+jobs = [executor.submit("sleep", k) for k in inputs]
+print(executor.n_jobs, len(jobs))
+print(jobs[0] is jobs[2])
+
+
+# %%
+# Start Jobs
+# ----------
+
+with Config(delay_s=0.2):
+    executor(max_jobs=2)
+print(executor.report)
@@ -0,0 +1,64 @@
+"""
+Basic example on how to execute jobs on the local machine
+=========================================================
+
+Local cluster - process pool
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to use ``hopla`` on a machine without any batch
+system. The jobs are executed by a pool of workers sized by the number of
+available cores and the number of cores requested for each job. The same
+logs are produced as on a cluster, which is convenient for debugging and for
+quick sweeps. Please check the :ref:`user guide <user_guide>` for a more in
+depth presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from pprint import pprint
+
+
+# %%
+# Executor Context
+# ----------------
+#
+# Without any image, the commands are executed directly on the host.
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    n_cpus=1,
+)
+print(executor.scheduler)
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    executor.submit("sleep", k / 10) for k in range(1, 11)
+]
+jobs.append(executor.submit("ls", "/nonexistent"))
+pprint(jobs[:2])
+
+
+# %%
+# Start Jobs
+# ----------
+
+from hopla.config import Config
+
+with Config(delay_s=0.5):
+    executor(max_jobs=4)
+print(executor.report)
+print([job.exitcode for job in jobs])
+with open(jobs[-1].paths.stderr) as of:
+    print(of.read())
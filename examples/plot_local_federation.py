@@ -0,0 +1,72 @@
+"""
+Route jobs across several clusters
+==================================
+
+Local cluster - federation
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to spread a campaign over several backends with
+``hopla``: each job is routed, when it is started, to the backend with the
+shortest expected start time. Here, two simulated clusters are used: the
+first one has a long queue wait, the second one is more limited but starts
+the jobs quickly. Please check the :ref:`user guide <user_guide>` for a
+more in depth presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+from hopla.local import SimulatedScheduler
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.FederatedExecutor(
+    folder="/tmp/hopla",
+    profiles=[
+        {
+            "cluster": "local",
+            "queue": "slow",
+            "image": "",
+            "scheduler": SimulatedScheduler(queue_wait=1, runtime=0.2),
+            "max_jobs": 10,
+        },
+        {
+            "cluster": "local",
+            "queue": "fast",
+            "image": "",
+            "scheduler": SimulatedScheduler(queue_wait=0, runtime=0.2),
+            "max_jobs": 5,
+        },
+    ],
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 41)
+]
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# Once the queue waits are observed, most of the jobs are routed to the
+# fast backend.
+
+with Config(delay_s=0.2):
+    executor()
+print(executor.status)
+print([job.backend for job in jobs])
+print(jobs[0].report)
@@ -0,0 +1,66 @@
+"""
+Basic example on how to collect the jobs results as they finish
+===============================================================
+
+Local cluster - futures
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to use the ``concurrent.futures``-like interface of
+the ``hopla`` jobs. Downstream steps can start the moment each job
+completes instead of after the whole batch. Please check the
+:ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+#
+# A quality check job is submitted as soon as each job finishes.
+
+jobs = [
+    executor.submit("sleep", k / 10) for k in range(1, 6)
+]
+jobs.append(executor.submit("ls", "/nonexistent"))
+qc_jobs = []
+for job in jobs:
+    job.add_done_callback(
+        lambda job: qc_jobs.append(executor.submit("echo", "QC", job.job_id))
+    )
+
+
+# %%
+# Collect Results
+# ---------------
+#
+# Waiting on the jobs drives the executor.
+
+with Config(delay_s=0.2):
+    for job in hopla.as_completed(jobs):
+        error = job.exception()
+        print(f"job {job.job_id}: {error or job.result()}")
+    done, not_done = hopla.wait(qc_jobs)
+    print(f"{len(done)} QC jobs done, {len(not_done)} not done")
+print(qc_jobs[0].result().read_text())
@@ -0,0 +1,71 @@
+"""
+Exclude the failing nodes
+=========================
+
+Local cluster - node tracking
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to let ``hopla`` avoid the nodes where the jobs
+keep failing, e.g. because of a broken GPU driver or a full /tmp: the
+failure rate of each node is tracked from the finished jobs, and the
+failing nodes are excluded from the next submissions, including the
+continuations and resubmissions. Please check the
+:ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Track the Nodes
+# ---------------
+#
+# The local cluster runs all the jobs on the current node: a node is
+# excluded from two failures and a failure rate of one half.
+
+tracker = hopla.NodeTracker(max_failures=2, failure_rate=0.5)
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    exclude_nodes=tracker,
+)
+jobs = [executor.submit("false") for _ in range(3)]
+jobs += [executor.submit("true")]
+
+with Config(delay_s=0.2):
+    executor(max_jobs=4)
+print(tracker)
+print(executor.report)
+
+
+# %%
+# Exclude the Nodes
+# -----------------
+#
+# A tracker can be shared by several executors: on SLURM and CCC clusters,
+# the excluded nodes are passed to the scheduler.
+#
+# We can't execute the code on the CI since the SLURM infrastructure is
+# not available.
+
+executor = hopla.Executor(
+    cluster="slurm",
+    folder="/tmp/hopla/slurm",
+    queue="Nspin_short",
+    image="/tmp/hopla/my-apptainer-img.simg",
+    exclude_nodes=tracker,
+)
+job = executor.submit("sleep", 1)
+
+with Config(dryrun=True, delay_s=0.2):
+    executor(max_jobs=1)
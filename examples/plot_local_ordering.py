@@ -0,0 +1,73 @@
+"""
+Order the waiting jobs
+======================
+
+Local cluster - ordering policies
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to choose the order in which ``hopla`` starts the
+waiting jobs: if the longest jobs happen to be submitted last, the
+campaign ends long after the other jobs. Starting the longest jobs first
+(LPT) shortens the campaign, while starting the shortest jobs first (SPT)
+gives a fast feedback. The expected runtimes are given at submission or
+learned from the finished jobs running the same script. Please check the
+:ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import time
+
+import hopla
+from hopla.config import Config
+from hopla.local import LocalScheduler
+
+
+# %%
+# Run a Campaign
+# --------------
+#
+# The local scheduler runs two jobs at a time, and the longest job is
+# submitted last.
+
+def run_campaign(order):
+    executor = hopla.Executor(
+        cluster="local",
+        folder="/tmp/hopla",
+        queue="local",
+        image="",
+        scheduler=LocalScheduler(n_workers=2),
+        order=order,
+    )
+    for duration in (0.2, 0.2, 0.2, 0.2, 1.):
+        executor.submit("sleep", duration, expected_runtime=duration)
+    start = time.time()
+    with Config(delay_s=0.05):
+        executor(max_jobs=2)
+    return executor, time.time() - start
+
+
+# %%
+# Compare the Policies
+# --------------------
+
+for order in ("fifo", "lpt"):
+    executor, elapsed = run_campaign(order)
+    print(f"{order}: {elapsed:.1f}s")
+
+
+# %%
+# Learned Runtimes
+# ----------------
+#
+# Without `expected_runtime`, the 'lpt' and 'spt' policies use the mean
+# runtime of the finished jobs running the same script, or the runtimes
+# of a previous campaign.
+
+policy = hopla.RuntimeOrder(longest_first=False, runtimes={"sleep": 0.2})
+print(policy)
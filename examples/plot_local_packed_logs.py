@@ -0,0 +1,79 @@
+"""
+Pack the logs of the finished jobs
+==================================
+
+Local cluster - packed logs
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to avoid leaving two log files per job with
+``hopla``: the logs of the finished jobs are packed in large indexed segment
+files, and read back transparently by the jobs and the reports. Please
+check the :ref:`user guide <user_guide>` for a more in depth presentation of
+all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executor Context
+# ----------------
+#
+# Use ``pack_logs="zstd"`` to also compress the logs when the
+# ``zstandard`` package is installed.
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    n_cpus=1,
+    pack_logs=True,
+)
+print(executor.log_store)
+
+
+# %%
+# Start Jobs
+# ----------
+
+jobs = [
+    executor.submit("echo", f"task {k}") for k in range(1, 11)
+]
+jobs.append(executor.submit("ls", "/nonexistent"))
+with Config(delay_s=0.2):
+    executor(max_jobs=4)
+
+
+# %%
+# Read the Logs
+# -------------
+#
+# The logs folder only contains the packed store.
+
+print(sorted(path.name for path in executor.log_store.folder.parent.iterdir()))
+print(sorted(path.name for path in executor.log_store.folder.iterdir()))
+print(jobs[0].log_location("stdout"))
+print(jobs[0].tail(2))
+print(jobs[-1].read_stderr())
+print([job.exitcode for job in jobs])
+print(executor.report)
+
+
+# %%
+# Futures
+# -------
+#
+# The result of a job is the location of its standard output in the store,
+# and the exception of a failed job refers to its packed standard error.
+
+stdout = jobs[0].result()
+print(stdout)
+print(jobs[-1].exception())
@@ -0,0 +1,67 @@
+"""
+Follow the progress of a campaign
+=================================
+
+Local cluster - progress dashboard
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to follow the progress of a campaign with
+``hopla``: the executor displays three bars, for the submitted, running and
+finished jobs, followed by the number of failures, the throughput, the
+median and 90th percentile of the queue waits and runtimes, and the
+expected remaining time. The dashboard is updated from the job state
+changes only, so that its cost does not grow with the number of jobs.
+Please check the :ref:`user guide <user_guide>` for a more in depth
+presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+from hopla.local import SimulatedScheduler
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    scheduler=SimulatedScheduler(
+        queue_wait=(0, 0.3),
+        runtime=(0.2, 0.6),
+        failure_rate=0.2,
+        seed=42,
+    ),
+)
+
+
+# %%
+# Run Jobs
+# --------
+#
+# In verbose mode, a one line summary is also printed at each iteration.
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 21)
+]
+with Config(delay_s=0.2, verbose=True):
+    executor(max_jobs=5)
+
+
+# %%
+# Final Statistics
+# ----------------
+#
+# The last dashboard remains available once the executor returns.
+
+print(executor.progress.summary)
+print(executor.progress.counts)
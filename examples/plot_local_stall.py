@@ -0,0 +1,89 @@
+"""
+Handle the stalled jobs
+=======================
+
+Local cluster - stall monitor
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to let ``hopla`` handle the jobs that hang, e.g. on
+a stuck NFS mount or a deadlocked tool, instead of holding a slot until
+their walltime: the stall monitor flags the running jobs whose logs, or
+heartbeat file, did not change for longer than a multiple of the median
+runtime of the finished jobs. A stalled job is reported, canceled and
+resubmitted, or duplicated, the first copy to succeed being kept. Please
+check the :ref:`user guide <user_guide>` for a more in depth presentation
+of all functionalities.
+
+
+Imports
+-------
+"""
+
+from pathlib import Path
+
+import hopla
+from hopla.config import Config
+from hopla.local import LocalScheduler
+from hopla.monitor import StallMonitor
+
+
+# %%
+# A Flaky Command
+# ---------------
+#
+# The command touches its heartbeat file while working. The first run of
+# a flaky job hangs silently, the next runs complete.
+
+script = Path("/tmp/hopla/flaky.py")
+script.parent.mkdir(parents=True, exist_ok=True)
+script.write_text("""
+import os, sys, time
+from pathlib import Path
+
+marker = Path(sys.argv[1])
+heartbeat = Path(os.environ["HOPLA_HEARTBEAT"])
+if sys.argv[2] == "1" and not marker.exists():
+    marker.touch()
+    time.sleep(60)
+for _ in range(3):
+    heartbeat.touch()
+    time.sleep(0.1)
+print("done")
+""")
+
+
+# %%
+# Executor Context
+# ----------------
+#
+# The monitor uses the heartbeat files, and launches a speculative
+# duplicate of the jobs making no progress for three times the median
+# runtime, and at least one second.
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    scheduler=LocalScheduler(n_workers=5),
+    monitor=StallMonitor(factor=3, min_stall=1, action="speculate",
+                         heartbeat=True, interval=0.2),
+)
+jobs = []
+for idx in range(4):
+    marker = Path(f"/tmp/hopla/flaky_{idx}")
+    marker.unlink(missing_ok=True)
+    jobs.append(executor.submit("python3", script, marker, int(idx == 0)))
+
+
+# %%
+# Run Jobs
+# --------
+
+with Config(delay_s=0.2):
+    executor(max_jobs=4)
+print(executor.monitor)
+print([job.exitcode for job in jobs])
+print(executor.report)
@@ -0,0 +1,55 @@
+"""
+Check the state of a campaign
+=============================
+
+Local cluster - status
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to check the state of a campaign from another shell
+with ``hopla``: the executor records the job events in a journal of its
+folder, and the ``hoplacli status``, ``watch`` and ``report`` subcommands
+read it, querying the scheduler once for all the started jobs. Please check
+the :ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.cli import report, status
+from hopla.config import Config
+
+
+# %%
+# Run a Campaign
+# --------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    n_cpus=1,
+)
+jobs = [
+    executor.submit("sleep", k / 10) for k in range(1, 9)
+]
+jobs.append(executor.submit("ls", "/nonexistent"))
+print(executor.journal)
+with Config(delay_s=0.2):
+    executor(max_jobs=4)
+
+
+# %%
+# Inspect the Campaign
+# --------------------
+#
+# From a shell, run ``hoplacli status /tmp/hopla``: the functions below are
+# called by the subcommands.
+
+summary = status("/tmp/hopla")
+report("/tmp/hopla", n_lines=1)
@@ -0,0 +1,82 @@
+"""
+Use your own batch template
+===========================
+
+Local cluster - custom template
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to replace the cluster batch template with your own
+in ``hopla``. The template uses the ``str.format`` syntax: the executor
+parameters are rendered once, and only the job fields are rendered for each
+batch file. Please check the :ref:`user guide <user_guide>` for a more in
+depth presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+from hopla.templates import BatchTemplate
+
+
+# %%
+# Batch Template
+# --------------
+#
+# With the local cluster, the outputs are redirected with the ``#HOPLA``
+# directives. The first two lines of the standard output and the
+# ``HOPLASAY-DONE`` marker are used by the reports.
+
+template = BatchTemplate("""#!/bin/bash
+#HOPLA -J {name}
+#HOPLA -e {stderr}
+#HOPLA -o {stdout}
+
+echo $HOPLA_JOB_ID
+echo $HOSTNAME
+echo "Running on the '{queue}' queue with {ncpus} core(s)"
+
+{command} && echo "HOPLASAY-DONE"
+""")
+print(template)
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="local",
+    folder="/tmp/hopla",
+    queue="local",
+    image="",
+    template=template,
+)
+print(executor.template)
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    executor.submit("sleep", k / 10) for k in range(1, 5)
+]
+jobs[0].generate_batch()
+with open(jobs[0].paths.submission_file) as of:
+    print(of.read())
+
+
+# %%
+# Start Jobs
+# ----------
+
+with Config(delay_s=0.2):
+    executor(max_jobs=2)
+with open(jobs[0].paths.stdout) as of:
+    print(of.read())
+print(executor.report)
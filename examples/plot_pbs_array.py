@@ -0,0 +1,75 @@
+"""
+Array jobs on the PBS cluster
+=============================
+
+CCC-based cluster - PBS
+
+When you're running thousands of short jobs, the scheduler may be the
+bottleneck: each ``qsub`` call costs a scheduler round-trip and each job is
+tracked individually.
+
+A simple example of how to use ``hopla`` on a PBS cluster with array jobs:
+the jobs started at each iteration are packed in a single submission, and
+each job is mapped to a subjob that reads its command from an indexed task
+file. Please check the :ref:`user guide <user_guide>` for a more in depth
+presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from pprint import pprint
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="pbs",
+    folder="/tmp/hopla",
+    queue="Nspin_short",
+    image="/tmp/hopla/my-apptainer-img.simg",
+    walltime=1,
+    array=True,
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 11)
+]
+pprint(jobs[:2])
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# We can't execute the code on the CI since the PBS infrastructure is not
+# available.
+
+from hopla.config import Config
+
+with Config(dryrun=True, delay_s=0.1):
+    executor(max_jobs=5)
+
+
+# %%
+# Generated Files
+# ---------------
+#
+# The array batch file and its task file, one ``<job_id>\t<command>`` line
+# per subjob.
+
+batch = jobs[0].array_submission_file
+with open(batch) as of:
+    print(of.read())
+with open(str(batch).replace("_submission.sh", "_tasks.txt")) as of:
+    print(of.read())
+print(executor.report)
@@ -0,0 +1,80 @@
+"""
+Per-job resources on the PBS cluster
+====================================
+
+CCC-based cluster - PBS
+
+When you're running thousands of jobs, a few heavy ones should not force
+the resources requested by all the others: over-sized requests wreck the
+queue times.
+
+A simple example of how to override the executor resources for some jobs
+with ``hopla``: jobs with the same resources form a resource class, which
+shares a compiled batch template and is packed in its own array jobs. The
+big jobs are started first, so that the cheap ones backfill the remaining
+resources while they wait. Please check the :ref:`user guide <user_guide>`
+for a more in depth presentation of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from pprint import pprint
+
+
+# %%
+# Executor Context
+# ----------------
+#
+# The executor resources are used by default.
+
+executor = hopla.Executor(
+    cluster="pbs",
+    folder="/tmp/hopla",
+    queue="Nspin_short",
+    image="/tmp/hopla/my-apptainer-img.simg",
+    memory=4,
+    walltime=1,
+    array=True,
+)
+
+
+# %%
+# Submit Jobs
+# -----------
+#
+# Two subjects need much more memory and time.
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 9)
+]
+jobs += [
+    executor.submit("sleep", k, memory=64, walltime=12) for k in (9, 10)
+]
+pprint([(job.job_id, job.resources) for job in executor._queue])
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# We can't execute the code on the CI since the PBS infrastructure is not
+# available.
+
+from hopla.config import Config
+
+with Config(dryrun=True, delay_s=0.1):
+    executor(max_jobs=10)
+
+
+# %%
+# Generated Files
+# ---------------
+#
+# Each resource class is packed in its own array job.
+
+for job in (jobs[0], jobs[-1]):
+    with open(job.array_submission_file) as of:
+        print(of.read())
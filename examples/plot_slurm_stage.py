@@ -0,0 +1,72 @@
+"""
+Stage the image on the nodes
+============================
+
+CCC-based cluster - SLURM
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to stage the container image on the node-local
+storage with ``hopla``. The image is copied once per node, its checksum is
+verified, and it is shared by all the jobs running on this node. It is
+removed when the last job finishes. Please check the
+:ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+from pathlib import Path
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executor Context
+# ----------------
+#
+# The image must be a file: we create a fake one here.
+
+image = Path("/tmp/hopla/my-apptainer-img.simg")
+image.parent.mkdir(parents=True, exist_ok=True)
+image.write_bytes(b"fake image")
+
+executor = hopla.Executor(
+    cluster="slurm",
+    folder="/tmp/hopla",
+    queue="Nspin_short",
+    image=image,
+    walltime=1,
+    stage_image="$TMPDIR",
+)
+
+
+# %%
+# Generate a batch
+# ----------------
+#
+# The staging snippet is rendered once for all jobs, and the jobs run the
+# staged image, or the shared one if the staging fails.
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 11)
+]
+jobs[0].generate_batch()
+with open(jobs[0].paths.submission_file) as of:
+    print(of.read())
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# We can't execute the code on the CI since the SLURM infrastructure is not
+# available.
+
+with Config(dryrun=True, delay_s=3):
+    executor(max_jobs=5)
+    print(executor.report)
@@ -0,0 +1,63 @@
+"""
+Submit the batch scripts via stdin
+==================================
+
+CCC-based cluster - SLURM
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to submit jobs without writing one batch file per
+job with ``hopla``: the scripts are piped on the standard input of
+``sbatch``, and archived in a single append-only, indexed bundle. Please
+check the :ref:`user guide <user_guide>` for a more in depth presentation
+of all functionalities.
+
+
+Imports
+-------
+"""
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="slurm",
+    folder="/tmp/hopla",
+    queue="Nspin_short",
+    image="/tmp/hopla/my-apptainer-img.simg",
+    walltime=1,
+    stdin=True,
+)
+print(executor.bundle)
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# We can't execute the code on the CI since the SLURM infrastructure is not
+# available.
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 11)
+]
+with Config(dryrun=True, delay_s=1):
+    executor(max_jobs=5)
+
+
+# %%
+# Read the Scripts
+# ----------------
+#
+# The submission folder only contains the bundle and its index.
+
+print(sorted(path.name for path in executor.bundle.path.parent.iterdir()))
+print(jobs[0].submission_location)
+print(jobs[0].read_batch())
+print(executor.report)
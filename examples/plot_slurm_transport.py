@@ -0,0 +1,76 @@
+"""
+Submit jobs from a workstation
+==============================
+
+CCC-based cluster - SLURM
+
+When you're running hundreds or thousands of jobs, automation is a necessity.
+This is where ``hopla`` can help you.
+
+A simple example of how to submit jobs from a workstation with ``hopla``:
+the scheduler commands run on the login node over a single persistent SSH
+connection, the batch files are uploaded in a single tar stream, and the
+jobs started together are submitted in a single round trip. Please check
+the :ref:`user guide <user_guide>` for a more in depth presentation of all
+functionalities.
+
+
+Imports
+-------
+"""
+
+import shlex
+
+import hopla
+from hopla.config import Config
+
+
+# %%
+# Transport
+# ---------
+#
+# On a workstation, use ``hopla.SSHTransport("login.cluster.org")``. We can't
+# reach a login node on the CI: the transport below runs the remote
+# commands in a local shell instead of ``ssh`` and prints them.
+
+class LoopbackTransport(hopla.SSHTransport):
+    def _command(self, cmd):
+        if not isinstance(cmd, str):
+            cmd = shlex.join([str(arg) for arg in cmd])
+        print(f"[ssh {self.destination}] {cmd.splitlines()[0]}")
+        return ["/bin/bash", "-c", cmd]
+
+
+transport = LoopbackTransport("login.cluster.org")
+print(transport)
+print(" ".join(transport.ssh_command))
+
+
+# %%
+# Executor Context
+# ----------------
+
+executor = hopla.Executor(
+    cluster="slurm",
+    folder="/tmp/hopla",
+    queue="Nspin_short",
+    image="/tmp/hopla/my-apptainer-img.simg",
+    walltime=1,
+    transport=transport,
+)
+
+
+# %%
+# Start Jobs
+# ----------
+#
+# The SLURM commands are not available on the CI: the submissions fail,
+# and the errors are retrieved through the transport.
+
+jobs = [
+    executor.submit("sleep", k) for k in range(1, 5)
+]
+with Config(delay_s=0.1):
+    executor(max_jobs=4)
+print(jobs[0].stderr)
+transport.close()
@@ -14,4 +14,17 @@ for scalability, and efficiency.
 """
 
 __version__ = "2.0.0"
+from .control import AdaptiveConcurrency
 from .executor import DelayedSubmission, Executor
+from .federation import FederatedExecutor
+from .futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    FIRST_EXCEPTION,
+    as_completed,
+    wait,
+)
+from .monitor import StallMonitor
+from .nodes import NodeTracker
+from .ordering import OrderingPolicy, RuntimeOrder
+from .transport import LocalTransport, SSHTransport
@@ -10,17 +10,21 @@
 Contains PBS specific functions.
 """
 
-import copy
 import json
 import os
 import shutil
-import subprocess
 import textwrap
 import traceback
 import warnings
 from pathlib import Path
 
-from .utils import DelayedJob, InfoWatcher, format_attributes
+from .templates import load_template
+from .utils import (
+    DelayedJob,
+    InfoWatcher,
+    format_attributes,
+    slurm_number,
+)
 
 
 class CCCInfoWatcher(InfoWatcher):
@@ -49,6 +53,33 @@ class CCCInfoWatcher(InfoWatcher):
         return ["RUNNING", "PENDING", "SUSPENDED", "COMPLETING", "CONFIGURING",
                 "UNKNOWN"]
 
+    @property
+    def pending_status(self):
+        """ Return the list of status of the jobs waiting in the queue.
+        """
+        return ["PENDING"]
+
+    @classmethod
+    def read_times(cls, info):
+        """ Returns the submission and start times of the job from its
+        information.
+        """
+        submit_time = slurm_number(info.get("submit_time")) or None
+        start_time = slurm_number(info.get("start_time")) or None
+        return submit_time, start_time
+
+    @classmethod
+    def read_end_time(cls, info):
+        """ Returns the end time of the job from its information.
+        """
+        return slurm_number(info.get("end_time")) or None
+
+    @classmethod
+    def read_node(cls, info):
+        """ Returns the node running the job from its information.
+        """
+        return info.get("nodes") or None
+
     @classmethod
     def read_info(cls, string):
         """ Reads the output of squeue and returns a dictionary containing
@@ -82,13 +113,23 @@ class DelayedCCCJob(DelayedJob):
     ValueError
         If an invalid backend is specified.
     """
+    __slots__ = ("backend", "image_file", "image_name", "multi_task",
+                 "worker_file")
     _hub = "n4h00001rs"
     _submission_cmd = "ccc_msub"
+    _checkpoint_options = ("-E", "--signal=B:USR1@{delay}")
+    _dependency_options = (
+        "-E", "--dependency=afterok:{ids}",
+        "-E", "--kill-on-invalid-dep=yes",
+    )
+    _exclude_options = ("-E", "--exclude={nodes}")
+    _signal_command = ("scancel", "--full", "--signal={signal}")
     _container_cmd = "pcocc-rs run {hub}:{image_name} {params} -- {command}"
     _container_onshot_cmd = (
         "pcocc-rs run {hub}:{image_name} {params} /bin/bash -- "
         "-c '/bin/bash {command}'"
     )
+    _template_name = "ccc_batch_template.txt"
 
     def __init__(self, delayed_submission, executor, job_id, backend="flux"):
         super().__init__(delayed_submission, executor, job_id)
@@ -101,18 +142,11 @@ class DelayedCCCJob(DelayedJob):
         self.backend = backend
         resource_dir = Path(__file__).parent / "resources"
         if self.multi_task and self.backend == "flux":
-            path = resource_dir / "ccc_multi_batch_template.txt"
-            self.worker_file = resource_dir / "worker.sh"
+            self.worker_file = resource_dir / "flux_driver.py"
         elif self.multi_task and self.backend == "joblib":
-            path = resource_dir / "ccc_batch_template.txt"
             self.worker_file = resource_dir / "joblib_script_template.txt"
         elif self.multi_task and self.backend == "oneshot":
-            path = resource_dir / "ccc_batch_template.txt"
             self.worker_file = resource_dir / "oneshot_script_template.txt"
-        else:
-            path = resource_dir / "ccc_batch_template.txt"
-        with open(path) as of:
-            self.template = of.read()
         image = self._executor.parameters["image"]
         assert image is not None, "Please select or give an image."
         if os.path.isfile(image):
@@ -135,31 +169,54 @@ class DelayedCCCJob(DelayedJob):
     #             exitcode = exitcode and all(content)
     #     return exitcode
 
-    def generate_batch(self):
-        """ Write the batch file.
+    def _template_key(self):
+        """ Return the key of the batch template in the executor cache: the
+        template and the parameters depend on the multi-tasks backend.
+        """
+        name = self._template_name
+        if self.multi_task and self.backend == "flux":
+            name = "ccc_multi_batch_template.txt"
+        return (type(self), name, self.multi_task and self.backend,
+                self.resources)
+
+    def _static_parameters(self):
+        """ Return the parameters shared by all jobs of the executor, in
+        the CCC units.
         """
-        params = copy.deepcopy(self._executor.parameters)
+        params = dict(super()._static_parameters())
         params["walltime"] *= 3600
         params["memory"] *= 1000
-        if self.backend == "joblib":
+        if self.multi_task and self.backend == "joblib":
             if params["modules"] != "":
                 params["modules"] = f"python3/3.12,{params['modules']}"
             else:
                 params["modules"] = "python3/3.12"
         if params["modules"] != "":
             params["modules"] = f"module load {params['modules']}"
-        try:
-            self.import_image()
-        except Exception:
-            err = textwrap.indent(traceback.format_exc(), "   |")
-            warnings.warn(
-                f"Can't import image: {self.image_name}",
-                stacklevel=2
-            )
-            print(err)
+        return params
+
+    def render_batch(self):
+        """ Return the batch script: the multi-tasks files are written.
+        """
+        params = {}
+        paths = self.paths
+        imported_images = self._executor._imported_images
+        if self.image_name not in imported_images:
+            try:
+                self.import_image()
+                imported_images.add(self.image_name)
+            except Exception:
+                err = textwrap.indent(traceback.format_exc(), "   |")
+                warnings.warn(
+                    f"Can't import image: {self.image_name}",
+                    stacklevel=2
+                )
+                print(err)
         if self.multi_task and self.backend == "flux":
+            n_cpus = self._executor.parameters["ncpus"]
             n_multi_cpus = self._executor.parameters["nmulticpus"]
-            shutil.copy(self.worker_file, self.paths.worker_file)
+            if not paths.worker_file.exists():
+                shutil.copy(self.worker_file, paths.worker_file)
             subcmds = [
                 self._container_cmd.format(
                     hub=self._hub,
@@ -169,19 +226,19 @@ class DelayedCCCJob(DelayedJob):
                 )
                 for submission in self.delayed_submission
             ]
-            subcmds = [
-                f"1-{n_multi_cpus} . {self.paths.worker_file} {command}"
-                for command in subcmds
-            ]
-            params["logdir"] = self.paths.flux_dir
-            self.paths.flux_dir.mkdir(parents=True, exist_ok=True)
-            with open(self.paths.task_file, "w") as of:
+            params["logdir"] = paths.flux_dir
+            paths.flux_dir.mkdir(parents=True, exist_ok=True)
+            with open(paths.task_file, "w") as of:
                 of.write("\n".join(subcmds))
-            cmd = self.paths.task_file
+            cmd = (
+                f"flux python {paths.worker_file} {paths.task_file} "
+                f"{paths.flux_dir} "
+                f"--max-in-flight {max(n_cpus // n_multi_cpus, 1)} "
+                f"--cores-per-task {n_multi_cpus}"
+            )
         elif self.multi_task and self.backend == "joblib":
             n_cpus = self._executor.parameters["ncpus"]
-            with open(self.worker_file) as of:
-                joblib_template = of.read()
+            joblib_template = load_template(self.worker_file.name)
             subcmds = [
                 self._container_cmd.format(
                     hub=self._hub,
@@ -195,17 +252,16 @@ class DelayedCCCJob(DelayedJob):
                 f"'{command}',"
                 for command in subcmds
             ]
-            with open(self.paths.joblib_file, "w") as of:
+            with open(paths.joblib_file, "w") as of:
                 of.write(
-                    joblib_template.format(
+                    joblib_template.render(
                         commands="\n".join(subcmds),
                         njobs=n_cpus,
                     )
                 )
-            cmd = f"python {self.paths.joblib_file}"
+            cmd = f"python {paths.joblib_file}"
         elif self.multi_task and self.backend == "oneshot":
-            with open(self.worker_file) as of:
-                oneshot_template = of.read()
+            oneshot_template = load_template(self.worker_file.name)
             subcmds = [
                 submission.command
                 for submission in self.delayed_submission
@@ -214,46 +270,71 @@ class DelayedCCCJob(DelayedJob):
                 f"'{command}'"
                 for command in subcmds
             ]
-            with open(self.paths.oneshot_file, "w") as of:
+            with open(paths.oneshot_file, "w") as of:
                 of.write(
-                    oneshot_template.format(
-                        logdir=self.paths.oneshot_dir,
+                    oneshot_template.render(
+                        logdir=paths.oneshot_dir,
                         commands="\n".join(subcmds),
                     )
                 )
-            self.paths.oneshot_dir.mkdir(parents=True, exist_ok=True)
+            paths.oneshot_dir.mkdir(parents=True, exist_ok=True)
             cmd = self._container_onshot_cmd.format(
                 hub=self._hub,
                 image_name=self.image_name,
                 params=self.delayed_submission[0].execution_parameters,
-                command=self.paths.oneshot_file
+                command=paths.oneshot_file
             )
         else:
-            cmd = self._container_cmd.format(
+            cmd = self._wrap_command(self._container_cmd.format(
                 hub=self._hub,
                 image_name=self.image_name,
                 params=self.delayed_submission.execution_parameters,
                 command=self.delayed_submission.command
-            )
-        with open(self.paths.submission_file, "w") as of:
-            if self.paths.stdout.exists():
-                os.remove(self.paths.stdout)
-            if self.paths.stderr.exists():
-                os.remove(self.paths.stderr)
-            of.write(
-                self.template.format(
-                    command=cmd,
-                    stdout=self.paths.stdout,
-                    stderr=self.paths.stderr,
-                    **params
-                )
-            )
+            ))
+        return self.template.render(
+            command=cmd,
+            stdout=paths.stdout,
+            stderr=paths.stderr,
+            **params
+        )
+
+    @property
+    def batch_files(self):
+        """ Return the files written by `generate_batch` that the scheduler
+        needs to read: the multi-tasks files are also returned.
+        """
+        paths = self.paths
+        files = [paths.submission_file]
+        if self.multi_task and self.backend == "flux":
+            files += [paths.worker_file, paths.task_file]
+        elif self.multi_task and self.backend == "joblib":
+            files += [paths.joblib_file]
+        elif self.multi_task and self.backend == "oneshot":
+            files += [paths.oneshot_file]
+        return files
+
+    @property
+    def log_files(self):
+        """ Return the log files of the job, indexed by their names: the
+        multi-tasks logs are also returned.
+        """
+        files = super().log_files
+        paths = self.paths
+        for prefix, folder in (("flux", paths.flux_dir),
+                               ("oneshot", paths.oneshot_dir)):
+            if self.multi_task and folder.is_dir():
+                files.update({
+                    f"{prefix}/{path.name}": path
+                    for path in folder.iterdir() if path.is_file()
+                })
+        return files
 
     def import_image(self):
         """ Load the docker image if not available.
         """
+        transport = self._executor.transport
         cmd = ["pcocc-rs", "image", "list", "-r", self._hub]
-        stdout = subprocess.check_output(cmd)
+        stdout = transport.check_output(cmd)
         if self.image_name not in self.read_index(stdout):
             if self.image_file is None:
                 raise ValueError(
@@ -263,7 +344,7 @@ class DelayedCCCJob(DelayedJob):
                 "pcocc-rs", "image", "import",
                 f"docker-archive:{self.image_file}",
                 f"{self._hub}:{self.image_name}"]
-            subprocess.check_call(cmd)
+            transport.check_output(cmd)
 
     @classmethod
     def read_index(cls, string):
@@ -283,36 +364,85 @@ class DelayedCCCJob(DelayedJob):
             string = string.decode()
         return string.rstrip("\n").strip().split(" ")[-1]
 
+    def task_status(self):
+        """ Return the status of the finished tasks of a flux multi-tasks
+        job, as written by the flux driver.
+
+        Returns
+        -------
+        tasks: list of dict
+            the 'task_id', 'returncode', 'runtime' (in seconds) and 'node'
+            of each finished task, in completion order.
+        """
+        content = self.read_log("flux/status.tsv")
+        if content is None:
+            return []
+        tasks = []
+        for line in content.splitlines()[1:]:
+            fields = line.split("\t")
+            if len(fields) != 4:
+                continue
+            task_id, returncode, runtime, node = fields
+            tasks.append({
+                "task_id": int(task_id),
+                "returncode": int(returncode),
+                "runtime": float(runtime),
+                "node": node,
+            })
+        return tasks
+
     def sub_report(self):
         report = []
         prefix = f"{self.__class__.__name__}<job_id={self.job_id}>"
         if self.multi_task and self.backend == "flux":
-            log_files = list(self.paths.flux_dir.glob("bulk_*"))
-            tasks_ids = [
-                path.name.split("_")[1]
-                for path in log_files
-                if not self._check_is_done(path)
-            ]
+            tasks = self.task_status()
+            failed = [task for task in tasks if task["returncode"] != 0]
+            n_submissions = len(self.delayed_submission)
+            report.append(f"{prefix}number_of_tasks: {n_submissions}")
+            report.append(f"{prefix}finished_tasks: {len(tasks)}")
+            report.append(
+                f"{prefix}failed_tasks: "
+                f"{[task['task_id'] for task in failed]}")
             report.append(
-                f"{prefix}number_of_tasks: {len(self.delayed_submission)}")
-            report.append(f"{prefix}failed_tasks: {tasks_ids}")
-            report.append(f"{prefix}running_tasks: {len(log_files)}")
+                f"{prefix}remaining_tasks: {n_submissions - len(tasks)}")
+            report.extend(
+                f"{prefix}task_{task['task_id']}: "
+                f"returncode={task['returncode']}, "
+                f"runtime={task['runtime']:.1f}s, node={task['node']}"
+                for task in failed)
             report.append(f"{prefix}logdir: {self.paths.flux_dir}")
         elif self.multi_task and self.backend == "oneshot":
-            log_files = list(self.paths.flux_dir.glob("job_*.exitcode"))
-            exitcodes = []
-            for path in log_files:
-                with open(path) as of:
-                    exitcodes.append(int(of.read().strip()))
+            log_names = [name for name in self.log_names()
+                         if name.startswith("oneshot/job_") and
+                         name.endswith(".exitcode")]
+            exitcodes = [int(self.read_log(name).strip())
+                         for name in log_names]
             n_fail = sum(1 for code in exitcodes if code != 0)
             n_submissions = len(self.delayed_submission)
-            n_tasks = len(log_files)
+            n_tasks = len(log_names)
             report.append(f"{prefix}number_of_tasks: {n_submissions}")
             report.append(f"{prefix}failed_tasks: {n_fail}")
             report.append(f"{prefix}running_tasks: {n_tasks}")
             report.append(f"{prefix}logdir: {self.paths.oneshot_dir}")
         return report
 
+    @property
+    def submission_options(self):
+        """ Return the options of the start command: `ccc_msub` only keeps
+        its last `-E` option, including the one of the batch script, so
+        that the GPU request and the extra scheduler options are merged in
+        a single one.
+        """
+        n_gpus = self._static_parameters()["ngpus"]
+        options, extra = [], [f"--gres=gpu:{n_gpus}"]
+        args = iter(super().submission_options)
+        for arg in args:
+            if arg == "-E":
+                extra.append(next(args))
+            else:
+                options.append(arg)
+        return [*options, "-E", " ".join(extra)]
+
     @property
     def start_command(self):
         """ Return the start job command.
@@ -323,7 +453,7 @@ class DelayedCCCJob(DelayedJob):
     def stop_command(self):
         """ Return the stop job command.
         """
-        return "ccc_mqdel"
+        return "scancel"
 
     def __repr__(self):
         return format_attributes(
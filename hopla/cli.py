@@ -10,6 +10,8 @@ import argparse
 import datetime
 import re
 import shutil
+import sys
+import time
 
 try:
     import tomllib  # Python 3.11+
@@ -21,7 +23,13 @@ import numpy as np
 import pandas as pd
 
 import hopla
+from hopla.ccc import CCCInfoWatcher
 from hopla.config import Config
+from hopla.journal import Journal, summarize
+from hopla.logstore import LogStore
+from hopla.pbs import PbsInfoWatcher
+from hopla.slurm import SlurmInfoWatcher
+from hopla.utils import batch_arguments
 
 # Colors (ANSI)
 RESET = "\033[0m"
@@ -156,6 +164,291 @@ def _strip_ansi(s: str) -> str:
     return re.sub(r"\x1b\[[0-9;]*m", "", s)
 
 
+WATCHERS = {
+    "slurm": SlurmInfoWatcher,
+    "pbs": PbsInfoWatcher,
+    "ccc": CCCInfoWatcher,
+}
+
+
+def query_scheduler(cluster, submission_ids):
+    """
+    Query the scheduler state of the started jobs with as few calls as the
+    command line length allows.
+
+    Parameters
+    ----------
+    cluster : str
+        The type of cluster.
+    submission_ids : list of str
+        The submission IDs of the started jobs.
+
+    Returns
+    -------
+    pending : set of str
+        The submission IDs of the jobs waiting in the queue.
+    completed : set of str
+        The submission IDs of the jobs finished on the scheduler side.
+
+    Notes
+    -----
+    - The local cluster type can't be queried from another process: the
+      started jobs are considered running.
+    """
+    pending, completed = set(), set()
+    submission_ids = [sid for sid in submission_ids if sid != "EXIT"]
+    if cluster not in WATCHERS or len(submission_ids) == 0:
+        return pending, completed
+    for chunk in batch_arguments([], submission_ids):
+        watcher = WATCHERS[cluster](delay_s=0)
+        for submission_id in chunk:
+            watcher.register_job(submission_id)
+        watcher.update()
+        for submission_id in chunk:
+            info = watcher._info_dict.get(submission_id)
+            if info is None:
+                continue
+            state = watcher.read_state(info).upper()
+            if state in watcher.pending_status:
+                pending.add(submission_id)
+            elif state not in watcher.valid_status:
+                completed.add(submission_id)
+    return pending, completed
+
+
+def campaign_status(folder, query=True):
+    """
+    Summarize the state of a campaign from its journal.
+
+    Parameters
+    ----------
+    folder : str or Path
+        The executor folder.
+    query : bool, optional
+        If true, the scheduler is queried once for all the started jobs.
+        Default is True.
+
+    Returns
+    -------
+    cluster : str
+        The type of cluster.
+    jobs : dict
+        The state of each job, as returned by `Journal.read`.
+    summary : dict
+        The campaign summary, as returned by `summarize`.
+    """
+    folder = Path(folder).expanduser().absolute()
+    cluster, jobs = Journal.read(folder)
+    pending, completed = set(), set()
+    if query:
+        pending, completed = query_scheduler(cluster, [
+            state["submission_id"] for state in jobs.values()
+            if "started" in state and "result" not in state and
+            "canceled" not in state
+        ])
+    return cluster, jobs, summarize(jobs, pending, completed)
+
+
+def format_status(cluster, summary, n_failures=10):
+    """
+    Format a campaign summary for display.
+
+    Parameters
+    ----------
+    cluster : str
+        The type of cluster.
+    summary : dict
+        The campaign summary, as returned by `summarize`.
+    n_failures : int, optional
+        The maximum number of failed job identifiers displayed.
+        Default is 10.
+
+    Returns
+    -------
+    data : dict
+        The formatted summary.
+    """
+    data = {"cluster": cluster}
+    data.update({
+        key: summary[key] for key in (
+            "jobs", "waiting", "pending", "running", "completed", "success",
+            "failure", "canceled")
+    })
+    data["throughput"] = f"{summary['throughput']:.1f} jobs/h"
+    data["eta"] = (
+        "unknown" if summary["eta"] is None
+        else str(datetime.timedelta(seconds=round(summary["eta"])))
+    )
+    failures = summary["failures"]
+    data["failures"] = ", ".join(failures[:n_failures]) + (
+        ", …" if len(failures) > n_failures else "")
+    return data
+
+
+def status(folder):
+    """
+    Print the state of a campaign without running it.
+
+    Parameters
+    ----------
+    folder : str or Path
+        The executor folder.
+
+    Returns
+    -------
+    summary : dict
+        The campaign summary, as returned by `summarize`.
+    """
+    cluster, _, summary = campaign_status(folder)
+    print_toml({"status": format_status(cluster, summary)},
+               title="Campaign Status")
+    return summary
+
+
+def watch(folder, interval=30, stale=600):
+    """
+    Print the state of a campaign periodically, until all the jobs are
+    finished or the campaign is abandoned.
+
+    Parameters
+    ----------
+    folder : str or Path
+        The executor folder.
+    interval : float, optional
+        The delay in seconds between two updates. Default is 30.
+    stale : float, optional
+        The delay in seconds without journal update after which the
+        campaign is considered abandoned, e.g. because the executor process
+        died, when no job is pending or running on the scheduler. Default
+        is 600.
+
+    Notes
+    -----
+    - The local cluster type can't be queried from another process: its
+      campaigns are considered abandoned from the journal delay only.
+    """
+    journal_file = Path(folder).expanduser().absolute() / Journal.filename
+    try:
+        while True:
+            cluster, _, summary = campaign_status(folder)
+            print_toml({"status": format_status(cluster, summary)},
+                       title="Campaign Status")
+            active = sum(summary[key] for key in (
+                "waiting", "pending", "running", "completed"))
+            if active == 0:
+                break
+            queued = summary["pending"] + summary["running"]
+            if ((cluster not in WATCHERS or queued == 0) and
+                    time.time() - journal_file.stat().st_mtime > stale):
+                print(f"No journal update for more than {stale} seconds: "
+                      "the executor is probably not running anymore.")
+                break
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
+
+
+def report(folder, n_lines=5):
+    """
+    Print a report of a campaign without running it: one line per job, and
+    the last lines of the standard error of the failed jobs.
+
+    Parameters
+    ----------
+    folder : str or Path
+        The executor folder.
+    n_lines : int, optional
+        The number of standard error lines displayed for each failed job.
+        Default is 5.
+    """
+    folder = Path(folder).expanduser().absolute()
+    cluster, jobs, summary = campaign_status(folder, query=False)
+    print_toml({"status": format_status(cluster, summary)},
+               title="Campaign Report")
+    store = None
+    if (folder / "logs" / "packed" / "index.tsv").exists():
+        store = LogStore(folder / "logs" / "packed")
+    for job_id, state in jobs.items():
+        if "canceled" in state:
+            result = "canceled"
+        else:
+            result = state.get(
+                "result", "started" if "started" in state else "waiting")
+        print(f"{job_id}\t{state.get('submission_id', '-')}\t{result}")
+        if result != "failure":
+            continue
+        stderr_file = folder / "logs" / f"{job_id}_log.err"
+        if stderr_file.exists():
+            with open(stderr_file, errors="replace") as of:
+                stderr = of.read()
+        elif store is not None:
+            stderr = store.read(job_id, "stderr")
+        else:
+            stderr = None
+        for line in (stderr or "").splitlines()[-n_lines:]:
+            print(f"{DIM}    {line}{RESET}")
+
+
+def inspect_campaign(argv):
+    """
+    Command-line interface for the read-only `status`, `watch` and `report`
+    subcommands.
+
+    Parameters
+    ----------
+    argv : list of str
+        The command-line arguments, starting with the subcommand.
+    """
+    parser = argparse.ArgumentParser(
+        prog="hoplactl",
+        description=(
+            "Inspect a hopla campaign from its executor folder without "
+            "running it."
+        ),
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, description in (
+            ("status", "Print the campaign state once."),
+            ("watch", "Print the campaign state until all jobs finish."),
+            ("report", "Print one line per job and the failures.")):
+        subparser = subparsers.add_parser(name, help=description)
+        subparser.add_argument(
+            "folder",
+            type=str,
+            help="The executor folder.",
+        )
+        if name == "watch":
+            subparser.add_argument(
+                "--interval",
+                type=float,
+                default=30,
+                help="The delay in seconds between two updates.",
+            )
+            subparser.add_argument(
+                "--stale",
+                type=float,
+                default=600,
+                help=(
+                    "The delay in seconds without journal update after "
+                    "which the campaign is considered abandoned."
+                ),
+            )
+        if name == "report":
+            subparser.add_argument(
+                "--lines",
+                type=int,
+                default=5,
+                help="The number of stderr lines displayed per failure.",
+            )
+    args = parser.parse_args(argv)
+    if args.command == "status":
+        status(args.folder)
+    elif args.command == "watch":
+        watch(args.folder, interval=args.interval, stale=args.stale)
+    else:
+        report(args.folder, n_lines=args.lines)
+
+
 def main():
     """
     Command-line interface for automated job execution with hopla.
@@ -222,12 +515,18 @@ def main():
     Examples
     --------
     >>> hoplactl --config experiment.toml --njobs 5 # doctest: +SKIP
+    >>> hoplactl status /tmp/hopla # doctest: +SKIP
+    >>> hoplactl watch /tmp/hopla --interval 60 # doctest: +SKIP
+    >>> hoplactl report /tmp/hopla # doctest: +SKIP
 
     Notes
     -----
     - The `multi` section should define `n_splits` to control chunking.
     - The `Config` context manager is used to apply configuration settings
       during execution.
+    - The `status`, `watch` and `report` subcommands attach to the folder of
+      a running or finished campaign: they read its journal and query the
+      scheduler once, without running the campaign.
 
     Raises
     ------
@@ -236,6 +535,9 @@ def main():
     """
     print_header()
 
+    if len(sys.argv) > 1 and sys.argv[1] in ("status", "watch", "report"):
+        return inspect_campaign(sys.argv[1:])
+
     parser = argparse.ArgumentParser(
         prog="hoplactl",
         description=(
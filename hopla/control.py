@@ -0,0 +1,121 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the controllers of the number of concurrent submissions.
+"""
+
+from .utils import format_attributes
+
+
+class AdaptiveConcurrency:
+    """ Adapts the maximum number of concurrent submissions to the scheduler
+    feedback.
+
+    The limit follows an additive-increase/multiplicative-decrease policy:
+
+    - when no job is pending, the partition has free resources and the
+      limit is doubled.
+    - when the pending backlog is small and jobs start quickly, the limit
+      is increased by `increase` jobs.
+    - when the pending backlog or the queue wait is too large, the limit is
+      multiplied by `decrease`. The limit is not decreased again before the
+      number of jobs in flight falls below it.
+
+    Parameters
+    ----------
+    min_jobs: int, default 1
+        the lower bound of the limit.
+    max_jobs: int, default 300
+        the upper bound of the limit.
+    initial: int, default None
+        the initial limit. By default, `min_jobs`.
+    max_pending: int, default 10
+        the number of pending jobs tolerated in the queue.
+    max_wait_s: float, default 300
+        the tolerated queue wait (in seconds).
+    increase: int, default 10
+        the additive increase of the limit.
+    decrease: float, default 0.5
+        the multiplicative decrease of the limit.
+
+    Examples
+    --------
+    >>> from hopla import AdaptiveConcurrency
+    >>> controller = AdaptiveConcurrency(min_jobs=10, max_jobs=1000)
+    >>> controller.update(n_pending=0, n_running=10)
+    20
+    >>> controller.update(n_pending=15, n_running=5)
+    10
+
+    Raises
+    ------
+    ValueError
+        If the bounds or the decrease factor are not valid.
+    """
+    def __init__(self, min_jobs=1, max_jobs=300, initial=None, max_pending=10,
+                 max_wait_s=300, increase=10, decrease=0.5):
+        if not 1 <= min_jobs <= max_jobs:
+            raise ValueError(
+                f"Invalid bounds: 1 <= {min_jobs} <= {max_jobs} expected."
+            )
+        if not 0 < decrease < 1:
+            raise ValueError(
+                f"Invalid decrease factor: {decrease} not in ]0, 1[."
+            )
+        self.min_jobs = min_jobs
+        self.max_jobs = max_jobs
+        self.max_pending = max_pending
+        self.max_wait_s = max_wait_s
+        self.increase = increase
+        self.decrease = decrease
+        self.limit = self._clip(min_jobs if initial is None else initial)
+
+    def update(self, n_pending, n_running, queue_wait=None):
+        """ Updates the limit from the scheduler feedback.
+
+        Parameters
+        ----------
+        n_pending: int
+            the number of submitted jobs waiting in the queue.
+        n_running: int
+            the number of running jobs.
+        queue_wait: float, default None
+            the observed queue wait (in seconds), if available.
+
+        Returns
+        -------
+        limit: int
+            the maximum number of concurrent submissions.
+        """
+        n_in_flight = n_pending + n_running
+        congested = (
+            n_pending > self.max_pending or
+            (queue_wait is not None and queue_wait > self.max_wait_s)
+        )
+        if congested:
+            if n_in_flight <= self.limit:
+                self.limit = self._clip(int(self.limit * self.decrease))
+        elif n_in_flight >= self.limit:
+            if n_pending == 0:
+                self.limit = self._clip(self.limit * 2)
+            else:
+                self.limit = self._clip(self.limit + self.increase)
+        return self.limit
+
+    def _clip(self, limit):
+        """ Bounds the limit.
+        """
+        return min(max(limit, self.min_jobs), self.max_jobs)
+
+    def __repr__(self):
+        return format_attributes(
+            self,
+            attrs=["limit", "min_jobs", "max_jobs", "max_pending",
+                   "max_wait_s"]
+        )
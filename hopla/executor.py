@@ -10,11 +10,16 @@
 Contains job execution functions.
 """
 
+import asyncio
+import os
+import shlex
+import shutil
+import sys
 import time
+import warnings
+from collections.abc import AsyncIterator
 from pathlib import Path
 
-from tqdm import tqdm
-
 from .ccc import (
     CCCInfoWatcher,
     DelayedCCCJob,
@@ -23,15 +28,33 @@ from .config import (
     DEFAULT_OPTIONS,
     hopla_options,
 )
+from .control import AdaptiveConcurrency
+from .journal import Journal
+from .local import (
+    DelayedLocalJob,
+    LocalInfoWatcher,
+    LocalScheduler,
+)
+from .logstore import LogStore
+from .ordering import JobQueue, get_policy
 from .pbs import (
     DelayedPbsJob,
     PbsInfoWatcher,
 )
+from .progress import ProgressDashboard
 from .slurm import (
     DelayedSlurmJob,
     SlurmInfoWatcher,
 )
-from .utils import format_attributes
+from .templates import BatchTemplate, load_template
+from .transport import LocalTransport
+from .utils import (
+    DelayedJob,
+    ScriptBundle,
+    find_stack_level,
+    format_attributes,
+    sha256sum,
+)
 
 
 class Executor:
@@ -40,7 +63,7 @@ class Executor:
     Parameters
     ----------
     cluster: str
-        the type of cluster: 'slurm', 'ccc', 'pbs'.
+        the type of cluster: 'slurm', 'ccc', 'pbs', 'local'.
     folder: Path/str
         folder for storing job submission/output and logs.
     queue: str
@@ -67,6 +90,91 @@ class Executor:
     backend: str, default 'flux'
         the multi-taks backend to use: 'flux', 'joblib or 'oneshot'. This
         option is only used with CCC cluster type.
+    scheduler: LocalScheduler, default None
+        the in-process scheduler used to run the jobs: a `LocalScheduler`
+        that executes the jobs on the current machine or a
+        `SimulatedScheduler`. By default, jobs are executed by a pool sized
+        by the number of available cores and `n_cpus`. This option is only
+        used with local cluster type.
+    array: bool, default False
+        if True, the jobs started at each iteration of the submission loop
+        are packed in array jobs: a single submission is performed for
+        all of them. Jobs with dependencies are always submitted
+        individually. This option is only used with PBS cluster type.
+    template: Path/str or BatchTemplate, default None
+        a batch template file, or a compiled template, used in place of the
+        cluster batch template. The fields of the template are the executor
+        parameters (name, queue, memory, walltime, ncpus, nmulticpus, ngpus,
+        modules, image, project_id, stage) and the job 'command', 'stdout'
+        and 'stderr'. Multi-tasks jobs keep their own templates.
+    dedup: bool, default False
+        if True, submitting a job identical to a previous one (same
+        commands, execution parameters, image, resources and dependencies)
+        returns the previous job: the duplicates share its status and logs.
+        The collapsed duplicates are summarized in the report.
+    stage_image: str, default None
+        a node-local directory, e.g. '/tmp' or '$TMPDIR', where the image
+        file is staged before running the jobs: the image is copied once
+        per node under a lock, its checksum is verified, it is shared by
+        the jobs running on the node and removed after the last one. If
+        the staging fails, the shared image is used. Custom templates must
+        contain the 'stage' field. This option is not used with CCC cluster
+        type.
+    transport: LocalTransport, default None
+        the transport used to call the scheduler and to share the files
+        with the submission host, e.g. a
+        :class:`~hopla.transport.SSHTransport` to submit jobs from a
+        workstation: the batch files are uploaded to, and the logs of the
+        finished jobs downloaded from, the same folder on the submission
+        host. By default, the scheduler commands run on the current
+        machine. Remote transports are not supported with the local
+        cluster type.
+    stdin: bool, default False
+        if True, the batch scripts are piped on the standard input of the
+        submission command instead of being written in one file per job.
+        This option is only used with SLURM and PBS cluster types; PBS
+        array jobs keep one batch file per array.
+    bundle: bool, default True
+        if True, the scripts piped on the standard input are archived in a
+        single append-only, indexed file of the submissions folder, so that
+        the reports can locate them.
+    pack_logs: bool or str, default False
+        if True, the logs of the finished jobs are packed in large indexed
+        segment files of the logs folder, and the original files removed:
+        the jobs read them with `read_stdout`, `read_stderr` or `tail`. If
+        'zstd', the logs are also compressed (requires the `zstandard`
+        package).
+    order: str or OrderingPolicy, default 'backfill'
+        the order in which the waiting jobs are started: 'fifo' (submission
+        order), 'backfill' (decreasing resource class), 'priority'
+        (decreasing `priority`), 'lpt' (longest expected runtime first),
+        'spt' (shortest expected runtime first), or an
+        :class:`~hopla.ordering.OrderingPolicy` instance. The expected
+        runtimes are given by the `expected_runtime` parameter of `submit`
+        or learned from the finished jobs running the same script.
+    checkpoint: int, default None
+        if set, the number of seconds before the walltime at which the
+        command receives SIGUSR1, requested from the scheduler on SLURM
+        and CCC clusters and from a timer otherwise. The command is
+        expected to save its state and exit: if it exits with a non-zero
+        code, the job is checkpointed and automatically resubmitted, the
+        command resuming from its saved state. The dependencies are then
+        handled by the executor. This option is not used with multi-tasks
+        jobs and PBS array jobs.
+    max_restarts: int, default 3
+        the maximum number of continuations of a checkpointed job.
+    restart_walltime: int, default None
+        the walltime (in hours) of the continuations, e.g. a short one
+        fitting the backfill windows. By default, the job walltime.
+    monitor: StallMonitor, default None
+        if set, the running jobs whose logs, or heartbeat file, do not
+        change for longer than a multiple of the median runtime are
+        reported, resubmitted, or duplicated, the first copy to succeed
+        being kept.
+    exclude_nodes: NodeTracker, default None
+        if set, the failure rate of each node is tracked from the finished
+        jobs, and the failing nodes are excluded from the next submissions
+        on SLURM and CCC clusters.
 
     Examples
     --------
@@ -84,7 +192,13 @@ class Executor:
     Raises
     ------
     ValueError
-        If the cluster type is not supported.
+        If the cluster type is not supported, if array jobs are requested
+        with a cluster type other than PBS, if the image to be staged is
+        not a file, if a remote transport is used with the local cluster
+        type, if the stdin submission is requested with a cluster type
+        other than SLURM or PBS, if the image to be staged is used with a
+        batch template without `{stage}` field, or if a stall monitor is
+        used with a remote transport.
     """
     _delay_s = 60
     _counter = 0
@@ -92,7 +206,11 @@ class Executor:
 
     def __init__(self, cluster, folder, queue, image, name="hopla", memory=2,
                  walltime=72, n_cpus=1, n_gpus=0, n_multi_cpus=1, modules=None,
-                 project_id=None, backend="flux"):
+                 project_id=None, backend="flux", scheduler=None,
+                 array=False, template=None, dedup=False, stage_image=None,
+                 transport=None, stdin=False, bundle=True, pack_logs=False,
+                 order="backfill", checkpoint=None, max_restarts=3,
+                 restart_walltime=None, monitor=None, exclude_nodes=None):
         if cluster == "pbs":
             self._job_class = DelayedPbsJob
             self._watcher_class = PbsInfoWatcher
@@ -102,12 +220,57 @@ class Executor:
         elif cluster == "slurm":
             self._job_class = DelayedSlurmJob
             self._watcher_class = SlurmInfoWatcher
+        elif cluster == "local":
+            self._job_class = DelayedLocalJob
+            self._watcher_class = LocalInfoWatcher
         else:
             raise ValueError(
                 f"Unsupported cluster type: {cluster}"
             )
+        if array and cluster != "pbs":
+            raise ValueError(
+                f"Array jobs are not supported with cluster type: {cluster}"
+            )
+        if array and checkpoint is not None:
+            raise ValueError(
+                "The checkpoint protocol is not supported with array jobs."
+            )
+        if stdin and cluster not in ("slurm", "pbs"):
+            raise ValueError(
+                f"Submission via stdin is not supported with cluster type: "
+                f"{cluster}"
+            )
+        self.array = array
+        self.stdin = stdin
         self.backend = backend
-        self.watcher = self._watcher_class(self._delay_s)
+        if template is not None and not isinstance(template, BatchTemplate):
+            template = BatchTemplate.from_file(template)
+        self.template = template
+        self._templates = {}
+        self._imported_images = set()
+        self.dedup = dedup
+        self.transport = transport or LocalTransport()
+        if cluster == "local" and self.transport.remote:
+            raise ValueError(
+                "Remote transports are not supported with the local cluster "
+                "type."
+            )
+        if monitor is not None and self.transport.remote:
+            raise ValueError(
+                "The stall monitor is not supported with remote transports."
+            )
+        self._dedup_index = {}
+        self._duplicates = {}
+        self._resource_classes = {}
+        if cluster == "local":
+            self.scheduler = scheduler or LocalScheduler(
+                n_workers=max((os.cpu_count() or 1) // n_cpus, 1)
+            )
+            self.watcher = self._watcher_class(self._delay_s, self.scheduler)
+        else:
+            self.scheduler = None
+            self.watcher = self._watcher_class(self._delay_s)
+        self.watcher.transport = self.transport
         self.folder = Path(folder).expanduser().absolute()
         modules = modules or []
         self.parameters = {
@@ -124,46 +287,550 @@ class Executor:
                 if Path(image).is_file()
                 else image
             ),
-            "project_id": project_id
+            "project_id": project_id,
+            "stage": "",
         }
+        self.image_path = self.parameters["image"]
+        if stage_image is not None and cluster != "ccc":
+            if not Path(image).is_file():
+                raise ValueError(
+                    f"Only image files can be staged: {image}"
+                )
+            if template is not None and "stage" not in template.fields:
+                raise ValueError(
+                    "The batch template has no {stage} field: the image "
+                    "can't be staged."
+                )
+            self.parameters["stage"] = load_template(
+                "stage_image_template.txt").render(
+                    image=self.parameters["image"],
+                    stage_dir=stage_image,
+                    checksum=sha256sum(self.parameters["image"]))
+            self.image_path = '"$hopla_image"'
+        self._job_folders = (self.folder / "submissions",
+                             self.folder / "logs")
+        for path in self._job_folders:
+            if path.exists():
+                shutil.rmtree(path)
+            path.mkdir(parents=True)
+        if self.transport.remote:
+            folders = " ".join(
+                shlex.quote(str(path)) for path in self._job_folders)
+            self.transport.check_output(
+                f"rm -rf {folders} && mkdir -p {folders}")
+        self.bundle = (
+            ScriptBundle(self.folder / "submissions")
+            if stdin and bundle else None
+        )
+        self.journal = Journal(self.folder, cluster)
+        self.log_store = (
+            LogStore(self.folder / "logs" / "packed",
+                     compression="zstd" if pack_logs == "zstd" else None)
+            if pack_logs else None
+        )
         self._delayed_jobs = []
+        self._in_flight = []
+        self.order = get_policy(order)
+        self.checkpoint = checkpoint
+        self.max_restarts = max_restarts
+        self.restart_walltime = restart_walltime
+        self.monitor = monitor
+        self.exclude_nodes = exclude_nodes
+        self._queue = JobQueue(self.order)
+        self._progress = None
+        self.progress = None
+        self.max_jobs = 300
 
     def __call__(self, max_jobs=300):
         """ Run jobs controlling the maximum number of concurrent submissions.
 
         Parameters
         ----------
-        max_jobs: int, default 300
-            the maximum number of concurrent submissions.
+        max_jobs: int or AdaptiveConcurrency, default 300
+            the maximum number of concurrent submissions, or a controller
+            adapting it to the scheduler feedback.
+        """
+        self.max_jobs = max_jobs
+        verbose, dryrun = self._read_options()
+        self._progress = ProgressDashboard(
+            self.n_jobs, desc=self._job_class._submission_cmd.upper())
+        while (self.n_waiting_jobs != 0 or len(self._in_flight) != 0 or
+               not all(job.done for job in self._delayed_jobs)):
+            self._tick(max_jobs, dryrun=dryrun, verbose=verbose)
+            time.sleep(self._delay_s)
+        self.watcher.update()
+        self._collect_done()
+        self._close_progress()
+        self._shutdown_scheduler()
+
+    async def run(self, max_jobs=300):
+        """ Run jobs controlling the maximum number of concurrent submissions
+        without blocking the event loop.
+
+        Parameters
+        ----------
+        max_jobs: int or AdaptiveConcurrency, default 300
+            the maximum number of concurrent submissions, or a controller
+            adapting it to the scheduler feedback.
+
+        Examples
+        --------
+        >>> import asyncio
+        >>> import hopla
+        >>> executor = hopla.Executor(
+        ...     cluster="local",
+        ...     folder="/tmp/hopla",
+        ...     queue="local",
+        ...     image="",
+        ... )
+        >>> jobs = [executor.submit("sleep", k) for k in range(1, 11)]
+        >>> asyncio.run(executor.run(max_jobs=2)) # doctest: +SKIP
+        """
+        self.max_jobs = max_jobs
+        verbose, dryrun = self._read_options()
+        self._progress = ProgressDashboard(
+            self.n_jobs, desc=self._job_class._submission_cmd.upper())
+        while True:
+            if self.watcher._is_outdated():
+                await self.watcher.aupdate()
+            self._collect_done()
+            self._check_stalls(dryrun=dryrun)
+            if (self.n_waiting_jobs == 0 and len(self._in_flight) == 0 and
+                    all(job.done for job in self._delayed_jobs)):
+                break
+            if verbose:
+                print(self._progress.summary)
+            for group in self._group_jobs(
+                    self._next_jobs(max_jobs, dryrun=dryrun)):
+                if len(group) > 1:
+                    await asyncio.to_thread(
+                        self._job_class.start_array, group, dryrun)
+                else:
+                    await group[0].astart(dryrun=dryrun)
+                for job in group:
+                    self.journal.record(job.job_id, "started",
+                                        job.submission_id)
+                self._progress.submitted(
+                    [job.job_id for job in group
+                     if self._first_submission(job)])
+            self._refresh_progress()
+            await asyncio.sleep(self._delay_s)
+        await self.watcher.aupdate()
+        self._collect_done()
+        self._close_progress()
+        self._shutdown_scheduler()
+
+    async def as_completed(self) -> AsyncIterator[DelayedJob]:
+        """ Iterate over the jobs as they finish without blocking the event
+        loop.
+
+        The jobs are not started by this method: run the executor
+        concurrently, for instance in an `asyncio` task. Only the jobs
+        submitted before the call are considered.
+
+        Yields
+        ------
+        job: DelayedJob
+            a finished job.
+        """
+        opts = hopla_options.get()
+        delay_s = opts.get("delay_s", DEFAULT_OPTIONS["delay_s"])
+        pending = list(self._delayed_jobs)
+        while len(pending) > 0:
+            remaining = []
+            for job in pending:
+                if await job._adone():
+                    yield job
+                else:
+                    remaining.append(job)
+            pending = remaining
+            if len(pending) > 0:
+                await asyncio.sleep(delay_s)
+
+    def _read_options(self):
+        """ Read the execution options and set the refresh delay.
+
+        Returns
+        -------
+        verbose: bool
+            if True, print information.
+        dryrun: bool
+            if True, only print the submission commands.
         """
         opts = hopla_options.get()
         verbose = opts.get("verbose", DEFAULT_OPTIONS["verbose"])
         dryrun = opts.get("dryrun", DEFAULT_OPTIONS["dryrun"])
         self._delay_s = opts.get("delay_s", DEFAULT_OPTIONS["delay_s"])
         self.watcher._delay_s = self._delay_s
+        return verbose, dryrun
 
-        _start = 0
-        desc = self._job_class._submission_cmd.upper()
-        pbar = tqdm(total=self.n_jobs, desc=desc)
-        while (self.n_waiting_jobs != 0 or
-               not all(job.done for job in self._delayed_jobs)):
-            if verbose:
-                print(self.status)
-                # print(self._delayed_jobs)
-            if self.n_waiting_jobs != 0 and self.n_running_jobs < max_jobs:
-                _delta = max_jobs - self.n_running_jobs
-                _stop = _start + _delta
-                for job in self._delayed_jobs[_start:_stop]:
-                    assert job.status == "NOTSTARTED"
-                    job.start(dryrun=dryrun)
-                    pbar.update(1)
-                    pbar.refresh()
-                _start = _stop
-            time.sleep(self._delay_s)
-        pbar.close()
-        self.watcher.update()
+    def _tick(self, max_jobs, dryrun=False, verbose=False):
+        """ Perform one iteration of the submission loop.
+
+        Parameters
+        ----------
+        max_jobs: int or AdaptiveConcurrency
+            the maximum number of concurrent submissions, or a controller
+            adapting it to the scheduler feedback.
+        dryrun: bool, default False
+            if True, only print the submission commands.
+        verbose: bool, default False
+            if True, print the executor progress.
+
+        Returns
+        -------
+        started: list of DelayedJob
+            the jobs started during this iteration.
+        """
+        self._collect_done()
+        self._check_stalls(dryrun=dryrun)
+        if verbose:
+            print(self.status if self._progress is None
+                  else self._progress.summary)
+        started = self._next_jobs(max_jobs, dryrun=dryrun)
+        singles = []
+        for group in self._group_jobs(started):
+            if len(group) > 1:
+                self._job_class.start_array(group, dryrun=dryrun)
+            else:
+                singles.extend(group)
+        if len(singles) > 0:
+            self._job_class.start_jobs(singles, dryrun=dryrun)
+        for job in started:
+            self.journal.record(job.job_id, "started", job.submission_id)
+        self.journal.flush()
+        if self._progress is not None:
+            self._progress.submitted(
+                [job.job_id for job in started
+                 if self._first_submission(job)])
+            self._refresh_progress()
+        return started
+
+    def _first_submission(self, job):
+        """ Checks whether a started job is submitted for the first time,
+        and not continued after a checkpoint or resubmitted after a stall.
+        """
+        if job.restarts > 0:
+            return False
+        return (self.monitor is None or
+                job.job_id not in self.monitor.resubmissions)
+
+    def _refresh_progress(self):
+        """ Update the progress dashboard with the number of jobs and the
+        number of running jobs from the last call to the cluster.
+        """
+        self._progress.set_total(self.n_jobs)
+        self._progress.running(self.watcher.get_queue_stats()[1])
+        self._progress.refresh()
+
+    def _close_progress(self):
+        """ Update and close the progress dashboard: it remains available
+        in the `progress` attribute.
+        """
+        self._refresh_progress()
+        self._progress.close()
+        self.progress, self._progress = self._progress, None
+
+    def _shutdown_scheduler(self):
+        """ Release the workers of the local scheduler once all the jobs
+        are finished.
+        """
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+
+    def _group_jobs(self, jobs):
+        """ Group the jobs to be started in array jobs.
+
+        Parameters
+        ----------
+        jobs: list of DelayedJob
+            the jobs to be started.
+
+        Returns
+        -------
+        groups: list of list of DelayedJob
+            the jobs to be started together, sharing the same resource
+            class: groups with a single job are submitted individually.
+        """
+        if not self.array:
+            return [[job] for job in jobs]
+        classes = {}
+        groups = []
+        for job in jobs:
+            if len(job.dependencies) == 0:
+                classes.setdefault(job.resources, []).append(job)
+            else:
+                groups.append([job])
+        size = self._job_class._max_array_size
+        groups.extend(
+            packed[idx: idx + size] for packed in classes.values()
+            for idx in range(0, len(packed), size)
+        )
+        return groups
+
+    def _next_jobs(self, max_jobs, dryrun=False):
+        """ Select the waiting jobs to be started: jobs are considered in
+        the order of the executor policy, skipping the ones whose
+        dependencies are not finished. Jobs whose dependencies failed are
+        never started.
+
+        Parameters
+        ----------
+        max_jobs: int or AdaptiveConcurrency
+            the maximum number of concurrent submissions, or a controller
+            adapting it to the scheduler feedback.
+        dryrun: bool, default False
+            if True, the dependencies only need to be started.
+
+        Returns
+        -------
+        jobs: list of DelayedJob
+            the jobs to be started.
+        """
+        if isinstance(max_jobs, AdaptiveConcurrency):
+            max_jobs = max_jobs.update(*self.watcher.get_queue_stats())
+        jobs = []
+        if self.n_waiting_jobs != 0 and self.n_running_jobs < max_jobs:
+            _delta = max_jobs - self.n_running_jobs
+            deferred = []
+            while len(jobs) < _delta and len(self._queue) > 0:
+                job = self._queue.pop()
+                if job.submission_id is not None:
+                    continue
+                state = job._check_dependencies(dryrun=dryrun)
+                if state == "ready":
+                    jobs.append(job)
+                elif state == "failed":
+                    job._abort("dependency failed")
+                    self._in_flight.append(job)
+                else:
+                    deferred.append(job)
+            for job in deferred:
+                self._queue.push(job)
+            self._in_flight.extend(jobs)
+        return jobs
+
+    def _collect_done(self):
+        """ Finalize the started jobs that are finished: their attached
+        callables are called.
+        """
+        if self.monitor is not None:
+            self._resolve_speculations()
+        in_flight, done = [], []
+        speculations = (
+            {} if self.monitor is None else self.monitor.speculations)
+        for job in self._in_flight:
+            if job.done and job not in speculations:
+                done.append(job)
+            else:
+                in_flight.append(job)
+        self._in_flight = in_flight
+        if self.transport.remote and len(done) > 0:
+            self.transport.get([
+                path for job in done
+                for path in (job.paths.stdout, job.paths.stderr)
+            ])
+        reorder = False
+        done = [job for job in done if not self._continue(job)]
+        for job in done:
+            job._finalize()
+            success = False
+            if not job._cancelled:
+                success = job.exitcode
+                self.journal.record(
+                    job.job_id, "finished",
+                    "success" if success else "failure")
+            queue_wait, start_time = self._job_times(job)
+            runtime = None
+            if start_time is not None:
+                runtime = self._job_runtime(job, start_time)
+            if success and runtime is not None:
+                reorder |= self.order.observe(job, runtime)
+                if self.monitor is not None:
+                    self.monitor.observe(runtime)
+            if self._progress is not None:
+                self._progress.finished(
+                    job.job_id, success, queue_wait, start_time, runtime)
+            if (self.exclude_nodes is not None and not job._cancelled and
+                    job.submission_id != "EXIT"):
+                node = job.node
+                if (node is not None and
+                        self.exclude_nodes.observe(node, success)):
+                    self.journal.record(job.job_id, "excluded", node)
+            if self.log_store is not None:
+                self.log_store.pack(job.job_id, job.log_files)
+        if reorder:
+            self._queue.reorder()
+        self.journal.flush()
+
+    def _continue(self, job):
+        """ Queue the continuation of a checkpointed job.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a finished job.
+
+        Returns
+        -------
+        continued: bool
+            True if the job is queued again.
+        """
+        if (self.checkpoint is None or job._cancelled or
+                job.submission_id == "EXIT" or
+                job.restarts >= self.max_restarts or not job.checkpointed):
+            return False
+        if self.restart_walltime is not None:
+            job.resources = self._resource_class(**{
+                **dict(job.resources), "walltime": self.restart_walltime})
+        job.restarts += 1
+        job.submission_id = None
+        job.stderr = None
+        self._queue.push(job)
+        self.journal.record(job.job_id, "checkpointed", job.restarts)
+        return True
+
+    def _check_stalls(self, dryrun=False):
+        """ Handle the running jobs that made no progress for longer than
+        the stall monitor threshold.
+
+        Parameters
+        ----------
+        dryrun: bool, default False
+            if True, the jobs are not monitored.
+
+        Returns
+        -------
+        stalled: list of DelayedJob
+            the stalled jobs handled by this call.
+        """
+        monitor = self.monitor
+        if monitor is None or dryrun or not monitor.due():
+            return []
+        now = time.time()
+        stalled = []
+        for job in list(self._in_flight):
+            if (job.submission_id in (None, "EXIT") or
+                    job in monitor.speculations or job.done):
+                continue
+            _, start_time = self._job_times(job)
+            if (start_time is None or
+                    not monitor.is_stalled(job, start_time, now)):
+                continue
+            monitor.flagged.add(job.job_id)
+            stalled.append(job)
+            self.journal.record(job.job_id, "stalled", monitor.action)
+            if monitor.action == "resubmit":
+                job.cancel_jobs([job])
+                self._in_flight.remove(job)
+                monitor.resubmissions[job.job_id] = (
+                    monitor.resubmissions.get(job.job_id, 0) + 1)
+                job.submission_id = None
+                job.stderr = None
+                self._queue.push(job)
+            elif monitor.action == "speculate":
+                duplicate = self._create_job(
+                    job.delayed_submission, f"{job.job_id}_speculative")
+                duplicate.resources = job.resources
+                duplicate.start()
+                monitor.speculations[job] = duplicate
+            else:
+                warnings.warn(
+                    f"Job {job.job_id} ({job.submission_id}) made no "
+                    f"progress for more than {monitor.threshold:.0f} "
+                    "seconds.", stacklevel=find_stack_level()
+                )
+        self.journal.flush()
+        return stalled
+
+    def _resolve_speculations(self):
+        """ Keep the first copy of the speculated jobs to succeed, and
+        cancel the other one: the logs of a successful duplicate replace
+        the ones of the original job.
+        """
+        speculations = self.monitor.speculations
+        for job, duplicate in list(speculations.items()):
+            if job._cancelled or (job.done and job.exitcode):
+                duplicate.stop()
+            elif duplicate.done and duplicate.exitcode:
+                if not job.done:
+                    job.cancel_jobs([job])
+                paths, duplicate_paths = job.paths, duplicate.paths
+                for src, dst in (
+                        (duplicate_paths.stdout, paths.stdout),
+                        (duplicate_paths.stderr, paths.stderr)):
+                    if src.exists():
+                        os.replace(src, dst)
+                job.submission_id = duplicate.submission_id
+                self.journal.record(
+                    job.job_id, "started", duplicate.submission_id)
+            elif not (job.done and duplicate.done):
+                continue
+            del speculations[job]
+
+    def _job_times(self, job):
+        """ Returns the queue wait and the start time of a job from the
+        last call to the cluster.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a started job.
+
+        Returns
+        -------
+        queue_wait: float
+            the time spent in the queue (in seconds), None if not available.
+        start_time: float
+            the start timestamp, None if not available.
+        """
+        info = self.watcher._info_dict.get(job.submission_id)
+        if info is None:
+            return None, None
+        submit_time, start_time = self.watcher.read_times(info)
+        if submit_time is None or start_time is None:
+            return None, start_time
+        return max(start_time - submit_time, 0), start_time
+
+    def _job_runtime(self, job, start_time):
+        """ Returns the runtime of a finished job: up to the end time
+        reported by the scheduler when available, up to now otherwise.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a finished job.
+        start_time: float
+            the start timestamp of the job.
 
-    def submit(self, script, *args, execution_parameters=None, **kwargs):
+        Returns
+        -------
+        runtime: float
+            the job runtime (in seconds).
+        """
+        now = time.time()
+        info = self.watcher._info_dict.get(job.submission_id)
+        end_time = None if info is None else self.watcher.read_end_time(info)
+        if end_time is None or not start_time <= end_time <= now:
+            end_time = now
+        return max(end_time - start_time, 0)
+
+    def _step(self):
+        """ Perform one iteration of the submission loop with the current
+        execution options and the last maximum number of concurrent
+        submissions.
+
+        Returns
+        -------
+        started: list of DelayedJob
+            the jobs started during this iteration.
+        """
+        _, dryrun = self._read_options()
+        return self._tick(self.max_jobs, dryrun=dryrun)
+
+    def submit(self, script, *args, execution_parameters=None, after=None,
+               memory=None, walltime=None, n_cpus=None, n_gpus=None,
+               priority=0, expected_runtime=None, **kwargs):
         """ Create a delayed job.
 
         Parameters
@@ -173,6 +840,30 @@ class Executor:
         *args: any positional argument of the script.
         execution_parameters: str
             parameters passed to the container during execution.
+        after: list of DelayedJob, default None
+            the jobs that must complete successfully before this job starts.
+            When supported, the dependencies are delegated to the scheduler
+            as soon as they are submitted. The job is never started if one
+            of its dependencies fails.
+        memory: float, default None
+            the memory allocated to this job (in GB). By default, the
+            executor memory.
+        walltime: int, default None
+            the walltime used for this job (in hours). By default, the
+            executor walltime.
+        n_cpus: int, default None
+            the number of cores allocated for this job. By default, the
+            executor number of cores.
+        n_gpus: int, default None
+            the number of GPUs allocated for this job. By default, the
+            executor number of GPUs.
+        priority: float, default 0
+            the priority of the job: with the 'priority' order, the jobs
+            with the highest priorities are started first.
+        expected_runtime: float, default None
+            the expected runtime of the job (in seconds), used by the
+            'lpt' and 'spt' orders. By default, it is learned from the
+            finished jobs running the same script.
         **kwargs: any named argument of the script.
 
         Returns
@@ -180,37 +871,195 @@ class Executor:
         job: DelayedJob
             a job instance.
 
+        Notes
+        -----
+        Jobs with the same resources form a resource class: they share a
+        compiled batch template and are packed together in array jobs. With
+        the default 'backfill' order, the waiting jobs are started by
+        decreasing resource class (number of GPUs, cores, memory and
+        walltime), and in submission order within a class, so that the big
+        jobs are queued first and the cheap ones backfill the remaining
+        resources. Jobs can be submitted while the executor is running.
+
         Raises
         ------
         RuntimeError
             If the job class is not DelayedCCCJob for multi-tasks submission.
         """
-        self._counter += 1
         if isinstance(script, (list, tuple)):
             if self._job_class != DelayedCCCJob:
                 raise RuntimeError(
                     "Submitting many jobs inside an allocation only supported "
                     "with CCC."
                 )
-            job = self._job_class(
+            submission = script
+        else:
+            submission = DelayedSubmission(
                 script,
+                *args,
+                execution_parameters=execution_parameters,
+                **kwargs
+            )
+        dependencies = tuple(after or ())
+        resources = self._resource_class(
+            memory=memory, walltime=walltime, ncpus=n_cpus, ngpus=n_gpus)
+        if self.dedup:
+            key = self._dedup_key(submission, dependencies, resources)
+            job = self._dedup_index.get(key)
+            if job is not None and not job._cancelled:
+                self._duplicates[job] = self._duplicates.get(job, 0) + 1
+                return job
+        self._counter += 1
+        job = self._create_job(submission, self._counter)
+        job.dependencies = dependencies
+        job.resources = resources
+        job.priority = priority
+        job.expected_runtime = expected_runtime
+        if self.dedup:
+            self._dedup_index[key] = job
+        self._delayed_jobs.append(job)
+        self._queue.push(job)
+        self.journal.record(job.job_id, "submitted")
+        return job
+
+    def _create_job(self, submission, job_id):
+        """ Create a job of the executor cluster type.
+
+        Parameters
+        ----------
+        submission: DelayedSubmission or list of DelayedSubmission
+            the submission(s) executed by the job.
+        job_id: int or str
+            the job identifier.
+
+        Returns
+        -------
+        job: DelayedJob
+            a job instance.
+        """
+        if isinstance(submission, (list, tuple)):
+            return self._job_class(
+                submission,
                 self,
-                self._counter,
+                job_id,
                 backend=self.backend,
             )
-        else:
-            job = self._job_class(
-                DelayedSubmission(
-                    script,
-                    *args,
-                    execution_parameters=execution_parameters,
-                    **kwargs
-                ),
-                self,
-                self._counter
+        return self._job_class(submission, self, job_id)
+
+    def _resource_class(self, **overrides):
+        """ Return the resource class of a job: the executor resources that
+        are overridden. Resource classes are interned, and ordered by
+        decreasing number of GPUs, cores, memory and walltime.
+
+        Parameters
+        ----------
+        **overrides: the resources of the job, None to use the executor
+            ones.
+
+        Returns
+        -------
+        resources: tuple
+            the sorted (name, value) pairs of the overridden resources.
+        """
+        resources = tuple(sorted(
+            (name, value) for name, value in overrides.items()
+            if value is not None and value != self.parameters[name]
+        ))
+        if resources not in self._resource_classes:
+            params = {**self.parameters, **dict(resources)}
+            self._resource_classes[resources] = (
+                tuple(-params[name]
+                      for name in ("ngpus", "ncpus", "memory", "walltime")),
+                resources
             )
-        self._delayed_jobs.append(job)
-        return job
+        return self._resource_classes[resources][1]
+
+    def _dedup_key(self, submission, dependencies, resources=()):
+        """ Return the key identifying identical submissions.
+
+        Parameters
+        ----------
+        submission: DelayedSubmission or list of DelayedSubmission
+            the submission(s) of the job.
+        dependencies: tuple of DelayedJob
+            the jobs that must complete before this job starts.
+        resources: tuple, default ()
+            the resource class of the job.
+
+        Returns
+        -------
+        key: tuple
+            the commands, execution parameters, image, resources and
+            dependencies of the job.
+        """
+        if not isinstance(submission, (list, tuple)):
+            submission = [submission]
+        return (
+            tuple((item.command, item.execution_parameters)
+                  for item in submission),
+            tuple(self.parameters.items()),
+            resources,
+            tuple(id(dep) for dep in dependencies),
+        )
+
+    def cancel(self, filter=None, signal=None):
+        """ Cancel jobs, or send a signal to the started jobs. The scheduler
+        is called as few times as possible.
+
+        Parameters
+        ----------
+        filter: callable, default None
+            a function that takes a job as its only argument and returns
+            True if the job is selected. By default, all the jobs are
+            selected.
+        signal: int or str, default None
+            the signal sent to the started jobs, e.g. `signal.SIGUSR1` or
+            'USR1'. By default, the jobs are canceled: the waiting jobs
+            are never started and the started jobs are removed from the
+            scheduler.
+
+        Returns
+        -------
+        jobs: list of DelayedJob
+            the canceled or signaled jobs.
+
+        Examples
+        --------
+        >>> import hopla
+        >>> executor = hopla.Executor(
+        ...     cluster="local",
+        ...     folder="/tmp/hopla",
+        ...     queue="local",
+        ...     image="",
+        ... )
+        >>> jobs = [executor.submit("sleep", k) for k in range(1, 11)]
+        >>> canceled = executor.cancel(lambda job: job.job_id > 5)
+        >>> len(canceled)
+        5
+        """
+        opts = hopla_options.get()
+        dryrun = opts.get("dryrun", DEFAULT_OPTIONS["dryrun"])
+        selected = [
+            job for job in self._delayed_jobs
+            if not job._cancelled and (filter is None or filter(job))
+        ]
+        started = [
+            job for job in selected
+            if job.submission_id not in (None, "EXIT") and not job.done
+        ]
+        self._job_class.cancel_jobs(started, signal=signal, dryrun=dryrun)
+        if signal is not None:
+            return started
+        waiting = [job for job in selected if job.submission_id is None]
+        for job in waiting:
+            job._abort("canceled")
+        self._queue.filter(lambda job: job.submission_id is None)
+        self._in_flight.extend(waiting)
+        for job in waiting + started:
+            job._cancelled = True
+            self.journal.record(job.job_id, "canceled")
+        self.journal.flush()
+        return waiting + started
 
     @property
     def status(self):
@@ -223,6 +1072,9 @@ class Executor:
         message += [f"- done: {self.n_done_jobs}"]
         message += [f"- running: {self.n_running_jobs}"]
         message += [f"- waiting: {self.n_waiting_jobs}"]
+        message += [f"- canceled: {self.n_cancelled_jobs}"]
+        if isinstance(self.max_jobs, AdaptiveConcurrency):
+            message += [f"- limit: {self.max_jobs.limit}"]
         return "\n".join(message)
 
     @property
@@ -230,6 +1082,23 @@ class Executor:
         """ Generate a general report for all jobs.
         """
         message = [job.report for job in self._delayed_jobs]
+        if len(self._duplicates) > 0:
+            prefix = f"{self.__class__.__name__}<duplicates>"
+            message.append("-" * 40)
+            message.append(
+                f"{prefix}collapsed: {sum(self._duplicates.values())} "
+                f"duplicates of {len(self._duplicates)} jobs")
+            message.extend(
+                f"{prefix}job_id={job.job_id}: {count}"
+                for job, count in self._duplicates.items()
+            )
+        if self.exclude_nodes is not None:
+            prefix = f"{self.__class__.__name__}<nodes>"
+            message.append("-" * 40)
+            message.append(
+                f"{prefix}excluded: {', '.join(self.exclude_nodes.excluded)}")
+            message.extend(
+                f"{prefix}{line}" for line in self.exclude_nodes.summary)
         return "\n".join(message)
 
     @property
@@ -250,6 +1119,12 @@ class Executor:
         """
         return sum([job.status == "NOTSTARTED" for job in self._delayed_jobs])
 
+    @property
+    def n_cancelled_jobs(self):
+        """ Get the number of canceled jobs.
+        """
+        return sum(job._cancelled for job in self._delayed_jobs)
+
     @property
     def n_running_jobs(self):
         """ Get the number of running jobs.
@@ -259,12 +1134,23 @@ class Executor:
 
 class DelayedSubmission:
     """ Object for specifying the submit parameters for further processing.
+
+    The script and the execution parameters are interned: they are shared
+    by all the submissions of a campaign.
     """
+    __slots__ = ("_kwargs", "args", "execution_parameters", "script")
+
     def __init__(self, script, *args, execution_parameters=None, **kwargs):
-        self.script = script
+        self.script = sys.intern(script) if isinstance(script, str) else script
         self.args = args
-        self.execution_parameters = execution_parameters or ""
-        self.kwargs = kwargs
+        self.execution_parameters = sys.intern(execution_parameters or "")
+        self._kwargs = kwargs or None
+
+    @property
+    def kwargs(self):
+        """ Return the named arguments of the script.
+        """
+        return self._kwargs or {}
 
     @property
     def command(self):
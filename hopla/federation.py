@@ -0,0 +1,345 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the execution of jobs across several clusters or queues.
+"""
+
+import time
+from pathlib import Path
+
+from tqdm import tqdm
+
+from .control import AdaptiveConcurrency
+from .executor import DelayedSubmission, Executor
+from .utils import format_attributes
+
+
+class FederatedExecutor:
+    """ Job executor routing each job to the backend (a cluster and a queue)
+    with the shortest expected start time.
+
+    The jobs are routed when they are started: the expected start time of
+    each backend is estimated from the live watcher state (pending and
+    running jobs) and from the queue waits observed so far. Backends whose
+    limit is reached are not considered.
+
+    Parameters
+    ----------
+    folder: Path/str
+        folder for storing job submission/output and logs: each backend uses
+        a sub-folder.
+    profiles: list of dict
+        the backend profiles: the parameters of each
+        :class:`~hopla.executor.Executor` (except the folder) and an
+        optional 'max_jobs' limit (an int or an `AdaptiveConcurrency`
+        controller, default 300).
+    smoothing: float, default 0.3
+        the weight of the last observation in the queue wait estimate of
+        each backend.
+
+    Examples
+    --------
+    >>> import hopla
+    >>> executor = hopla.FederatedExecutor(
+    ...     folder="/tmp/hopla",
+    ...     profiles=[
+    ...         {"cluster": "slurm", "queue": "Nspin_long",
+    ...          "image": "/tmp/hopla/my-apptainer-img.simg", "max_jobs": 100},
+    ...         {"cluster": "pbs", "queue": "Nspin_short",
+    ...          "image": "/tmp/hopla/my-apptainer-img.simg", "max_jobs": 50},
+    ...     ],
+    ... )
+    >>> jobs = [executor.submit("sleep", k) for k in range(1, 11)]
+    >>> executor() # doctest: +SKIP
+    >>> print(executor.report) # doctest: +SKIP
+
+    Raises
+    ------
+    ValueError
+        If no profile is given.
+    """
+    _start = time.time()
+
+    def __init__(self, folder, profiles, smoothing=0.3):
+        if len(profiles) == 0:
+            raise ValueError("At least one backend profile is expected.")
+        self.folder = Path(folder).expanduser().absolute()
+        self.smoothing = smoothing
+        self.executors = []
+        self.limits = []
+        for idx, profile in enumerate(profiles):
+            profile = dict(profile)
+            self.limits.append(profile.pop("max_jobs", 300))
+            self.executors.append(Executor(
+                folder=self.folder / f"{idx}_{profile['cluster']}",
+                **profile
+            ))
+        self._waits = [None] * len(self.executors)
+        self._delayed_jobs = []
+        self._queue = []
+
+    def __call__(self):
+        """ Route and run jobs controlling the maximum number of concurrent
+        submissions of each backend.
+        """
+        verbose, dryrun = self.executors[0]._read_options()
+        for executor in self.executors[1:]:
+            executor._read_options()
+        delay_s = self.executors[0]._delay_s
+        pbar = tqdm(total=self.n_jobs, desc="FEDERATED")
+        while (len(self._queue) != 0 or
+               any(executor.n_waiting_jobs != 0 or
+                   len(executor._in_flight) != 0
+                   for executor in self.executors) or
+               not all(job.done for job in self._delayed_jobs)):
+            self._dispatch()
+            if verbose:
+                print(self.status)
+            for executor, max_jobs in zip(self.executors, self.limits,
+                                          strict=True):
+                started = executor._tick(max_jobs, dryrun=dryrun)
+                pbar.update(len(started))
+                pbar.refresh()
+            time.sleep(delay_s)
+        pbar.close()
+        for executor in self.executors:
+            executor.watcher.update()
+            executor._collect_done()
+            executor._shutdown_scheduler()
+
+    def _dispatch(self):
+        """ Route the waiting jobs to the backends with free slots, in
+        increasing order of expected start time.
+        """
+        if len(self._queue) == 0:
+            return
+        free, pending, running = [], [], []
+        for idx, executor in enumerate(self.executors):
+            n_pending, n_running, queue_wait = (
+                executor.watcher.get_queue_stats())
+            if queue_wait is not None:
+                previous = self._waits[idx]
+                self._waits[idx] = (
+                    queue_wait if previous is None else
+                    self.smoothing * queue_wait +
+                    (1 - self.smoothing) * previous
+                )
+            limit = self.limits[idx]
+            if isinstance(limit, AdaptiveConcurrency):
+                limit = limit.limit
+            free.append(
+                limit - executor.n_running_jobs - executor.n_waiting_jobs)
+            pending.append(n_pending)
+            running.append(n_running)
+        queue = []
+        for job in self._queue:
+            candidates = [idx for idx, n_free in enumerate(free) if n_free > 0]
+            if len(candidates) == 0:
+                queue.append(job)
+                continue
+            idx = min(candidates, key=lambda idx: (
+                self.expected_start(idx, pending[idx], running[idx]), idx))
+            job._route(idx, self.executors[idx])
+            free[idx] -= 1
+            pending[idx] += 1
+        self._queue = queue
+
+    def expected_start(self, idx, n_pending, n_running):
+        """ Estimate the time before a new job starts on a backend.
+
+        Parameters
+        ----------
+        idx: int
+            the backend index.
+        n_pending: int
+            the number of jobs waiting in the backend queue.
+        n_running: int
+            the number of jobs running on the backend.
+
+        Returns
+        -------
+        delay: float
+            the expected start delay (in seconds): the smoothed queue wait
+            scaled by the pending backlog. Backends without observation
+            are expected to start jobs immediately.
+        """
+        wait = self._waits[idx] or 0
+        return wait * (1 + n_pending / max(n_running, 1))
+
+    def submit(self, script, *args, execution_parameters=None, memory=None,
+               walltime=None, n_cpus=None, n_gpus=None, **kwargs):
+        """ Create a delayed job routed to a backend when started.
+
+        Parameters
+        ----------
+        script: str
+            the script to run.
+        *args: list of str
+            the script arguments.
+        execution_parameters: str
+            parameters passed to the container during execution.
+        memory: float, default None
+            the memory allocated to this job (in GB).
+        walltime: int, default None
+            the walltime used for this job (in hours).
+        n_cpus: int, default None
+            the number of cores allocated for this job.
+        n_gpus: int, default None
+            the number of GPUs allocated for this job.
+        **kwargs: any named argument of the script.
+
+        Returns
+        -------
+        job: FederatedJob
+            a job instance.
+        """
+        job = FederatedJob(
+            DelayedSubmission(
+                script,
+                *args,
+                execution_parameters=execution_parameters,
+                **kwargs
+            ),
+            self,
+            len(self._delayed_jobs) + 1
+        )
+        job.resources = {
+            "memory": memory,
+            "walltime": walltime,
+            "n_cpus": n_cpus,
+            "n_gpus": n_gpus,
+        }
+        self._delayed_jobs.append(job)
+        self._queue.append(job)
+        return job
+
+    @property
+    def status(self):
+        """ Display current status.
+        """
+        message = ["-" * 40]
+        message += [(f"{self.__class__.__name__}<time="
+                     f"{time.time() - self._start}>")]
+        message += [f"- jobs: {self.n_jobs}"]
+        message += [f"- done: {self.n_done_jobs}"]
+        message += [f"- waiting: {len(self._queue)}"]
+        for idx, executor in enumerate(self.executors):
+            message += [(
+                f"- backend {idx} ({executor._job_class._submission_cmd} "
+                f"{executor.parameters['queue']}): "
+                f"{executor.n_jobs} jobs, {executor.n_running_jobs} running"
+            )]
+        return "\n".join(message)
+
+    @property
+    def report(self):
+        """ Generate a general report for all jobs.
+        """
+        message = [job.report for job in self._delayed_jobs]
+        return "\n".join(message)
+
+    @property
+    def n_jobs(self):
+        """ Get the number of stacked jobs.
+        """
+        return len(self._delayed_jobs)
+
+    @property
+    def n_done_jobs(self):
+        """ Get the number of finished jobs.
+        """
+        return sum([job.done for job in self._delayed_jobs])
+
+
+class FederatedJob:
+    """ Represents a job that will be routed to a backend of a federated
+    executor when started.
+
+    Parameters
+    ----------
+    delayed_submission: DelayedSubmission
+        a delayed submission allowing to generate the command line to
+        execute.
+    executor: FederatedExecutor
+        the federated executor.
+    job_id: int
+        the job identifier.
+    """
+    __slots__ = ("_executor", "backend", "delayed_submission", "job",
+                 "job_id", "resources")
+
+    def __init__(self, delayed_submission, executor, job_id):
+        self.delayed_submission = delayed_submission
+        self._executor = executor
+        self.job_id = job_id
+        self.backend = None
+        self.job = None
+        self.resources = {}
+
+    def _route(self, backend, executor):
+        """ Create the job on a backend.
+
+        Parameters
+        ----------
+        backend: int
+            the backend index.
+        executor: Executor
+            the backend executor.
+        """
+        submission = self.delayed_submission
+        self.backend = backend
+        self.job = executor.submit(
+            submission.script,
+            *submission.args,
+            execution_parameters=submission.execution_parameters,
+            **self.resources,
+            **submission.kwargs
+        )
+
+    @property
+    def done(self):
+        """ Checks whether the job is finished properly.
+        """
+        return self.job is not None and self.job.done
+
+    @property
+    def status(self):
+        """ Checks the job status.
+        """
+        if self.job is None:
+            return "NOTSTARTED"
+        return self.job.status
+
+    @property
+    def exitcode(self):
+        """ Check if the code finished properly.
+        """
+        return self.job is not None and self.job.exitcode
+
+    @property
+    def report(self):
+        """ Generate a report for the submitted job.
+        """
+        prefix = f"{self.__class__.__name__}<job_id={self.job_id}>"
+        if self.job is None:
+            return "\n".join(["-" * 40, f"{prefix}backend: none"])
+        executor = self._executor.executors[self.backend]
+        return "\n".join([
+            "-" * 40,
+            (f"{prefix}backend: {self.backend} "
+             f"({executor._job_class._submission_cmd} "
+             f"{executor.parameters['queue']})"),
+            self.job.report.removeprefix("-" * 40 + "\n"),
+        ])
+
+    def __repr__(self):
+        return format_attributes(
+            self,
+            attrs=["job_id", "backend", "job"]
+        )
@@ -0,0 +1,168 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains functions to wait on jobs, mirroring `concurrent.futures`.
+"""
+
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, NamedTuple
+
+from .config import (
+    DEFAULT_OPTIONS,
+    hopla_options,
+)
+
+if TYPE_CHECKING:
+    from .utils import DelayedJob
+
+FIRST_COMPLETED = "FIRST_COMPLETED"
+FIRST_EXCEPTION = "FIRST_EXCEPTION"
+ALL_COMPLETED = "ALL_COMPLETED"
+
+
+class DoneAndNotDoneJobs(NamedTuple):
+    """ The finished jobs and the unfinished jobs returned by `wait`.
+    """
+    done: set
+    not_done: set
+
+
+def wait(jobs, timeout=None, return_when=ALL_COMPLETED):
+    """ Wait for the jobs to finish. The executors of the jobs are driven
+    while waiting: do not call them concurrently.
+
+    Parameters
+    ----------
+    jobs: list of DelayedJob
+        the jobs to wait for.
+    timeout: float, default None
+        the maximum number of seconds to wait. By default, there is no
+        limit on the wait time.
+    return_when: str, default 'ALL_COMPLETED'
+        when this function should return: 'FIRST_COMPLETED',
+        'FIRST_EXCEPTION' or 'ALL_COMPLETED'.
+
+    Returns
+    -------
+    done_and_not_done: DoneAndNotDoneJobs
+        the finished jobs and the unfinished jobs.
+
+    Raises
+    ------
+    ValueError
+        If the return condition is not supported.
+
+    Examples
+    --------
+    >>> import hopla
+    >>> executor = hopla.Executor(
+    ...     cluster="local",
+    ...     folder="/tmp/hopla",
+    ...     queue="local",
+    ...     image="",
+    ... )
+    >>> jobs = [executor.submit("sleep", k) for k in range(1, 11)]
+    >>> done, not_done = hopla.wait(jobs, timeout=2) # doctest: +SKIP
+    """
+    if return_when not in (FIRST_COMPLETED, FIRST_EXCEPTION, ALL_COMPLETED):
+        raise ValueError(f"Unsupported return condition: {return_when}")
+    jobs = set(jobs)
+    end_time = None if timeout is None else time.time() + timeout
+    while True:
+        _collect(jobs)
+        done = {job for job in jobs if job.done}
+        not_done = jobs - done
+        if (len(not_done) == 0 or
+                (return_when == FIRST_COMPLETED and len(done) > 0) or
+                (return_when == FIRST_EXCEPTION and
+                 any(not job.exitcode for job in done))):
+            break
+        if end_time is not None and time.time() >= end_time:
+            break
+        _drive(not_done, end_time)
+    return DoneAndNotDoneJobs(done, not_done)
+
+
+def as_completed(jobs, timeout=None) -> Iterator["DelayedJob"]:
+    """ Iterate over the jobs as they finish. The executors of the jobs are
+    driven while waiting: do not call them concurrently.
+
+    Parameters
+    ----------
+    jobs: list of DelayedJob
+        the jobs to iterate over.
+    timeout: float, default None
+        the maximum number of seconds to wait. By default, there is no
+        limit on the wait time.
+
+    Yields
+    ------
+    job: DelayedJob
+        a finished job.
+
+    Raises
+    ------
+    TimeoutError
+        If some jobs did not finish before the timeout.
+    """
+    pending = list(dict.fromkeys(jobs))
+    n_jobs = len(pending)
+    end_time = None if timeout is None else time.time() + timeout
+    while len(pending) > 0:
+        _collect(pending)
+        remaining = []
+        for job in pending:
+            if job.done:
+                yield job
+            else:
+                remaining.append(job)
+        pending = remaining
+        if len(pending) == 0:
+            break
+        if end_time is not None and time.time() >= end_time:
+            raise TimeoutError(
+                f"{len(pending)} (of {n_jobs}) jobs unfinished."
+            )
+        _drive(pending, end_time)
+
+
+def _collect(jobs):
+    """ Finalize the finished jobs of the jobs executors, so that their
+    attached callables are called before the jobs are returned.
+
+    Parameters
+    ----------
+    jobs: iterable of DelayedJob
+        the unfinished jobs.
+    """
+    executors = {id(job._executor): job._executor for job in jobs}
+    for executor in executors.values():
+        executor._collect_done()
+
+
+def _drive(jobs, end_time):
+    """ Perform one iteration of the submission loop of the jobs executors
+    and sleep until the next iteration.
+
+    Parameters
+    ----------
+    jobs: iterable of DelayedJob
+        the unfinished jobs.
+    end_time: float
+        the time after which the wait is stopped, or None.
+    """
+    executors = {id(job._executor): job._executor for job in jobs}
+    for executor in executors.values():
+        executor._step()
+    opts = hopla_options.get()
+    delay_s = opts.get("delay_s", DEFAULT_OPTIONS["delay_s"])
+    if end_time is not None:
+        delay_s = max(min(delay_s, end_time - time.time()), 0)
+    time.sleep(delay_s)
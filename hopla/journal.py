@@ -0,0 +1,212 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the journal of the job events of an executor folder.
+"""
+
+import time
+
+from .utils import format_attributes
+
+
+class Journal:
+    """ Records the job events of an executor in an append-only file.
+
+    Each line of the journal contains the event time, the job identifier,
+    the event and its value:
+
+    - 'submitted': the job is created.
+    - 'started': the job is submitted, the value is the submission ID.
+    - 'finished': the job is finished, the value is 'success' or
+      'failure'.
+    - 'canceled': the job is canceled.
+    - 'checkpointed': the job saved its state and is queued again, the
+      value is the number of continuations.
+    - 'stalled': the job made no progress for too long, the value is the
+      action of the stall monitor.
+    - 'excluded': the failure of the job excluded its node, the value is
+      the node name.
+
+    The events are buffered and written by `flush`, or as soon as
+    `max_buffer` events are buffered, so that the state of a campaign can
+    be read from another process without querying every log.
+
+    Parameters
+    ----------
+    folder: Path
+        the executor folder.
+    cluster: str
+        the type of cluster.
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> from hopla.journal import Journal
+    >>> journal = Journal(Path("/tmp/hopla-journal"), cluster="slurm")
+    >>> journal.record(1, "submitted")
+    >>> journal.record(1, "started", "1234")
+    >>> journal.flush()
+    >>> cluster, jobs = Journal.read(Path("/tmp/hopla-journal"))
+    >>> jobs["1"]["submission_id"]
+    '1234'
+    """
+    filename = "journal.tsv"
+    max_buffer = 1024
+
+    def __init__(self, folder, cluster):
+        self.path = folder / self.filename
+        self.cluster = cluster
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "w") as of:
+            of.write(f"#cluster\t{cluster}\n")
+        self._buffer = []
+
+    def record(self, job_id, event, value=""):
+        """ Records a job event.
+
+        Parameters
+        ----------
+        job_id: str
+            the job identifier.
+        event: str
+            the event: 'submitted', 'started', 'finished', 'canceled',
+            'checkpointed', 'stalled' or 'excluded'.
+        value: str, default ''
+            the event value.
+        """
+        self._buffer.append(
+            f"{time.time():.3f}\t{job_id}\t{event}\t{value}\n")
+        if len(self._buffer) >= self.max_buffer:
+            self.flush()
+
+    def flush(self):
+        """ Writes the buffered events.
+        """
+        if len(self._buffer) == 0:
+            return
+        with open(self.path, "a") as of:
+            of.writelines(self._buffer)
+        self._buffer = []
+
+    @classmethod
+    def read(cls, folder):
+        """ Reads the journal of an executor folder.
+
+        Parameters
+        ----------
+        folder: Path
+            the executor folder.
+
+        Returns
+        -------
+        cluster: str
+            the type of cluster.
+        jobs: dict
+            the state of each job, indexed by the job identifier: the
+            'submitted', 'started', 'finished' and 'canceled' event times,
+            the 'submission_id' and the 'result' ('success' or 'failure').
+
+        Raises
+        ------
+        FileNotFoundError
+            If the folder contains no journal.
+        """
+        path = folder / cls.filename
+        if not path.exists():
+            raise FileNotFoundError(f"No hopla journal in {folder}.")
+        cluster, jobs = None, {}
+        with open(path) as of:
+            for line in of:
+                fields = line.rstrip("\n").split("\t")
+                if fields[0] == "#cluster":
+                    cluster = fields[1]
+                    continue
+                if len(fields) != 4:
+                    continue
+                timestamp, job_id, event, value = fields
+                state = jobs.setdefault(job_id, {})
+                state[event] = float(timestamp)
+                if event == "started":
+                    state["submission_id"] = value
+                    state.pop("finished", None)
+                    state.pop("result", None)
+                elif event == "finished":
+                    state["result"] = value
+        return cluster, jobs
+
+    def __repr__(self):
+        return format_attributes(self, attrs=["path", "cluster"])
+
+
+def summarize(jobs, pending=None, completed=None, now=None):
+    """ Summarizes the state of a campaign.
+
+    Parameters
+    ----------
+    jobs: dict
+        the state of each job, as returned by `Journal.read`.
+    pending: set of str, default None
+        the submission IDs of the jobs waiting in the scheduler queue.
+    completed: set of str, default None
+        the submission IDs of the jobs finished on the scheduler side but
+        not yet collected by the executor.
+    now: float, default None
+        the current time. By default, `time.time()`.
+
+    Returns
+    -------
+    summary: dict
+        the number of jobs in each state, the throughput (finished jobs per
+        hour), the expected remaining time (in seconds, None if unknown),
+        and the identifiers of the failed jobs.
+    """
+    now = now or time.time()
+    pending = pending or set()
+    completed = completed or set()
+    counts = dict.fromkeys(
+        ["jobs", "waiting", "pending", "running", "completed", "success",
+         "failure", "canceled"], 0)
+    failures = []
+    first_start, last_finish = None, None
+    for job_id, state in jobs.items():
+        counts["jobs"] += 1
+        if "started" in state:
+            first_start = min(first_start or state["started"],
+                              state["started"])
+        if "finished" in state:
+            last_finish = max(last_finish or state["finished"],
+                              state["finished"])
+        if "canceled" in state:
+            counts["canceled"] += 1
+        elif "result" in state:
+            counts[state["result"]] += 1
+            if state["result"] == "failure":
+                failures.append(job_id)
+        elif "started" in state:
+            if state["submission_id"] in pending:
+                counts["pending"] += 1
+            elif state["submission_id"] in completed:
+                counts["completed"] += 1
+            else:
+                counts["running"] += 1
+        else:
+            counts["waiting"] += 1
+    n_finished = counts["success"] + counts["failure"]
+    n_remaining = counts["jobs"] - n_finished - counts["canceled"]
+    throughput, eta = 0., None
+    if first_start is not None and n_finished > 0:
+        end = now if n_remaining > 0 else last_finish
+        throughput = n_finished / max(end - first_start, 1e-6) * 3600
+        eta = n_remaining / throughput * 3600
+    return {
+        **counts,
+        "throughput": throughput,
+        "eta": eta,
+        "failures": failures,
+    }
@@ -0,0 +1,612 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains local (in-process scheduler) specific functions.
+"""
+
+import json
+import os
+import random
+import shlex
+import signal
+import socket
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from signal import Signals
+
+from .utils import (
+    DelayedJob,
+    InfoWatcher,
+    format_attributes,
+    signal_name,
+    slurm_number,
+)
+
+
+class LocalScheduler:
+    """ In-process scheduler executing batch scripts on the current machine.
+
+    Each submitted script is run with `bash` as soon as a worker of the
+    pool is available. The `#HOPLA` directives of the script are used to
+    redirect its outputs, as a batch system would do with its own
+    directives.
+
+    Parameters
+    ----------
+    n_workers: int, default None
+        the number of scripts executed concurrently. By default, the number
+        of available cores.
+    """
+    _directive = "#HOPLA"
+    _final_states = ("COMPLETED", "FAILED", "CANCELLED")
+
+    def __init__(self, n_workers=None):
+        self.n_workers = n_workers or os.cpu_count() or 1
+        self._hostname = socket.gethostname()
+        self._lock = threading.Lock()
+        self._pool = None
+        self._counter = 0
+        self._jobs = {}
+
+    def submit(self, script):
+        """ Submit a batch script.
+
+        Parameters
+        ----------
+        script: Path/str
+            the batch script to submit.
+
+        Returns
+        -------
+        output: str
+            the submission message containing the job ID.
+        """
+        job_id, job = self._register(script)
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.n_workers,
+                thread_name_prefix="hopla",
+            )
+        job["future"] = self._pool.submit(self._run, job_id, job, script)
+        return f"Submitted batch job {job_id}"
+
+    def cancel(self, job_ids):
+        """ Cancel jobs.
+
+        Parameters
+        ----------
+        job_ids: list of str
+            the jobs to cancel.
+        """
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            with self._lock:
+                if job["state"] in self._final_states:
+                    continue
+                job["state"] = "CANCELLED"
+                job["end"] = time.time()
+                if job.get("process") is not None:
+                    os.killpg(job["process"].pid, signal.SIGTERM)
+
+    def kill(self, job_ids, signum):
+        """ Send a signal to running jobs.
+
+        Parameters
+        ----------
+        job_ids: list of str
+            the jobs to signal.
+        signum: int
+            the signal number.
+        """
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            with self._lock:
+                if (job["state"] == "RUNNING" and
+                        job.get("process") is not None):
+                    os.killpg(job["process"].pid, signum)
+
+    def squeue(self, job_ids):
+        """ List jobs status.
+
+        Parameters
+        ----------
+        job_ids: list of str
+            the jobs to be listed.
+
+        Returns
+        -------
+        output: str
+            the jobs status in the `squeue --json` format.
+        """
+        now = time.time()
+        jobs = []
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is None:
+                continue
+            self._refresh(job_id, job, now)
+            jobs.append({
+                "job_id": int(job_id),
+                "name": job["name"],
+                "partition": "local",
+                "job_state": [job["state"]],
+                "nodes": self._hostname,
+                "submit_time": self._number(job["submit"]),
+                "start_time": self._number(job["start"]),
+                "end_time": self._number(job["end"]),
+                "exit_code": {
+                    "return_code": self._number(job["returncode"]),
+                },
+                "standard_output": job["stdout"],
+                "standard_error": job["stderr"],
+            })
+        return json.dumps({"jobs": jobs})
+
+    @classmethod
+    def read_directives(cls, script):
+        """ Reads the `#HOPLA` directives of a batch script.
+
+        Parameters
+        ----------
+        script: Path/str
+            the batch script.
+
+        Returns
+        -------
+        directives: dict
+            the directives values indexed by option names.
+        """
+        directives = {}
+        with open(script) as of:
+            for line in of:
+                if not line.startswith(cls._directive):
+                    continue
+                tokens = shlex.split(line[len(cls._directive):])
+                if len(tokens) == 1:
+                    key, _, val = tokens[0].partition("=")
+                elif len(tokens) == 2:
+                    key, val = tokens
+                else:
+                    continue
+                directives[key] = val
+        return directives
+
+    def _register(self, script):
+        """ Create the record of a submitted job.
+        """
+        self._counter += 1
+        job_id = str(self._counter)
+        directives = self.read_directives(script)
+        self._jobs[job_id] = {
+            "name": directives.get("-J", "hopla"),
+            "stdout": directives.get("-o"),
+            "stderr": directives.get("-e"),
+            "state": "PENDING",
+            "submit": time.time(),
+            "start": None,
+            "end": None,
+            "returncode": None,
+        }
+        return job_id, self._jobs[job_id]
+
+    def shutdown(self):
+        """ Releases the workers of the pool once the submitted scripts are
+        finished: a new pool is created by the next submission.
+        """
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def _run(self, job_id, job, script):
+        """ Execute a batch script in a worker of the pool: a script that
+        can't be started is marked as failed.
+        """
+        env = dict(os.environ, HOPLA_JOB_ID=job_id)
+        with ExitStack() as stack:
+            with self._lock:
+                if job["state"] == "CANCELLED":
+                    return
+                job["state"] = "RUNNING"
+                job["start"] = time.time()
+                stderr = None
+                try:
+                    stdout = stack.enter_context(
+                        open(job["stdout"] or os.devnull, "w"))
+                    stderr = stack.enter_context(
+                        open(job["stderr"] or os.devnull, "w"))
+                    job["process"] = subprocess.Popen(
+                        ["bash", str(script)],
+                        stdout=stdout,
+                        stderr=stderr,
+                        env=env,
+                        start_new_session=True,
+                    )
+                except Exception as e:
+                    if stderr is not None:
+                        stderr.write(f"hopla: can't start the job: {e!r}\n")
+                    job["returncode"] = 1
+                    job["end"] = time.time()
+                    job["state"] = "FAILED"
+                    return
+            try:
+                returncode = job["process"].wait()
+            except Exception:
+                returncode = 1
+        with self._lock:
+            job["returncode"] = returncode
+            job["process"] = None
+            if job["state"] != "CANCELLED":
+                job["end"] = time.time()
+                job["state"] = "COMPLETED" if returncode == 0 else "FAILED"
+
+    def _refresh(self, job_id, job, now):
+        """ Update the state of a job according to the current time.
+        """
+
+    @classmethod
+    def _number(cls, value):
+        """ Format a number as in the Slurm JSON outputs.
+        """
+        return {
+            "set": value is not None,
+            "infinite": False,
+            "number": int(value or 0),
+        }
+
+    def __repr__(self):
+        return format_attributes(
+            self,
+            attrs=["n_workers"]
+        )
+
+
+class SimulatedScheduler(LocalScheduler):
+    """ In-process scheduler simulating a batch system.
+
+    Jobs are never executed: their life cycle is computed from their
+    submission time and the sampled queue wait and runtime. Once a job is
+    finished, logs mimicking the hopla batch templates are written so that
+    reports can be generated as with a real scheduler.
+
+    Parameters
+    ----------
+    submit_latency: float, default 0
+        the time spent in each submission call (in seconds).
+    query_latency: float, default 0
+        the time spent in each status query (in seconds).
+    queue_wait: float, 2-uplet or callable, default 0
+        the time spent by a job in the queue (in seconds): a constant, a
+        (low, high) uniform range, or a callable taking a `random.Random`
+        instance and returning a value.
+    runtime: float, 2-uplet or callable, default 0
+        the runtime of a job (in seconds), same conventions as `queue_wait`.
+    failure_rate: float, default 0
+        the probability for a job to fail.
+    seed: int, default None
+        the seed of the random generator.
+    """
+    def __init__(self, submit_latency=0, query_latency=0, queue_wait=0,
+                 runtime=0, failure_rate=0, seed=None):
+        super().__init__(n_workers=1)
+        self.submit_latency = submit_latency
+        self.query_latency = query_latency
+        self.queue_wait = queue_wait
+        self.runtime = runtime
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+
+    def submit(self, script):
+        """ Submit a batch script.
+
+        Parameters
+        ----------
+        script: Path/str
+            the batch script to submit.
+
+        Returns
+        -------
+        output: str
+            the submission message containing the job ID.
+        """
+        if self.submit_latency > 0:
+            time.sleep(self.submit_latency)
+        job_id, job = self._register(script)
+        job["start"] = job["submit"] + self._sample(self.queue_wait)
+        job["end"] = job["start"] + self._sample(self.runtime)
+        job["returncode"] = int(self._rng.random() < self.failure_rate)
+        return f"Submitted batch job {job_id}"
+
+    def cancel(self, job_ids):
+        """ Cancel jobs.
+
+        Parameters
+        ----------
+        job_ids: list of str
+            the jobs to cancel.
+        """
+        now = time.time()
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is None or job["state"] in self._final_states:
+                continue
+            job["state"] = "CANCELLED"
+            job["end"] = now
+            job["returncode"] = 1
+            self._write_logs(job_id, job)
+
+    def kill(self, job_ids, signum):
+        """ Send a signal to running jobs: simulated jobs ignore signals.
+
+        Parameters
+        ----------
+        job_ids: list of str
+            the jobs to signal.
+        signum: int
+            the signal number.
+        """
+
+    def squeue(self, job_ids):
+        """ List jobs status.
+
+        Parameters
+        ----------
+        job_ids: list of str
+            the jobs to be listed.
+
+        Returns
+        -------
+        output: str
+            the jobs status in the `squeue --json` format.
+        """
+        if self.query_latency > 0:
+            time.sleep(self.query_latency)
+        return super().squeue(job_ids)
+
+    def _refresh(self, job_id, job, now):
+        """ Update the state of a job according to the current time.
+        """
+        if job["state"] in self._final_states:
+            return
+        if now < job["start"]:
+            job["state"] = "PENDING"
+        elif now < job["end"]:
+            job["state"] = "RUNNING"
+        else:
+            job["state"] = "FAILED" if job["returncode"] else "COMPLETED"
+            self._write_logs(job_id, job)
+
+    def _write_logs(self, job_id, job):
+        """ Write the logs of a finished job.
+        """
+        if job["stdout"] is not None:
+            lines = [job_id, self._hostname,
+                     f"Exit code was: {job['returncode']}"]
+            if job["returncode"] == 0:
+                lines.append("HOPLASAY-DONE")
+            with open(job["stdout"], "w") as of:
+                of.write("\n".join(lines) + "\n")
+        if job["stderr"] is not None:
+            with open(job["stderr"], "w") as of:
+                if job["returncode"] != 0:
+                    of.write(f"simulated {job['state'].lower()} job\n")
+
+    def _sample(self, spec):
+        """ Sample a duration from a constant, a range or a callable.
+        """
+        if callable(spec):
+            return float(spec(self._rng))
+        if isinstance(spec, (list, tuple)):
+            return self._rng.uniform(*spec)
+        return float(spec)
+
+    def __repr__(self):
+        return format_attributes(
+            self,
+            attrs=["submit_latency", "query_latency", "queue_wait", "runtime",
+                   "failure_rate"]
+        )
+
+
+class LocalInfoWatcher(InfoWatcher):
+    """ An instance of this class is shared by all jobs, and is in charge of
+    calling the in-process scheduler to check status for all jobs at once.
+
+    Parameters
+    ----------
+    delay_s: int, default 60
+        maximum delay before each non-forced call to the cluster.
+    scheduler: LocalScheduler, default None
+        the in-process scheduler.
+    """
+    def __init__(self, delay_s=60, scheduler=None):
+        super().__init__(delay_s)
+        self.scheduler = scheduler
+
+    @property
+    def update_command(self):
+        """ Return the command to list jobs status.
+        """
+        active_jobs = self._registered - self._finished
+        return "squeue --states=all --json --jobs=" + ",".join(active_jobs)
+
+    @property
+    def valid_status(self):
+        """ Return the list of valid status.
+        """
+        return ["RUNNING", "PENDING", "SUSPENDED", "COMPLETING", "CONFIGURING",
+                "UNKNOWN"]
+
+    @property
+    def pending_status(self):
+        """ Return the list of status of the jobs waiting in the queue.
+        """
+        return ["PENDING"]
+
+    @classmethod
+    def read_times(cls, info):
+        """ Returns the submission and start times of the job from its
+        information.
+        """
+        submit_time = slurm_number(info.get("submit_time")) or None
+        start_time = slurm_number(info.get("start_time")) or None
+        return submit_time, start_time
+
+    @classmethod
+    def read_end_time(cls, info):
+        """ Returns the end time of the job from its information.
+        """
+        return slurm_number(info.get("end_time")) or None
+
+    @classmethod
+    def read_node(cls, info):
+        """ Returns the node running the job from its information.
+        """
+        return info.get("nodes") or None
+
+    def _call_scheduler(self):
+        """ Call the scheduler and return the output of the update command.
+        """
+        return self.scheduler.squeue(self._registered - self._finished)
+
+    async def _acall_scheduler(self):
+        """ Call the scheduler asynchronously and return the output of the
+        update command.
+        """
+        return self._call_scheduler()
+
+    @classmethod
+    def read_info(cls, string):
+        """ Reads the output of the scheduler and returns a dictionary
+        containing main jobs information.
+        """
+        if not isinstance(string, str):
+            string = string.decode()
+        all_stats = {str(val["job_id"]): val
+                     for val in json.loads(string)["jobs"]}
+        return all_stats
+
+
+class DelayedLocalJob(DelayedJob):
+    """ Represents a job that have been queue for submission by an executor,
+    but hasn't yet been scheduled.
+
+    Parameters
+    ----------
+    delayed_submission: DelayedSubmission
+        a delayed submission allowing to generate the command line to
+        execute.
+    executor: Executor
+        base job executor.
+    job_id: str
+        the job identifier.
+    """
+    __slots__ = ("image_path",)
+    _submission_cmd = "local"
+    _container_cmd = "apptainer run {params} {image_path} {command}"
+    _template_name = "local_batch_template.txt"
+
+    def __init__(self, delayed_submission, executor, job_id):
+        super().__init__(delayed_submission, executor, job_id)
+        self.image_path = self._executor.image_path
+
+    def render_batch(self):
+        """ Return the batch script.
+        """
+        if self.image_path:
+            cmd = self._container_cmd.format(
+                image_path=self.image_path,
+                params=self.delayed_submission.execution_parameters,
+                command=self.delayed_submission.command
+            )
+        else:
+            cmd = self.delayed_submission.command
+        paths = self.paths
+        return self.template.render(
+            command=self._wrap_command(cmd),
+            stdout=paths.stdout,
+            stderr=paths.stderr)
+
+    def _submit(self, script=None):
+        """ Call the scheduler and return the outputs of the start command:
+        the batch file is always passed.
+        """
+        output = self._executor.scheduler.submit(self.paths.submission_file)
+        return output.encode(), b""
+
+    async def _asubmit(self, script=None):
+        """ Call the scheduler asynchronously and return the outputs of the
+        start command.
+        """
+        return self._submit()
+
+    @classmethod
+    def cancel_jobs(cls, jobs, signal=None, dryrun=False):
+        """ Cancel started jobs, or send them a signal, with a single
+        scheduler call.
+
+        Parameters
+        ----------
+        jobs: list of DelayedLocalJob
+            the started jobs.
+        signal: int or str, default None
+            the signal sent to the jobs, e.g. `signal.SIGUSR1` or 'USR1'.
+            By default, the jobs are canceled.
+        dryrun: bool, default False
+            if True, only print the scheduler calls.
+
+        Returns
+        -------
+        submission_ids: list of str
+            the canceled or signaled submission IDs.
+        """
+        submission_ids = cls._cancel_ids(jobs)
+        if len(submission_ids) == 0:
+            return submission_ids
+        scheduler = jobs[0]._executor.scheduler
+        if dryrun:
+            print(f"[command] {jobs[0].stop_command} "
+                  f"{' '.join(submission_ids)}")
+        elif signal is None:
+            scheduler.cancel(submission_ids)
+        else:
+            scheduler.kill(
+                submission_ids, Signals[f"SIG{signal_name(signal)}"])
+        return submission_ids
+
+    def read_jobid(self, string):
+        """ Return the started job ID.
+        """
+        if not isinstance(string, str):
+            string = string.decode()
+        return string.rstrip("\n").strip().split(" ")[-1]
+
+    @property
+    def start_command(self):
+        """ Return the start job command.
+        """
+        return type(self)._submission_cmd
+
+    @property
+    def stop_command(self):
+        """ Return the stop job command.
+        """
+        return "cancel"
+
+    def __repr__(self):
+        return format_attributes(
+            self,
+            attrs=["job_id", "submission_id"]
+        )
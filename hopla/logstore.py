@@ -0,0 +1,232 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the packed store of the job logs.
+"""
+
+import os
+
+from .utils import format_attributes
+
+
+class LogStore:
+    """ Packs the logs of the finished jobs in large segment files.
+
+    Each log is identified by its job and its name (e.g. 'stdout'). It is
+    appended to the current segment file, optionally compressed, and an
+    index file lists its segment, offset and size: the original file is
+    then removed. A new segment is started when the current one exceeds
+    `segment_size`. An existing store is reloaded.
+
+    Parameters
+    ----------
+    folder: Path
+        the folder containing the segments and the index.
+    compression: str, default None
+        the compression of the logs: None or 'zstd' (requires the
+        `zstandard` package, an ImportError is raised otherwise).
+    segment_size: int, default 256MB
+        the size (in bytes) above which a new segment is started.
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> from hopla.logstore import LogStore
+    >>> store = LogStore(Path("/tmp/hopla-logs"))
+    >>> path = Path("/tmp/hopla-logs/1_log.out")
+    >>> path.parent.mkdir(parents=True, exist_ok=True)
+    >>> _ = path.write_text("1\\nnode\\nHOPLASAY-DONE\\n")
+    >>> store.pack("1", {"stdout": path})
+    ['stdout']
+    >>> store.read("1", "stdout") # doctest: +SKIP
+    '1\\nnode\\nHOPLASAY-DONE\\n'
+
+    Raises
+    ------
+    ValueError
+        If the compression is not supported.
+    """
+    def __init__(self, folder, compression=None, segment_size=2 ** 28):
+        if compression not in (None, "zstd"):
+            raise ValueError(
+                f"Unsupported log compression: {compression}"
+            )
+        self._compressor = None
+        self._decompressor = None
+        if compression == "zstd":
+            self._compressor = import_zstandard().ZstdCompressor()
+        self.folder = folder
+        self.compression = compression
+        self.segment_size = segment_size
+        self.index_path = folder / "index.tsv"
+        self._index = {}
+        self._segment = 0
+        if self.index_path.exists():
+            with open(self.index_path) as of:
+                for line in of:
+                    job_id, name, segment, offset, size, compressed = (
+                        line.rstrip("\n").split("\t"))
+                    self._index.setdefault(job_id, {})[name] = (
+                        int(segment), int(offset), int(size),
+                        compressed == "1")
+                    self._segment = max(self._segment, int(segment))
+
+    def segment_path(self, segment):
+        """ Return the location of a segment file.
+
+        Parameters
+        ----------
+        segment: int
+            the segment number.
+
+        Returns
+        -------
+        path: Path
+            the segment file.
+        """
+        return self.folder / f"segment_{segment:05d}.pack"
+
+    def pack(self, job_id, files):
+        """ Appends the log files of a job to the store and removes them:
+        missing files are ignored.
+
+        Parameters
+        ----------
+        job_id: str
+            the job identifier.
+        files: dict
+            the log files to be packed, indexed by their names.
+
+        Returns
+        -------
+        names: list of str
+            the names of the packed logs.
+        """
+        job_id = str(job_id)
+        files = {name: path for name, path in files.items() if path.exists()}
+        if len(files) == 0:
+            return []
+        self.folder.mkdir(parents=True, exist_ok=True)
+        segment_path = self.segment_path(self._segment)
+        if (segment_path.exists() and
+                segment_path.stat().st_size >= self.segment_size):
+            self._segment += 1
+            segment_path = self.segment_path(self._segment)
+        entries = []
+        index = self._index.setdefault(job_id, {})
+        with open(segment_path, "ab") as of:
+            for name, path in files.items():
+                with open(path, "rb") as log:
+                    data = log.read()
+                compressed = self._compressor is not None
+                if compressed:
+                    data = self._compressor.compress(data)
+                offset = of.tell()
+                of.write(data)
+                index[name] = (self._segment, offset, len(data), compressed)
+                entries.append(
+                    f"{job_id}\t{name}\t{self._segment}\t{offset}\t"
+                    f"{len(data)}\t{int(compressed)}\n")
+        with open(self.index_path, "a") as of:
+            of.writelines(entries)
+        for path in files.values():
+            os.remove(path)
+        return list(files)
+
+    def read(self, job_id, name):
+        """ Reads a log from the store.
+
+        Parameters
+        ----------
+        job_id: str
+            the job identifier.
+        name: str
+            the log name.
+
+        Returns
+        -------
+        content: str
+            the log content, None if not in the store.
+        """
+        entry = self._index.get(str(job_id), {}).get(name)
+        if entry is None:
+            return None
+        segment, offset, size, compressed = entry
+        with open(self.segment_path(segment), "rb") as of:
+            of.seek(offset)
+            data = of.read(size)
+        if compressed:
+            if self._decompressor is None:
+                self._decompressor = import_zstandard().ZstdDecompressor()
+            data = self._decompressor.decompress(data)
+        return data.decode(errors="replace")
+
+    def names(self, job_id):
+        """ Return the names of the logs of a job in the store.
+
+        Parameters
+        ----------
+        job_id: str
+            the job identifier.
+
+        Returns
+        -------
+        names: list of str
+            the log names.
+        """
+        return list(self._index.get(str(job_id), {}))
+
+    def location(self, job_id, name):
+        """ Return a human readable location of a log in the store.
+
+        Parameters
+        ----------
+        job_id: str
+            the job identifier.
+        name: str
+            the log name.
+
+        Returns
+        -------
+        location: str
+            the segment file, the job identifier and the log name.
+        """
+        segment = self._index[str(job_id)][name][0]
+        return f"{self.segment_path(segment)}#{job_id}/{name}"
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return format_attributes(
+            self,
+            attrs=["folder", "compression", "segment_size"]
+        )
+
+
+def import_zstandard():
+    """ Imports the optional `zstandard` package.
+
+    Returns
+    -------
+    module: module
+        the `zstandard` module.
+
+    Raises
+    ------
+    ImportError
+        If the package is not installed.
+    """
+    try:
+        import zstandard
+    except ImportError as e:
+        raise ImportError(
+            "The 'zstandard' package is required to compress the logs."
+        ) from e
+    return zstandard
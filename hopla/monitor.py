@@ -0,0 +1,181 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the monitor of the stalled jobs.
+"""
+
+import bisect
+import time
+
+from .utils import format_attributes
+
+
+class StallMonitor:
+    """ Detects the running jobs that make no progress.
+
+    The progress of a running job is the last modification of its standard
+    output, its standard error or, if `heartbeat` is True, its heartbeat
+    file: the `HOPLA_HEARTBEAT` environment variable of the command gives
+    its location, and the command is expected to touch it regularly. A job
+    is stalled when it made no progress for more than `factor` times the
+    median runtime of the jobs that finished successfully, and at least
+    `min_stall` seconds. A stalled job is handled once, according to the
+    action:
+
+    - 'warn': a warning is emitted.
+    - 'resubmit': the job is canceled and submitted again.
+    - 'speculate': a duplicate of the job is started, and the job keeps the
+      outcome of whichever succeeds first, the other one being canceled.
+
+    Parameters
+    ----------
+    factor: float, default 3
+        the tolerated time without progress, as a multiple of the median
+        runtime.
+    min_stall: float, default 600
+        the minimum tolerated time without progress (in seconds).
+    action: str, default 'warn'
+        the action on the stalled jobs: 'warn', 'resubmit' or 'speculate'.
+    heartbeat: bool, default False
+        if True, a heartbeat file is also used to track the progress.
+    interval: float, default 60
+        the minimum delay between two checks (in seconds).
+
+    Examples
+    --------
+    >>> from hopla.monitor import StallMonitor
+    >>> monitor = StallMonitor(factor=2, min_stall=10)
+    >>> monitor.threshold is None
+    True
+    >>> for runtime in (30, 60, 90):
+    ...     monitor.observe(runtime)
+    >>> monitor.threshold
+    120
+
+    Raises
+    ------
+    ValueError
+        If the action is not supported.
+    """
+    actions = ("warn", "resubmit", "speculate")
+
+    def __init__(self, factor=3, min_stall=600, action="warn",
+                 heartbeat=False, interval=60):
+        if action not in self.actions:
+            raise ValueError(
+                f"Unsupported stall action: {action}. Valid actions are: "
+                f"{', '.join(self.actions)}."
+            )
+        self.factor = factor
+        self.min_stall = min_stall
+        self.action = action
+        self.heartbeat = heartbeat
+        self.interval = interval
+        self.runtimes = []
+        self.flagged = set()
+        self.resubmissions = {}
+        self.speculations = {}
+        self._last_check = 0
+
+    def observe(self, runtime):
+        """ Records the runtime of a job that finished successfully.
+
+        Parameters
+        ----------
+        runtime: float
+            the job runtime (in seconds).
+        """
+        bisect.insort(self.runtimes, runtime)
+
+    @property
+    def threshold(self):
+        """ Return the tolerated time without progress (in seconds), None
+        while no job finished successfully.
+        """
+        if len(self.runtimes) == 0:
+            return None
+        median = self.runtimes[len(self.runtimes) // 2]
+        return max(self.factor * median, self.min_stall)
+
+    def due(self, now=None):
+        """ Checks whether the running jobs must be checked again.
+
+        Parameters
+        ----------
+        now: float, default None
+            the current time. By default, `time.time()`.
+
+        Returns
+        -------
+        due: bool
+            True if the last check is older than `interval`.
+        """
+        now = now or time.time()
+        if now - self._last_check < self.interval:
+            return False
+        self._last_check = now
+        return True
+
+    def last_progress(self, job, start_time):
+        """ Return the time of the last progress of a running job.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a running job.
+        start_time: float
+            the start timestamp of the job.
+
+        Returns
+        -------
+        timestamp: float
+            the last modification of the job logs or heartbeat, not before
+            the job start.
+        """
+        paths = job.paths
+        files = [paths.stdout, paths.stderr]
+        if self.heartbeat:
+            files.append(paths.heartbeat)
+        last = start_time
+        for path in files:
+            try:
+                last = max(last, path.stat().st_mtime)
+            except FileNotFoundError:
+                continue
+        return last
+
+    def is_stalled(self, job, start_time, now=None):
+        """ Checks whether a running job is stalled and not yet handled.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a running job.
+        start_time: float
+            the start timestamp of the job.
+        now: float, default None
+            the current time. By default, `time.time()`.
+
+        Returns
+        -------
+        stalled: bool
+            True if the job made no progress for longer than the
+            threshold.
+        """
+        threshold = self.threshold
+        if threshold is None or job.job_id in self.flagged:
+            return False
+        now = now or time.time()
+        return now - self.last_progress(job, start_time) > threshold
+
+    def __repr__(self):
+        return format_attributes(
+            self,
+            attrs=["factor", "min_stall", "action", "heartbeat", "threshold"]
+        )
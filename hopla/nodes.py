@@ -0,0 +1,104 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the tracker of the failing nodes.
+"""
+
+from .utils import format_attributes
+
+
+class NodeTracker:
+    """ Tracks the failure rate of each node and excludes the failing ones.
+
+    The node of a finished job is read from the second line of its
+    standard output, or else from the scheduler information. A node is
+    excluded once `max_failures` jobs failed on it and its failure rate
+    reaches `failure_rate`: the excluded nodes are passed to the scheduler
+    for the next submissions, including the continuations and
+    resubmissions (``--exclude`` on SLURM and CCC clusters). The other
+    cluster types cannot exclude nodes at submission: the excluded nodes
+    are only reported. A tracker can be shared by several executors.
+
+    Parameters
+    ----------
+    max_failures: int, default 3
+        the number of failed jobs from which a node can be excluded.
+    failure_rate: float, default 0.5
+        the failure rate from which a node is excluded.
+    max_excluded: int, default 10
+        the maximum number of excluded nodes, so that a command failing
+        everywhere does not exclude the whole cluster.
+
+    Examples
+    --------
+    >>> from hopla.nodes import NodeTracker
+    >>> tracker = NodeTracker(max_failures=2)
+    >>> tracker.observe("node1", success=False)
+    False
+    >>> tracker.observe("node2", success=True)
+    False
+    >>> tracker.observe("node1", success=False)
+    True
+    >>> tracker.excluded
+    ['node1']
+    """
+    def __init__(self, max_failures=3, failure_rate=0.5, max_excluded=10):
+        self.max_failures = max_failures
+        self.failure_rate = failure_rate
+        self.max_excluded = max_excluded
+        self.stats = {}
+        self._excluded = set()
+
+    def observe(self, node, success):
+        """ Records the outcome of a job finished on a node.
+
+        Parameters
+        ----------
+        node: str
+            the node name.
+        success: bool
+            whether the job succeeded.
+
+        Returns
+        -------
+        excluded: bool
+            True if the node is newly excluded.
+        """
+        n_jobs, n_failures = self.stats.get(node, (0, 0))
+        n_jobs, n_failures = n_jobs + 1, n_failures + int(not success)
+        self.stats[node] = (n_jobs, n_failures)
+        if (node in self._excluded or
+                len(self._excluded) >= self.max_excluded or
+                n_failures < self.max_failures or
+                n_failures / n_jobs < self.failure_rate):
+            return False
+        self._excluded.add(node)
+        return True
+
+    @property
+    def excluded(self):
+        """ Return the excluded nodes, sorted by name.
+        """
+        return sorted(self._excluded)
+
+    @property
+    def summary(self):
+        """ Return the number of jobs and failures of each node, the most
+        failing nodes first.
+        """
+        return [
+            f"{node}: {n_failures}/{n_jobs} failed"
+            f"{' (excluded)' if node in self._excluded else ''}"
+            for node, (n_jobs, n_failures) in sorted(
+                self.stats.items(), key=lambda item: -item[1][1])
+        ]
+
+    def __repr__(self):
+        return format_attributes(
+            self, attrs=["max_failures", "failure_rate", "excluded"])
@@ -0,0 +1,276 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the policies ordering the waiting jobs of an executor.
+"""
+
+import heapq
+
+from .utils import format_attributes
+
+
+class OrderingPolicy:
+    """ Orders the waiting jobs in submission order.
+
+    A policy returns a sort key for each job when it is queued: the jobs
+    with the smallest keys are started first, and the jobs with equal keys
+    in submission order. The policy may also learn from the runtimes of the
+    finished jobs: when it returns True, the keys of the waiting jobs are
+    computed again.
+
+    Examples
+    --------
+    >>> from hopla.ordering import OrderingPolicy
+    >>> policy = OrderingPolicy()
+    >>> policy.key(None)
+    ()
+    """
+    name = "fifo"
+
+    def key(self, job):
+        """ Return the sort key of a waiting job.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a waiting job.
+
+        Returns
+        -------
+        key: tuple
+            the sort key: smaller keys are started first.
+        """
+        return ()
+
+    def observe(self, job, runtime):
+        """ Records the runtime of a job that finished successfully.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            the finished job.
+        runtime: float
+            the job runtime (in seconds).
+
+        Returns
+        -------
+        changed: bool
+            True if the keys of the waiting jobs must be computed again.
+        """
+        return False
+
+    def __repr__(self):
+        return format_attributes(self, attrs=["name"])
+
+
+class BackfillOrder(OrderingPolicy):
+    """ Orders the waiting jobs by decreasing resource class (number of
+    GPUs, cores, memory and walltime), then in submission order: the big
+    jobs are queued first and the cheap ones backfill the cluster.
+    """
+    name = "backfill"
+
+    def key(self, job):
+        return job._executor._resource_classes[job.resources][0]
+
+
+class PriorityOrder(OrderingPolicy):
+    """ Orders the waiting jobs by decreasing priority, as given by the
+    `priority` parameter of `Executor.submit`, then in submission order.
+    """
+    name = "priority"
+
+    def key(self, job):
+        return (-job.priority, )
+
+
+class RuntimeOrder(OrderingPolicy):
+    """ Orders the waiting jobs by expected runtime.
+
+    The expected runtime of a job is, by order of preference, the
+    `expected_runtime` parameter of `Executor.submit`, the mean runtime of
+    the finished jobs running the same script, and the user-supplied
+    runtime of the script. Jobs without estimate are started last. The
+    waiting jobs are ordered again the first time a script finishes.
+
+    Parameters
+    ----------
+    longest_first: bool, default True
+        if True, the longest jobs are started first (LPT), which shortens
+        the campaign makespan. Otherwise, the shortest jobs are started
+        first (SPT), which gives a fast feedback.
+    runtimes: dict, default None
+        the expected runtime (in seconds) of the jobs, indexed by script,
+        e.g. learned from a previous campaign.
+
+    Examples
+    --------
+    >>> from hopla.ordering import RuntimeOrder
+    >>> policy = RuntimeOrder(runtimes={"sleep": 10})
+    >>> policy.runtimes
+    {'sleep': 10.0}
+    """
+    def __init__(self, longest_first=True, runtimes=None):
+        self.longest_first = longest_first
+        self.name = "lpt" if longest_first else "spt"
+        self._stats = {
+            str(script): (float(runtime), 0)
+            for script, runtime in (runtimes or {}).items()
+        }
+
+    @property
+    def runtimes(self):
+        """ Return the expected runtime of each script (in seconds).
+        """
+        return {script: mean for script, (mean, _) in self._stats.items()}
+
+    def estimate(self, job):
+        """ Return the expected runtime of a job.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a job.
+
+        Returns
+        -------
+        runtime: float
+            the expected runtime (in seconds), None if unknown.
+        """
+        if job.expected_runtime is not None:
+            return job.expected_runtime
+        stats = self._stats.get(script_of(job))
+        return None if stats is None else stats[0]
+
+    def key(self, job):
+        runtime = self.estimate(job)
+        if runtime is None:
+            return (1, 0)
+        return (0, -runtime if self.longest_first else runtime)
+
+    def observe(self, job, runtime):
+        script = script_of(job)
+        mean, count = self._stats.get(script, (0., 0))
+        self._stats[script] = ((mean * count + runtime) / (count + 1),
+                               count + 1)
+        return count == 0
+
+    def __repr__(self):
+        return format_attributes(self, attrs=["name", "runtimes"])
+
+
+class JobQueue:
+    """ A priority queue of the waiting jobs.
+
+    Parameters
+    ----------
+    policy: OrderingPolicy
+        the policy ordering the jobs.
+    """
+    def __init__(self, policy):
+        self.policy = policy
+        self._heap = []
+
+    def push(self, job):
+        """ Queues a job.
+
+        Parameters
+        ----------
+        job: DelayedJob
+            a waiting job.
+        """
+        heapq.heappush(self._heap, (self.policy.key(job), job.job_id, job))
+
+    def pop(self):
+        """ Return the next job and removes it from the queue.
+
+        Returns
+        -------
+        job: DelayedJob
+            the job with the smallest key.
+        """
+        return heapq.heappop(self._heap)[-1]
+
+    def filter(self, keep):
+        """ Removes the jobs that are not selected.
+
+        Parameters
+        ----------
+        keep: callable
+            a function returning True for the jobs to keep.
+        """
+        self._heap = [entry for entry in self._heap if keep(entry[-1])]
+        heapq.heapify(self._heap)
+
+    def reorder(self):
+        """ Computes again the keys of the queued jobs.
+        """
+        self._heap = [
+            (self.policy.key(job), job_id, job)
+            for _, job_id, job in self._heap
+        ]
+        heapq.heapify(self._heap)
+
+    def __iter__(self):
+        """ Iterates over the queued jobs in order.
+        """
+        return (entry[-1] for entry in sorted(self._heap))
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __repr__(self):
+        return format_attributes(self, attrs=["policy"])
+
+
+POLICIES = {
+    "fifo": OrderingPolicy,
+    "backfill": BackfillOrder,
+    "priority": PriorityOrder,
+    "lpt": lambda: RuntimeOrder(longest_first=True),
+    "spt": lambda: RuntimeOrder(longest_first=False),
+}
+
+
+def get_policy(order):
+    """ Return an ordering policy.
+
+    Parameters
+    ----------
+    order: str or OrderingPolicy
+        the name of the policy: 'fifo', 'backfill', 'priority', 'lpt' or
+        'spt', or a policy instance.
+
+    Returns
+    -------
+    policy: OrderingPolicy
+        the ordering policy.
+
+    Raises
+    ------
+    ValueError
+        If the policy name is not supported.
+    """
+    if isinstance(order, OrderingPolicy):
+        return order
+    if order not in POLICIES:
+        raise ValueError(
+            f"Unsupported ordering policy: {order}. Valid policies are: "
+            f"{', '.join(POLICIES)}."
+        )
+    return POLICIES[order]()
+
+
+def script_of(job):
+    """ Return the script run by a job: the first one for multi-tasks jobs.
+    """
+    submission = job.delayed_submission
+    if isinstance(submission, (list, tuple)):
+        submission = submission[0]
+    return str(submission.script)
@@ -12,8 +12,13 @@ Contains PBS specific functions.
 
 import json
 import os
-from pathlib import Path
+import time
 
+from .config import (
+    DEFAULT_OPTIONS,
+    hopla_options,
+)
+from .templates import load_template
 from .utils import DelayedJob, InfoWatcher, format_attributes
 
 
@@ -33,20 +38,82 @@ class PbsInfoWatcher(InfoWatcher):
     def update_command(self):
         """ Return the command to list jobs status.
         """
-        active_jobs = self._registered - self._finished
-        print(self._registered, self._finished)
-        return "qstat -fx -F json " + " ".join(active_jobs)
+        active_jobs = {
+            self.parent_id(job_id)
+            for job_id in self._registered - self._finished
+        }
+        return "qstat -fx -F json -t " + " ".join(sorted(active_jobs))
 
     @property
     def valid_status(self):
         """ Return the list of valid status.
         """
-        return ["R", "Q", "S", "UNKNOWN"]
+        return ["R", "Q", "S", "H", "W", "E", "B", "UNKNOWN"]
+
+    @property
+    def pending_status(self):
+        """ Return the list of status of the jobs waiting in the queue.
+        """
+        return ["Q", "H", "W"]
+
+    @classmethod
+    def read_times(cls, info):
+        """ Returns the submission and start times of the job from its
+        information.
+        """
+        return cls._read_time(info, "qtime"), cls._read_time(info, "stime")
+
+    @classmethod
+    def read_end_time(cls, info):
+        """ Returns the end time of the job from its information.
+        """
+        return cls._read_time(info, "obittime")
+
+    @classmethod
+    def _read_time(cls, info, key):
+        """ Returns a timestamp of the job information, None if not
+        available.
+        """
+        try:
+            return time.mktime(
+                time.strptime(info[key], "%a %b %d %H:%M:%S %Y"))
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    @classmethod
+    def read_node(cls, info):
+        """ Returns the node running the job from its information: the
+        first host of the `exec_host` field.
+        """
+        exec_host = info.get("exec_host")
+        if not exec_host:
+            return None
+        return exec_host.split("+")[0].split("/")[0]
+
+    @classmethod
+    def parent_id(cls, job_id):
+        """ Return the array job ID of a subjob, the job ID otherwise.
+
+        Parameters
+        ----------
+        job_id: str
+            id of the job on the cluster, `<array_id>[<index>]` for
+            subjobs.
+
+        Returns
+        -------
+        parent_id: str
+            the `<array_id>[]` array ID for subjobs, or the input ID.
+        """
+        if "[" in job_id:
+            return job_id.split("[")[0] + "[]"
+        return job_id
 
     @classmethod
     def read_info(cls, string):
         """ Reads the output of qstat and returns a dictionary containing
-        main jobs information.
+        main jobs information. Subjobs are indexed by their
+        `<array_id>[<index>]` IDs.
         """
         if not isinstance(string, str):
             string = string.decode()
@@ -69,35 +136,135 @@ class DelayedPbsJob(DelayedJob):
     job_id: str
         the job identifier.
     """
+    __slots__ = ("array_size", "array_submission_file", "image_path")
     _submission_cmd = "qsub"
+    _dependency_options = ("-W", "depend=afterok:{ids}")
+    _signal_command = ("qsig", "-s", "SIG{signal}")
     _container_cmd = "apptainer run {params} {image_path} {command}"
+    _template_name = "pbs_batch_template.txt"
+
+    _max_array_size = 10000
 
     def __init__(self, delayed_submission, executor, job_id):
         super().__init__(delayed_submission, executor, job_id)
-        resource_dir = Path(__file__).parent / "resources"
-        path = resource_dir / "pbs_batch_template.txt"
-        with open(path) as of:
-            self.template = of.read()
-        self.image_path = self._executor.parameters["image"]
+        self.image_path = self._executor.image_path
+        self.array_submission_file = None
+        self.array_size = None
 
-    def generate_batch(self):
-        """ Write the batch file.
+    @property
+    def command(self):
+        """ Return the command executed in the container.
         """
-        cmd = self._container_cmd.format(
+        return self._container_cmd.format(
             image_path=self.image_path,
             params=self.delayed_submission.execution_parameters,
             command=self.delayed_submission.command
         )
-        with open(self.paths.submission_file, "w") as of:
-            if self.paths.stdout.exists():
-                os.remove(self.paths.stdout)
-            if self.paths.stderr.exists():
-                os.remove(self.paths.stderr)
-            of.write(self.template.format(
-                command=cmd,
-                stdout=self.paths.stdout,
-                stderr=self.paths.stderr,
-                **self._executor.parameters))
+
+    def render_batch(self):
+        """ Return the batch script.
+        """
+        cmd = self.command
+        paths = self.paths
+        return self.template.render(
+            command=self._wrap_command(cmd),
+            stdout=paths.stdout,
+            stderr=paths.stderr)
+
+    @classmethod
+    def start_array(cls, jobs, dryrun=False):
+        """ Start jobs in a single array job: one batch file and an indexed
+        task file are written, and each job is mapped to a subjob.
+
+        Parameters
+        ----------
+        jobs: list of DelayedPbsJob
+            the jobs to be started, sharing the same resource class.
+        dryrun: bool, default False
+            if True, only print the submission command.
+        """
+        opts = hopla_options.get()
+        verbose = opts.get("verbose", DEFAULT_OPTIONS["verbose"])
+
+        paths = jobs[0].paths
+        name = f"array_{jobs[0].job_id}"
+        task_file = paths.submission_folder / f"{name}_tasks.txt"
+        submission_file = paths.submission_folder / f"{name}_submission.sh"
+        key = (cls, "array", jobs[0].resources)
+        template = jobs[0]._executor._templates.get(key)
+        if template is None:
+            template = load_template("pbs_array_batch_template.txt").partial(
+                **jobs[0]._static_parameters())
+            jobs[0]._executor._templates[key] = template
+        with open(task_file, "w") as of:
+            for job in jobs:
+                if job.paths.stdout.exists():
+                    os.remove(job.paths.stdout)
+                if job.paths.stderr.exists():
+                    os.remove(job.paths.stderr)
+                of.write(f"{job.job_id}\t{job.command}\n")
+        with open(submission_file, "w") as of:
+            of.write(template.render(
+                last_index=len(jobs) - 1,
+                task_file=task_file,
+                log_folder=paths.log_folder,
+                stdout=paths.log_folder / f"{name}_^array_index^.out",
+                stderr=paths.log_folder / f"{name}_^array_index^.err"))
+        stderr = None
+        if dryrun:
+            print(f"[command] {cls._submission_cmd} {submission_file}")
+            submission_ids = ["EXIT"] * len(jobs)
+        else:
+            transport = jobs[0]._executor.transport
+            transport.put([submission_file, task_file])
+            _, stdout, stderr = transport.run(
+                [cls._submission_cmd, submission_file])
+            array_id = jobs[0].read_jobid(stdout)
+            if array_id.endswith("[]") and array_id[:-2].isdigit():
+                submission_ids = [
+                    f"{array_id[:-2]}[{idx}]" for idx in range(len(jobs))
+                ]
+            else:
+                submission_ids = ["EXIT"] * len(jobs)
+                stderr = stderr.decode("utf8")
+        for job, submission_id in zip(jobs, submission_ids, strict=True):
+            job.submission_id = submission_id
+            job.array_submission_file = submission_file
+            job.array_size = len(jobs)
+            if submission_id == "EXIT" and not dryrun:
+                job.stderr = stderr
+            job._register_in_watcher()
+        if verbose:
+            print(f"Array {submission_ids[0]} - {submission_file} with "
+                  f"{len(jobs)} jobs is running!")
+
+    @classmethod
+    def _cancel_ids(cls, jobs):
+        """ Return the scheduler IDs used to cancel the jobs: array jobs
+        whose subjobs are all selected are canceled as a whole.
+        """
+        arrays = {}
+        for job in jobs:
+            if job.array_size is not None:
+                parent_id = PbsInfoWatcher.parent_id(job.submission_id)
+                arrays.setdefault(parent_id, []).append(job)
+        submission_ids = [
+            job.submission_id for job in jobs if job.array_size is None
+        ]
+        for parent_id, subjobs in arrays.items():
+            if len(subjobs) == subjobs[0].array_size:
+                submission_ids.append(parent_id)
+            else:
+                submission_ids.extend(job.submission_id for job in subjobs)
+        return submission_ids
+
+    def sub_report(self):
+        report = []
+        if self.array_submission_file is not None:
+            prefix = f"{self.__class__.__name__}<job_id={self.job_id}>"
+            report.append(
+                f"{prefix}array_submission: {self.array_submission_file}")
+        return report
 
     def read_jobid(self, string):
         """ Return the started job ID.
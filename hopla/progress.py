@@ -0,0 +1,251 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the live progress dashboard of an executor.
+"""
+
+import bisect
+import datetime
+import time
+
+from tqdm import tqdm
+
+from .utils import format_attributes
+
+
+class ProgressDashboard:
+    """ Live view of the progress of an executor.
+
+    The dashboard is driven by the job state changes reported by the
+    executor: the submitted, running and finished jobs are tracked with
+    counters, and the queue waits and runtimes are inserted in sorted
+    lists, so that a refresh does not depend on the number of jobs. Three
+    bars are displayed:
+
+    - submitted: the jobs handed to the scheduler.
+    - running: the jobs started by the scheduler.
+    - finished: the finished jobs, followed by the number of failures
+      (including the canceled jobs), the throughput (finished jobs per
+      minute), the median and 90th percentile of the queue waits and
+      runtimes, and the expected remaining time.
+
+    Parameters
+    ----------
+    total: int
+        the number of jobs.
+    desc: str, default 'HOPLA'
+        the prefix of the bar descriptions.
+    disable: bool, default False
+        if True, do not display the bars.
+
+    Examples
+    --------
+    >>> from hopla.progress import ProgressDashboard
+    >>> dashboard = ProgressDashboard(2, disable=True)
+    >>> dashboard.submitted([1, 2])
+    >>> dashboard.finished(1, success=True, queue_wait=1.)
+    >>> dashboard.running(1)
+    >>> dashboard.counts
+    {'jobs': 2, 'submitted': 2, 'running': 1, 'finished': 1, 'failed': 0}
+    """
+    names = ("submitted", "running", "finished")
+
+    def __init__(self, total, desc="HOPLA", disable=False):
+        self.total = total
+        self.desc = desc
+        self.n_submitted = 0
+        self.n_running = 0
+        self.n_finished = 0
+        self.n_failed = 0
+        self.queue_waits = []
+        self.runtimes = []
+        self._start = time.time()
+        self._started = {}
+        self.bars = {
+            name: tqdm(total=total, desc=f"{desc} {name:>9}", position=idx,
+                       disable=disable)
+            for idx, name in enumerate(self.names)
+        }
+
+    def set_total(self, total):
+        """ Sets the number of jobs, when jobs are submitted while the
+        executor is running.
+
+        Parameters
+        ----------
+        total: int
+            the number of jobs.
+        """
+        if total != self.total:
+            self.total = total
+            for bar in self.bars.values():
+                bar.total = total
+
+    def submitted(self, job_ids):
+        """ Records the jobs handed to the scheduler.
+
+        Parameters
+        ----------
+        job_ids: list of str
+            the identifiers of the submitted jobs.
+        """
+        now = time.time()
+        for job_id in job_ids:
+            self._started[job_id] = now
+        self.n_submitted += len(job_ids)
+        self.bars["submitted"].update(len(job_ids))
+
+    def running(self, n_running):
+        """ Records the number of jobs started by the scheduler.
+
+        Parameters
+        ----------
+        n_running: int
+            the number of running jobs.
+        """
+        self.n_running = n_running
+        self.bars["running"].n = n_running
+
+    def finished(self, job_id, success, queue_wait=None, start_time=None,
+                 runtime=None):
+        """ Records a finished job.
+
+        Parameters
+        ----------
+        job_id: str
+            the job identifier.
+        success: bool
+            whether the job succeeded.
+        queue_wait: float, default None
+            the time spent by the job in the queue (in seconds), if known.
+        start_time: float, default None
+            the start timestamp of the job, if known. By default, the
+            submission time is used to compute the runtime.
+        runtime: float, default None
+            the job runtime (in seconds), if known. By default, the time
+            elapsed since the start of the job.
+        """
+        now = time.time()
+        submitted = self._started.pop(job_id, None)
+        start_time = start_time or submitted
+        self.n_finished += 1
+        if not success:
+            self.n_failed += 1
+        if queue_wait is not None:
+            bisect.insort(self.queue_waits, queue_wait)
+        if runtime is None and start_time is not None:
+            runtime = max(now - start_time, 0)
+        if runtime is not None:
+            bisect.insort(self.runtimes, runtime)
+        self.bars["finished"].update(1)
+
+    def refresh(self):
+        """ Redraws the bars.
+        """
+        self.bars["finished"].set_postfix_str(self.postfix, refresh=False)
+        for bar in self.bars.values():
+            bar.refresh()
+
+    def close(self):
+        """ Closes the bars.
+        """
+        self.refresh()
+        for bar in self.bars.values():
+            bar.close()
+
+    @property
+    def counts(self):
+        """ Return the number of jobs in each state.
+        """
+        return {
+            "jobs": self.total,
+            "submitted": self.n_submitted,
+            "running": self.n_running,
+            "finished": self.n_finished,
+            "failed": self.n_failed,
+        }
+
+    @property
+    def throughput(self):
+        """ Return the number of finished jobs per minute.
+        """
+        return self.n_finished / max(time.time() - self._start, 1e-6) * 60
+
+    @property
+    def eta(self):
+        """ Return the expected remaining time (in seconds), None if
+        unknown.
+        """
+        throughput = self.throughput
+        if throughput == 0:
+            return None
+        return (self.total - self.n_finished) / throughput * 60
+
+    @property
+    def postfix(self):
+        """ Return the statistics displayed after the finished bar.
+        """
+        eta = self.eta
+        return ", ".join([
+            f"failed={self.n_failed}",
+            f"{self.throughput:.1f} jobs/min",
+            f"wait p50/p90={format_percentiles(self.queue_waits)}",
+            f"run p50/p90={format_percentiles(self.runtimes)}",
+            f"eta={'?' if eta is None else format_duration(eta)}",
+        ])
+
+    @property
+    def summary(self):
+        """ Return a one line summary of the progress.
+        """
+        counts = [
+            f"{key}={val}" for key, val in self.counts.items()
+            if key != "failed"
+        ]
+        return (f"{self.__class__.__name__}<{', '.join(counts)}, "
+                f"{self.postfix}>")
+
+    def __repr__(self):
+        return format_attributes(self, attrs=["total", "desc"])
+
+
+def percentile(values, q):
+    """ Returns a percentile of sorted values.
+
+    Parameters
+    ----------
+    values: list of float
+        the sorted values.
+    q: float
+        the percentile in [0, 100].
+
+    Returns
+    -------
+    value: float
+        the percentile, None if there are no values.
+    """
+    if len(values) == 0:
+        return None
+    return values[min(int(len(values) * q / 100), len(values) - 1)]
+
+
+def format_percentiles(values):
+    """ Returns the median and 90th percentile of sorted durations.
+    """
+    if len(values) == 0:
+        return "?"
+    return "/".join(format_duration(percentile(values, q)) for q in (50, 90))
+
+
+def format_duration(seconds):
+    """ Returns a human readable duration.
+    """
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    return str(datetime.timedelta(seconds=round(seconds)))
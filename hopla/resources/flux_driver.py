@@ -0,0 +1,191 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Runs the tasks of a hopla multi-tasks job in the Flux instance of the
+allocation, keeping a bounded number of tasks in flight.
+
+Each line of the task file is a shell command. The outputs of the task N
+are written in the 'task_N.out' and 'task_N.err' files of the log
+directory, and the 'status.tsv' file lists the identifier, return code,
+runtime (in seconds) and node of each finished task. A task that Flux
+could not run has a -1 return code. Without the Flux Python bindings,
+the tasks are run on the current node.
+
+The driver exits with a non-zero code if any task failed.
+"""
+
+import argparse
+import concurrent.futures
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+STATUS_FILE = "status.tsv"
+STATUS_HEADER = "task_id\treturncode\truntime\tnode\n"
+
+
+class LocalRunner:
+    """ Runs the tasks on the current node.
+    """
+    def __init__(self, max_in_flight, cores_per_task):
+        self.pool = concurrent.futures.ThreadPoolExecutor(max_in_flight)
+
+    def submit(self, command, stdout, stderr):
+        return self.pool.submit(self._run, command, stdout, stderr)
+
+    @staticmethod
+    def _run(command, stdout, stderr):
+        start = time.time()
+        with open(stdout, "w") as out, open(stderr, "w") as err:
+            returncode = subprocess.run(
+                ["bash", "-c", command], stdout=out, stderr=err).returncode
+        return returncode, time.time() - start, socket.gethostname()
+
+    def outcome(self, future):
+        """ Returns the return code, runtime and node of a finished task.
+        """
+        return future.result()
+
+    def close(self):
+        self.pool.shutdown()
+
+
+class FluxRunner:
+    """ Submits the tasks to the enclosing Flux instance.
+    """
+    def __init__(self, max_in_flight, cores_per_task):
+        import flux
+        import flux.job
+        self.flux = flux
+        self.handle = flux.Flux()
+        self.executor = flux.job.FluxExecutor()
+        self.cores_per_task = cores_per_task
+
+    def submit(self, command, stdout, stderr):
+        jobspec = self.flux.job.JobspecV1.from_command(
+            ["bash", "-c", command], num_tasks=1,
+            cores_per_task=self.cores_per_task)
+        jobspec.cwd = os.getcwd()
+        jobspec.environment = dict(os.environ)
+        jobspec.stdout = str(stdout)
+        jobspec.stderr = str(stderr)
+        return self.executor.submit(jobspec)
+
+    def outcome(self, future):
+        """ Returns the return code, runtime and node of a finished task.
+        """
+        returncode = -1 if future.exception() else future.result()
+        runtime, node = None, ""
+        try:
+            info = self.flux.job.job_list_id(
+                self.handle, future.jobid(),
+                attrs=["nodelist", "t_run", "t_cleanup"]).get_jobinfo()
+            runtime, node = info.runtime, info.nodelist
+        except Exception:
+            pass
+        return returncode, runtime, node
+
+    def close(self):
+        self.executor.shutdown()
+
+
+def read_tasks(path):
+    """ Returns the commands of a task file.
+
+    Parameters
+    ----------
+    path: Path
+        the task file, with one shell command per line.
+
+    Returns
+    -------
+    tasks: list of str
+        the commands, the empty lines being ignored.
+    """
+    with open(path) as of:
+        return [line.rstrip("\n") for line in of if line.strip() != ""]
+
+
+def run(tasks, logdir, runner, max_in_flight):
+    """ Runs the tasks and writes their status as they finish.
+
+    Parameters
+    ----------
+    tasks: list of str
+        the commands of the tasks.
+    logdir: Path
+        the folder of the task logs and of the status file.
+    runner: LocalRunner or FluxRunner
+        the runner executing the tasks.
+    max_in_flight: int
+        the maximum number of tasks submitted at the same time.
+
+    Returns
+    -------
+    n_failed: int
+        the number of failed tasks.
+    """
+    todo = iter(enumerate(tasks))
+    in_flight, n_failed = {}, 0
+    with open(logdir / STATUS_FILE, "w") as status:
+        status.write(STATUS_HEADER)
+        while True:
+            while len(in_flight) < max_in_flight:
+                item = next(todo, None)
+                if item is None:
+                    break
+                task_id, command = item
+                future = runner.submit(
+                    command, logdir / f"task_{task_id}.out",
+                    logdir / f"task_{task_id}.err")
+                in_flight[future] = (task_id, time.time())
+            if len(in_flight) == 0:
+                break
+            done, _ = concurrent.futures.wait(
+                in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                task_id, submitted = in_flight.pop(future)
+                returncode, runtime, node = runner.outcome(future)
+                if runtime is None:
+                    runtime = time.time() - submitted
+                status.write(
+                    f"{task_id}\t{returncode}\t{runtime:.3f}\t{node}\n")
+                status.flush()
+                n_failed += int(returncode != 0)
+    return n_failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("task_file", type=Path)
+    parser.add_argument("logdir", type=Path)
+    parser.add_argument("--max-in-flight", type=int, default=1)
+    parser.add_argument("--cores-per-task", type=int, default=1)
+    args = parser.parse_args(argv)
+    tasks = read_tasks(args.task_file)
+    args.logdir.mkdir(parents=True, exist_ok=True)
+    max_in_flight = max(args.max_in_flight, 1)
+    try:
+        runner = FluxRunner(max_in_flight, args.cores_per_task)
+    except ImportError:
+        print("Flux Python bindings not found: running tasks locally.")
+        runner = LocalRunner(max_in_flight, args.cores_per_task)
+    try:
+        n_failed = run(tasks, args.logdir, runner, max_in_flight)
+    finally:
+        runner.close()
+    print(f"Tasks: {len(tasks)}, failed: {n_failed}")
+    return int(n_failed > 0)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
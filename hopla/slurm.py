@@ -11,10 +11,13 @@ Contains SLURM specific functions.
 """
 
 import json
-import os
-from pathlib import Path
 
-from .utils import DelayedJob, InfoWatcher, format_attributes
+from .utils import (
+    DelayedJob,
+    InfoWatcher,
+    format_attributes,
+    slurm_number,
+)
 
 
 class SlurmInfoWatcher(InfoWatcher):
@@ -43,6 +46,33 @@ class SlurmInfoWatcher(InfoWatcher):
         return ["RUNNING", "PENDING", "SUSPENDED", "COMPLETING", "CONFIGURING",
                 "UNKNOWN"]
 
+    @property
+    def pending_status(self):
+        """ Return the list of status of the jobs waiting in the queue.
+        """
+        return ["PENDING"]
+
+    @classmethod
+    def read_times(cls, info):
+        """ Returns the submission and start times of the job from its
+        information.
+        """
+        submit_time = slurm_number(info.get("submit_time")) or None
+        start_time = slurm_number(info.get("start_time")) or None
+        return submit_time, start_time
+
+    @classmethod
+    def read_end_time(cls, info):
+        """ Returns the end time of the job from its information.
+        """
+        return slurm_number(info.get("end_time")) or None
+
+    @classmethod
+    def read_node(cls, info):
+        """ Returns the node running the job from its information.
+        """
+        return info.get("nodes") or None
+
     @classmethod
     def read_info(cls, string):
         """ Reads the output of squeue and returns a dictionary containing
@@ -69,35 +99,35 @@ class DelayedSlurmJob(DelayedJob):
     job_id: str
         the job identifier.
     """
+    __slots__ = ("image_path",)
     _submission_cmd = "sbatch"
+    _dependency_options = (
+        "--dependency=afterok:{ids}",
+        "--kill-on-invalid-dep=yes",
+    )
+    _checkpoint_options = ("--signal=B:USR1@{delay}",)
+    _exclude_options = ("--exclude={nodes}",)
+    _signal_command = ("scancel", "--full", "--signal={signal}")
     _container_cmd = "apptainer run {params} {image_path} {command}"
+    _template_name = "slurm_batch_template.txt"
 
     def __init__(self, delayed_submission, executor, job_id):
         super().__init__(delayed_submission, executor, job_id)
-        resource_dir = Path(__file__).parent / "resources"
-        path = resource_dir / "slurm_batch_template.txt"
-        with open(path) as of:
-            self.template = of.read()
-        self.image_path = self._executor.parameters["image"]
-
-    def generate_batch(self):
-        """ Write the batch file.
+        self.image_path = self._executor.image_path
+
+    def render_batch(self):
+        """ Return the batch script.
         """
         cmd = self._container_cmd.format(
             image_path=self.image_path,
             params=self.delayed_submission.execution_parameters,
             command=self.delayed_submission.command
         )
-        with open(self.paths.submission_file, "w") as of:
-            if self.paths.stdout.exists():
-                os.remove(self.paths.stdout)
-            if self.paths.stderr.exists():
-                os.remove(self.paths.stderr)
-            of.write(self.template.format(
-                command=cmd,
-                stdout=self.paths.stdout,
-                stderr=self.paths.stderr,
-                **self._executor.parameters))
+        paths = self.paths
+        return self.template.render(
+            command=self._wrap_command(cmd),
+            stdout=paths.stdout,
+            stderr=paths.stderr)
 
     def read_jobid(self, string):
         """ Return the started job ID.
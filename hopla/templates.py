@@ -0,0 +1,162 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the precompiled batch templates.
+"""
+
+import functools
+import string
+from pathlib import Path
+
+
+class BatchTemplate:
+    """ A `str.format` template pre-split into literal and field segments.
+
+    Fields known in advance, such as the executor parameters, are rendered
+    once with `partial`, so that rendering a batch file only concatenates
+    the literal segments with the per-job fields.
+
+    Parameters
+    ----------
+    template: str
+        the template using the `str.format` syntax.
+
+    Examples
+    --------
+    >>> from hopla.templates import BatchTemplate
+    >>> template = BatchTemplate("#SBATCH -p {queue}\\n{command}\\n")
+    >>> template = template.partial(queue="Nspin_long")
+    >>> template.fields
+    ['command']
+    >>> template.render(command="sleep 1")
+    '#SBATCH -p Nspin_long\\nsleep 1\\n'
+    """
+    _formatter = string.Formatter()
+
+    def __init__(self, template):
+        self.segments = []
+        for literal, field_name, spec, conversion in self._formatter.parse(
+                template):
+            if literal:
+                self.segments.append(literal)
+            if field_name is not None:
+                self.segments.append((field_name, spec, conversion))
+        self._merge()
+
+    @classmethod
+    def from_file(cls, path):
+        """ Loads a template from a file.
+
+        Parameters
+        ----------
+        path: Path/str
+            the template file.
+
+        Returns
+        -------
+        template: BatchTemplate
+            the compiled template.
+        """
+        with open(path) as of:
+            return cls(of.read())
+
+    @property
+    def fields(self):
+        """ Return the names of the fields that are not yet rendered.
+        """
+        return [segment[0] for segment in self.segments
+                if not isinstance(segment, str)]
+
+    def partial(self, **params):
+        """ Renders the fields available in the input parameters.
+
+        Parameters
+        ----------
+        **params: any field of the template.
+
+        Returns
+        -------
+        template: BatchTemplate
+            a new template where only the missing fields remain.
+        """
+        template = BatchTemplate("")
+        for segment in self.segments:
+            if (not isinstance(segment, str) and
+                    self._root(segment[0]) in params):
+                segment = self._format(segment, params)
+            template.segments.append(segment)
+        template._merge()
+        return template
+
+    def render(self, **params):
+        """ Renders the template.
+
+        Parameters
+        ----------
+        **params: all the remaining fields of the template.
+
+        Returns
+        -------
+        text: str
+            the rendered template.
+        """
+        return "".join([
+            segment if isinstance(segment, str)
+            else self._format(segment, params)
+            for segment in self.segments
+        ])
+
+    def _merge(self):
+        """ Merges the consecutive literal segments.
+        """
+        segments = []
+        for segment in self.segments:
+            if (isinstance(segment, str) and len(segments) > 0 and
+                    isinstance(segments[-1], str)):
+                segments[-1] += segment
+            else:
+                segments.append(segment)
+        self.segments = segments
+
+    @classmethod
+    def _format(cls, segment, params):
+        """ Formats a field segment.
+        """
+        field_name, spec, conversion = segment
+        if field_name in params and not spec and conversion is None:
+            return str(params[field_name])
+        value, _ = cls._formatter.get_field(field_name, (), params)
+        value = cls._formatter.convert_field(value, conversion)
+        return format(value, spec)
+
+    @classmethod
+    def _root(cls, field_name):
+        """ Returns the parameter name of a field.
+        """
+        return field_name.split(".")[0].split("[")[0]
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(fields={self.fields})"
+
+
+@functools.cache
+def load_template(name):
+    """ Loads a template of the hopla resources once.
+
+    Parameters
+    ----------
+    name: str
+        the template file name.
+
+    Returns
+    -------
+    template: BatchTemplate
+        the compiled template.
+    """
+    return BatchTemplate.from_file(Path(__file__).parent / "resources" / name)
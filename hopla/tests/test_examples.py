@@ -21,10 +21,101 @@ class TestGalleryExamples(unittest.TestCase):
         script_path = self.examples_dir / "plot_pbs.py"
         runpy.run_path(str(script_path))
 
+    def test_pbs_array(self):
+        script_path = self.examples_dir / "plot_pbs_array.py"
+        runpy.run_path(str(script_path))
+
+    def test_pbs_resources(self):
+        script_path = self.examples_dir / "plot_pbs_resources.py"
+        runpy.run_path(str(script_path))
+
     def test_slurm(self):
         script_path = self.examples_dir / "plot_slurm.py"
         runpy.run_path(str(script_path))
 
+    def test_slurm_stage(self):
+        script_path = self.examples_dir / "plot_slurm_stage.py"
+        runpy.run_path(str(script_path))
+
+    def test_slurm_transport(self):
+        script_path = self.examples_dir / "plot_slurm_transport.py"
+        runpy.run_path(str(script_path))
+
+    def test_slurm_stdin(self):
+        script_path = self.examples_dir / "plot_slurm_stdin.py"
+        runpy.run_path(str(script_path))
+
+    def test_local(self):
+        script_path = self.examples_dir / "plot_local.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_execution(self):
+        script_path = self.examples_dir / "plot_local_execution.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_progress(self):
+        script_path = self.examples_dir / "plot_local_progress.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_ordering(self):
+        script_path = self.examples_dir / "plot_local_ordering.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_checkpoint(self):
+        script_path = self.examples_dir / "plot_local_checkpoint.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_stall(self):
+        script_path = self.examples_dir / "plot_local_stall.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_nodes(self):
+        script_path = self.examples_dir / "plot_local_nodes.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_async(self):
+        script_path = self.examples_dir / "plot_local_async.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_futures(self):
+        script_path = self.examples_dir / "plot_local_futures.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_dag(self):
+        script_path = self.examples_dir / "plot_local_dag.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_cancel(self):
+        script_path = self.examples_dir / "plot_local_cancel.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_adaptive(self):
+        script_path = self.examples_dir / "plot_local_adaptive.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_federation(self):
+        script_path = self.examples_dir / "plot_local_federation.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_template(self):
+        script_path = self.examples_dir / "plot_local_template.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_dedup(self):
+        script_path = self.examples_dir / "plot_local_dedup.py"
+        runpy.run_path(str(script_path))
+
+    def test_local_packed_logs(self):
+        script_path = self.examples_dir / "plot_local_packed_logs.py"
+        namespace = runpy.run_path(str(script_path))
+        job = namespace["jobs"][0]
+        self.assertEqual(namespace["stdout"], job.log_location("stdout"))
+        self.assertIn("task 1", job.read_stdout())
+
+    def test_local_status(self):
+        script_path = self.examples_dir / "plot_local_status.py"
+        runpy.run_path(str(script_path))
+
     def test_ccc(self):
         script_path = self.examples_dir / "plot_ccc.py"
         runpy.run_path(str(script_path))
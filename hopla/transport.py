@@ -0,0 +1,409 @@
+##########################################################################
+# Hopla - Copyright (C) AGrigis, 2015 - 2025
+# Distributed under the terms of the CeCILL-B license, as published by
+# the CEA-CNRS-INRIA. Refer to the LICENSE file or to
+# http://www.cecill.info/licences/Licence_CeCILL-B_V1-en.html
+# for details.
+##########################################################################
+
+"""
+Contains the transports used to call the scheduler and to share files with
+the submission host.
+"""
+
+import asyncio
+import re
+import shlex
+import subprocess
+import tempfile
+import uuid
+from pathlib import Path
+
+
+class LocalTransport:
+    """ Runs the scheduler commands on the current machine.
+
+    Commands are given as a list of arguments, or as a string interpreted
+    by the shell. The files are already available to the scheduler.
+
+    Examples
+    --------
+    >>> from hopla.transport import LocalTransport
+    >>> transport = LocalTransport()
+    >>> transport.run(["echo", "hopla"])
+    (0, b'hopla\\n', b'')
+    """
+    remote = False
+
+    def run(self, cmd, input=None):
+        """ Runs a command.
+
+        Parameters
+        ----------
+        cmd: list of str or str
+            the command arguments, or a shell command.
+        input: bytes, default None
+            the data sent to the command standard input.
+
+        Returns
+        -------
+        returncode: int
+            the command exit code.
+        stdout: bytes
+            the command standard output.
+        stderr: bytes
+            the command standard error.
+        """
+        self.flush()
+        cmd = self._command(cmd)
+        process = subprocess.run(
+            cmd,
+            shell=isinstance(cmd, str),
+            input=input,
+            capture_output=True,
+            check=False,
+        )
+        return process.returncode, process.stdout, process.stderr
+
+    async def arun(self, cmd, input=None):
+        """ Runs a command without blocking the event loop.
+
+        Parameters
+        ----------
+        cmd: list of str or str
+            the command arguments, or a shell command.
+        input: bytes, default None
+            the data sent to the command standard input.
+
+        Returns
+        -------
+        returncode: int
+            the command exit code.
+        stdout: bytes
+            the command standard output.
+        stderr: bytes
+            the command standard error.
+        """
+        if self.pending:
+            await asyncio.to_thread(self.flush)
+        kwargs = {
+            "stdin": None if input is None else asyncio.subprocess.PIPE,
+            "stdout": asyncio.subprocess.PIPE,
+            "stderr": asyncio.subprocess.PIPE,
+        }
+        cmd = self._command(cmd)
+        if isinstance(cmd, str):
+            process = await asyncio.create_subprocess_shell(cmd, **kwargs)
+        else:
+            process = await asyncio.create_subprocess_exec(*cmd, **kwargs)
+        stdout, stderr = await process.communicate(input)
+        return process.returncode, stdout, stderr
+
+    def check_output(self, cmd):
+        """ Runs a command and returns its output.
+
+        Parameters
+        ----------
+        cmd: list of str or str
+            the command arguments, or a shell command.
+
+        Returns
+        -------
+        stdout: bytes
+            the command standard output.
+
+        Raises
+        ------
+        subprocess.CalledProcessError
+            If the command fails.
+        """
+        returncode, stdout, stderr = self.run(cmd)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, cmd, stdout,
+                                                stderr)
+        return stdout
+
+    def run_many(self, cmds):
+        """ Runs several commands.
+
+        Parameters
+        ----------
+        cmds: list of list of str or str
+            the commands.
+
+        Returns
+        -------
+        outputs: list of 3-uplet
+            the exit code, standard output and standard error of each
+            command.
+        """
+        return [self.run(cmd) for cmd in cmds]
+
+    def _command(self, cmd):
+        """ Returns the command that is actually executed.
+        """
+        return cmd
+
+    @property
+    def pending(self):
+        """ Return the files waiting to be uploaded.
+        """
+        return []
+
+    def put(self, paths):
+        """ Marks files to be uploaded to the submission host before the
+        next command.
+
+        Parameters
+        ----------
+        paths: list of Path/str
+            the files written on the current machine.
+        """
+
+    def flush(self):
+        """ Uploads the pending files.
+        """
+
+    def get(self, paths):
+        """ Downloads files written on the submission host: missing files
+        are ignored.
+
+        Parameters
+        ----------
+        paths: list of Path/str
+            the files or folders to be downloaded.
+        """
+
+    def close(self):
+        """ Closes the connection.
+        """
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}()"
+
+
+class SSHTransport(LocalTransport):
+    """ Runs the scheduler commands on a remote submission host over a
+    persistent, multiplexed SSH connection.
+
+    The first command opens a master connection (OpenSSH `ControlMaster`)
+    that is kept alive `persist` after the last use: the next commands
+    reuse it without a new handshake. The batch files are uploaded in a
+    single tar stream before the next command, at the same absolute paths,
+    and the logs are downloaded the same way. Several commands can be run
+    in a single round trip with `run_many`.
+
+    Parameters
+    ----------
+    host: str
+        the submission host.
+    user: str, default None
+        the remote user name.
+    port: int, default None
+        the SSH port.
+    control_dir: Path/str, default None
+        the folder containing the control socket. By default, a temporary
+        folder.
+    persist: str, default '10m'
+        how long the master connection remains open when idle.
+    options: list of str, default None
+        extra options passed to `ssh`, e.g. ['-i', '~/.ssh/id_cluster'].
+
+    Examples
+    --------
+    >>> import hopla
+    >>> from hopla.transport import SSHTransport
+    >>> executor = hopla.Executor(
+    ...     cluster="slurm",
+    ...     folder="/tmp/hopla",
+    ...     queue="Nspin_long",
+    ...     image="/tmp/hopla/my-apptainer-img.simg",
+    ...     transport=SSHTransport("login.cluster.org"),
+    ... ) # doctest: +SKIP
+    """
+    remote = True
+    _ssh = "ssh"
+
+    def __init__(self, host, user=None, port=None, control_dir=None,
+                 persist="10m", options=None):
+        self.host = host
+        self.user = user
+        self.port = port
+        self.persist = persist
+        self.control_dir = Path(control_dir or tempfile.mkdtemp(
+            prefix="hopla-ssh-"))
+        self.options = list(options or [])
+        self._pending = {}
+
+    @property
+    def destination(self):
+        """ Return the SSH destination.
+        """
+        if self.user is None:
+            return self.host
+        return f"{self.user}@{self.host}"
+
+    @property
+    def ssh_command(self):
+        """ Return the SSH command sharing the master connection.
+        """
+        cmd = [
+            self._ssh,
+            "-o", "ControlMaster=auto",
+            "-o", f"ControlPath={self.control_dir / '%C'}",
+            "-o", f"ControlPersist={self.persist}",
+            "-o", "BatchMode=yes",
+        ]
+        if self.port is not None:
+            cmd += ["-p", str(self.port)]
+        return [*cmd, *self.options, self.destination]
+
+    def _command(self, cmd):
+        """ Returns the SSH command running the input command remotely:
+        a shell command is passed as a single argument, which is limited to
+        128 KB on Linux. `run_many` sends its commands as a script on the
+        standard input of `bash -s` instead.
+        """
+        if not isinstance(cmd, str):
+            cmd = shlex.join([str(arg) for arg in cmd])
+        return [*self.ssh_command, cmd]
+
+    def run_many(self, cmds):
+        """ Runs several commands in a single round trip: the commands are
+        sent as a script on the standard input of a remote shell, and do
+        not read their own standard input.
+
+        Parameters
+        ----------
+        cmds: list of list of str or str
+            the commands.
+
+        Returns
+        -------
+        outputs: list of 3-uplet
+            the exit code, standard output and standard error of each
+            command.
+        """
+        if len(cmds) == 0:
+            return []
+        tag = f"HOPLA-{uuid.uuid4().hex}"
+        script = ['hopla_err=$(mktemp)']
+        for cmd in cmds:
+            if not isinstance(cmd, str):
+                cmd = shlex.join([str(arg) for arg in cmd])
+            script += [
+                f'( {cmd}\n) </dev/null 2>"$hopla_err"',
+                f"printf '\\n{tag} %d\\n' $?",
+                'cat "$hopla_err"',
+                f"printf '\\n{tag}\\n'",
+            ]
+        script += ['rm -f "$hopla_err"']
+        returncode, stdout, stderr = self.run(
+            "bash -s", input="\n".join(script).encode())
+        pattern = re.compile(
+            rb"(.*?)\n" + tag.encode() + rb" (\d+)\n(.*?)\n" + tag.encode() +
+            rb"\n", re.DOTALL)
+        outputs = [
+            (int(code), out, err) for out, code, err in
+            pattern.findall(stdout)
+        ]
+        outputs += [(returncode or 255, b"", stderr)] * (
+            len(cmds) - len(outputs))
+        return outputs
+
+    @property
+    def pending(self):
+        """ Return the files waiting to be uploaded.
+        """
+        return list(self._pending)
+
+    def put(self, paths):
+        """ Marks files to be uploaded to the submission host, at the same
+        absolute paths, before the next command.
+
+        Parameters
+        ----------
+        paths: list of Path/str
+            the files written on the current machine.
+        """
+        for path in paths:
+            self._pending[str(Path(path).absolute())] = None
+
+    def flush(self):
+        """ Uploads the pending files in a single tar stream.
+
+        Raises
+        ------
+        RuntimeError
+            If the upload fails.
+        """
+        if len(self._pending) > 0:
+            paths, self._pending = list(self._pending), {}
+            archive = subprocess.Popen(
+                ["tar", "-cPf", "-", "--null", "-T", "-"],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+            process = subprocess.Popen(
+                self._command("tar -xPf -"),
+                stdin=archive.stdout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+            )
+            archive.stdout.close()
+            archive.stdin.write(_null_separated(paths))
+            archive.stdin.close()
+            _, stderr = process.communicate()
+            archive.wait()
+            if archive.returncode != 0 or process.returncode != 0:
+                raise RuntimeError(
+                    f"Upload to {self.destination} failed: "
+                    f"{stderr.decode('utf8')}"
+                )
+
+    def get(self, paths):
+        """ Downloads files written on the submission host, at the same
+        absolute paths, in a single tar stream: missing files are ignored.
+
+        Parameters
+        ----------
+        paths: list of Path/str
+            the files or folders to be downloaded.
+        """
+        if len(paths) > 0:
+            archive = subprocess.Popen(
+                self._command("tar --ignore-failed-read -cPf - --null -T - "
+                              "2>/dev/null"),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+            )
+            extract = subprocess.Popen(
+                ["tar", "-xPf", "-"],
+                stdin=archive.stdout,
+                stderr=subprocess.DEVNULL,
+            )
+            archive.stdout.close()
+            archive.stdin.write(_null_separated(paths))
+            archive.stdin.close()
+            extract.wait()
+            archive.wait()
+
+    def close(self):
+        """ Closes the master connection.
+        """
+        subprocess.run(
+            [*self.ssh_command[:-1], "-O", "exit", self.destination],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=False,
+        )
+
+    def __repr__(self):
+        return (f"{self.__class__.__name__}(host={self.host}, "
+                f"user={self.user}, persist={self.persist})")
+
+
+def _null_separated(paths):
+    """ Returns the paths as the null separated list read by `tar -T`.
+    """
+    return b"".join(str(path).encode() + b"\0" for path in paths)
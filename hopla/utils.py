@@ -10,19 +10,27 @@
 Contains some utility functions.
 """
 
+import asyncio
+import hashlib
 import inspect
-import shutil
+import os
+import shlex
+import signal as signals
 import subprocess
 import textwrap
 import time
 import warnings
 from abc import ABC, abstractmethod
+from concurrent.futures import CancelledError
 from pathlib import Path
 
 from .config import (
     DEFAULT_OPTIONS,
     hopla_options,
 )
+from .futures import wait
+from .templates import load_template
+from .transport import LocalTransport
 
 
 def format_attributes(cls, attrs=None):
@@ -54,22 +62,20 @@ def format_attributes(cls, attrs=None):
 class JobPaths:
     """ Creates paths related to a job and its submission.
 
+    The paths are generated on demand, the folder paths being shared by all
+    the jobs of an executor. The folders are created by the executor.
+
     Parameters
     ----------
-    folder: Path
-        the current execution folder.
+    folders: tuple of Path
+        the submission and log folders of the executor.
     job_id: str
         the job identifier.
     """
-    def __init__(self, folder, job_id):
-        self.submission_folder = folder / "submissions"
-        self.log_folder = folder / "logs"
-        if self.submission_folder.exists():
-            shutil.rmtree(self.submission_folder)
-        if self.log_folder.exists():
-            shutil.rmtree(self.log_folder)
-        self.submission_folder.mkdir(parents=True, exist_ok=True)
-        self.log_folder.mkdir(parents=True, exist_ok=True)
+    __slots__ = ("job_id", "log_folder", "submission_folder")
+
+    def __init__(self, folders, job_id):
+        self.submission_folder, self.log_folder = folders
         self.job_id = job_id
 
     @property
@@ -90,6 +96,12 @@ class JobPaths:
         """
         return self.log_folder / f"{self.job_id}_log.out"
 
+    @property
+    def heartbeat(self):
+        """ Generate the heartbeat file location.
+        """
+        return self.log_folder / f"{self.job_id}_heartbeat"
+
     @property
     def task_file(self):
         """ Generate the task file location.
@@ -98,9 +110,9 @@ class JobPaths:
 
     @property
     def worker_file(self):
-        """ Generate the worker file location.
+        """ Generate the flux driver file location.
         """
-        return self.submission_folder / "worker.sh"
+        return self.submission_folder / "flux_driver.py"
 
     @property
     def joblib_file(self):
@@ -132,6 +144,85 @@ class JobPaths:
         return format_attributes(self)
 
 
+class ScriptBundle:
+    """ Stores the submitted batch scripts in a single append-only file.
+
+    The scripts are concatenated in a bundle file, and an index file lists
+    the offset and size of each script: an existing bundle is reloaded.
+
+    Parameters
+    ----------
+    folder: Path
+        the folder containing the bundle.
+
+    Examples
+    --------
+    >>> from pathlib import Path
+    >>> from hopla.utils import ScriptBundle
+    >>> bundle = ScriptBundle(Path("/tmp/hopla-bundle"))
+    >>> bundle.append("1", "#!/bin/bash\\nsleep 1\\n")
+    >>> bundle.read("1") # doctest: +SKIP
+    '#!/bin/bash\\nsleep 1\\n'
+    """
+    def __init__(self, folder):
+        self.path = folder / "scripts.bundle"
+        self.index_path = folder / "scripts.index"
+        self._index = {}
+        if self.index_path.exists():
+            with open(self.index_path) as of:
+                for line in of:
+                    key, offset, size = line.rstrip("\n").split("\t")
+                    self._index[key] = (int(offset), int(size))
+
+    def append(self, key, script):
+        """ Appends a script to the bundle.
+
+        Parameters
+        ----------
+        key: str
+            the script identifier, e.g. the job identifier.
+        script: str
+            the script content.
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = script.encode()
+        with open(self.path, "ab") as of:
+            offset = of.tell()
+            of.write(data)
+        with open(self.index_path, "a") as of:
+            of.write(f"{key}\t{offset}\t{len(data)}\n")
+        self._index[key] = (offset, len(data))
+
+    def read(self, key):
+        """ Reads a script from the bundle.
+
+        Parameters
+        ----------
+        key: str
+            the script identifier.
+
+        Returns
+        -------
+        script: str
+            the script content, None if not in the bundle.
+        """
+        if key not in self._index:
+            return None
+        offset, size = self._index[key]
+        with open(self.path, "rb") as of:
+            of.seek(offset)
+            return of.read(size).decode()
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def __repr__(self):
+        return format_attributes(self, attrs=["path"])
+
+
 class InfoWatcher(ABC):
     """ An instance of this class is shared by all jobs, and is in charge of
     calling scheduler to check status for all jobs at once.
@@ -149,6 +240,7 @@ class InfoWatcher(ABC):
         self._info_dict = {}
         self._registered = set()
         self._finished = set()
+        self.transport = LocalTransport()
 
     def clear(self):
         """ Clears cache.
@@ -175,11 +267,37 @@ class InfoWatcher(ABC):
         """
         if job_id not in self._registered:
             self.register_job(job_id)
-        last_check_delta = time.time() - self._last_status_check
-        if last_check_delta > self._delay_s:
+        if self._is_outdated():
             self.update()
         return self._info_dict.get(job_id, {})
 
+    async def aget_info(self, job_id):
+        """ Returns a dict containing info about the job without blocking the
+        event loop.
+
+        Parameters
+        ----------
+        job_id: int
+            id of the job on the cluster.
+
+        Returns
+        -------
+        info: dict
+            information about this jobs.
+        """
+        if job_id not in self._registered:
+            self.register_job(job_id)
+        if self._is_outdated():
+            await self.aupdate()
+        return self._info_dict.get(job_id, {})
+
+    def _is_outdated(self):
+        """ Checks whether the maximum delay since the last call to the
+        cluster is exceeded.
+        """
+        last_check_delta = time.time() - self._last_status_check
+        return last_check_delta > self._delay_s
+
     def get_state(self, job_id):
         """ Returns the state of the job.
 
@@ -193,7 +311,22 @@ class InfoWatcher(ABC):
         state: str
             the current state of the job.
         """
-        info = self.get_info(job_id)
+        return self.read_state(self.get_info(job_id))
+
+    @classmethod
+    def read_state(cls, info):
+        """ Returns the state of the job from its information.
+
+        Parameters
+        ----------
+        info: dict
+            information about the job.
+
+        Returns
+        -------
+        state: str
+            the current state of the job.
+        """
         state = info.get("job_state") or "UNKNOWN"
         if isinstance(state, (list, tuple)):
             state = state[-1]
@@ -213,23 +346,65 @@ class InfoWatcher(ABC):
             return
         self._num_calls += 1
         try:
-            self._output = subprocess.check_output(
-                self.update_command,
-                shell=True,
-            )
+            output = self._call_scheduler()
         except Exception as e:
-            warnings.warn(
-                f"Call #{self._num_calls} - Bypassing stat error {e}, status "
-                "may be inaccurate.", stacklevel=find_stack_level()
-            )
-        else:
+            self._warn_update_error(e)
+            output = None
+        self._store_output(output)
+
+    async def aupdate(self):
+        """ Updates the info of all registered jobs without blocking the
+        event loop.
+        """
+        if len(self._registered) == 0:
+            return
+        self._num_calls += 1
+        self._last_status_check = time.time()
+        try:
+            output = await self._acall_scheduler()
+        except Exception as e:
+            self._warn_update_error(e)
+            output = None
+        self._store_output(output)
+
+    def _warn_update_error(self, error):
+        """ Warns that the cluster call failed.
+        """
+        warnings.warn(
+            f"Call #{self._num_calls} - Bypassing stat error {error}, status "
+            "may be inaccurate.", stacklevel=find_stack_level()
+        )
+
+    def _store_output(self, output):
+        """ Stores the output of the update command and the finished jobs.
+        """
+        if output is not None:
+            self._output = output
             self._info_dict.update(self.read_info(self._output))
         self._last_status_check = time.time()
         active_jobs = self._registered - self._finished
         for job_id in active_jobs:
-            if self.is_done(job_id):
+            state = self.read_state(self._info_dict.get(job_id, {}))
+            if state.upper() not in self.valid_status:
                 self._finished.add(job_id)
 
+    def _call_scheduler(self):
+        """ Call the scheduler and return the output of the update command.
+        """
+        return self.transport.check_output(self.update_command)
+
+    async def _acall_scheduler(self):
+        """ Call the scheduler asynchronously and return the output of the
+        update command.
+        """
+        returncode, stdout, stderr = await self.transport.arun(
+            self.update_command)
+        if returncode != 0:
+            raise subprocess.CalledProcessError(
+                returncode, self.update_command, stdout, stderr
+            )
+        return stdout
+
     def is_done(self, job_id):
         """ Returns whether the job is finished.
 
@@ -246,6 +421,115 @@ class InfoWatcher(ABC):
         state = self.get_state(job_id)
         return state.upper() not in self.valid_status
 
+    def get_queue_stats(self):
+        """ Returns the queue statistics of the active jobs from the last
+        call to the cluster.
+
+        Returns
+        -------
+        n_pending: int
+            the number of jobs waiting in the queue.
+        n_running: int
+            the number of jobs started by the scheduler.
+        queue_wait: float
+            the median queue wait of the active jobs (in seconds): the
+            time spent in the queue by the running jobs, and the time
+            already spent by the pending ones. None if not available.
+        """
+        now = time.time()
+        n_pending, n_running, waits = 0, 0, []
+        for job_id in self._registered - self._finished:
+            info = self._info_dict.get(job_id)
+            if info is None:
+                continue
+            pending = self.read_state(info).upper() in self.pending_status
+            if pending:
+                n_pending += 1
+            else:
+                n_running += 1
+            submit_time, start_time = self.read_times(info)
+            if submit_time is not None:
+                end_time = now if pending or start_time is None else start_time
+                waits.append(max(end_time - submit_time, 0))
+        queue_wait = None
+        if len(waits) > 0:
+            queue_wait = sorted(waits)[len(waits) // 2]
+        return n_pending, n_running, queue_wait
+
+    @property
+    def pending_status(self):
+        """ Return the list of status of the jobs waiting in the queue.
+        """
+        return []
+
+    @classmethod
+    def read_times(cls, info):
+        """ Returns the submission and start times of the job from its
+        information.
+
+        Parameters
+        ----------
+        info: dict
+            information about the job.
+
+        Returns
+        -------
+        submit_time: float
+            the submission timestamp, or None if not available.
+        start_time: float
+            the start timestamp, or None if not started.
+        """
+        return None, None
+
+    @classmethod
+    def read_end_time(cls, info):
+        """ Returns the end time of the job from its information.
+
+        Parameters
+        ----------
+        info: dict
+            information about the job.
+
+        Returns
+        -------
+        end_time: float
+            the end timestamp, or None if not available.
+        """
+        return None
+
+    @classmethod
+    def read_node(cls, info):
+        """ Returns the node running the job from its information.
+
+        Parameters
+        ----------
+        info: dict
+            information about the job.
+
+        Returns
+        -------
+        node: str
+            the first node allocated to the job, or None if not available.
+        """
+        return None
+
+    async def ais_done(self, job_id):
+        """ Returns whether the job is finished without blocking the event
+        loop.
+
+        Parameters
+        ----------
+        job_id: str
+            id of the job on the cluster.
+
+        Returns
+        -------
+        done: bool
+            True if the job is done, False otherwise.
+        """
+        state = self.read_state(await self.aget_info(job_id))
+        return state.upper() not in self.valid_status
+
     @property
     @abstractmethod
     def update_command(self):
@@ -279,13 +563,36 @@ class DelayedJob(ABC):
     job_id: str
         the job identifier.
     """
+    __slots__ = ("_callbacks", "_cancelled", "_executor", "_finalized",
+                 "delayed_submission", "dependencies", "expected_runtime",
+                 "job_id", "priority", "resources", "restarts", "stderr",
+                 "submission_id")
+    _checkpoint_options = None
+    _dependency_options = None
+    _exclude_options = None
+    _signal_command = None
+    _template_name = None
+
     def __init__(self, delayed_submission, executor, job_id):
         self.delayed_submission = delayed_submission
         self._executor = executor
         self.job_id = job_id
         self.submission_id = None
         self.stderr = None
-        self.paths = JobPaths(self._executor.folder, self.job_id)
+        self.dependencies = ()
+        self.resources = ()
+        self.priority = 0
+        self.expected_runtime = None
+        self.restarts = 0
+        self._callbacks = ()
+        self._finalized = False
+        self._cancelled = False
+
+    @property
+    def paths(self):
+        """ Return the paths related to the job and its submission.
+        """
+        return JobPaths(self._executor._job_folders, self.job_id)
 
     @property
     def done(self):
@@ -297,10 +604,129 @@ class DelayedJob(ABC):
             return True
         return self._executor.watcher.is_done(self.submission_id)
 
+    def result(self, timeout=None):
+        """ Waits for the job to finish and returns its result. The
+        executor is driven while waiting.
+
+        Parameters
+        ----------
+        timeout: float, default None
+            the maximum number of seconds to wait. By default, there is no
+            limit on the wait time.
+
+        Returns
+        -------
+        stdout: Path/str
+            the standard output of the job, or its location in the packed
+            log store: use `read_stdout` to read it in both cases.
+
+        Raises
+        ------
+        RuntimeError
+            If the job failed.
+        """
+        error = self.exception(timeout=timeout)
+        if error is not None:
+            raise RuntimeError(*error.args)
+        return self.log_location("stdout") or self.paths.stdout
+
+    def exception(self, timeout=None):
+        """ Waits for the job to finish and returns the raised exception if
+        the job failed. The executor is driven while waiting.
+
+        Parameters
+        ----------
+        timeout: float, default None
+            the maximum number of seconds to wait. By default, there is no
+            limit on the wait time.
+
+        Returns
+        -------
+        error: RuntimeError
+            the job failure, or None if the job completed successfully.
+
+        Raises
+        ------
+        TimeoutError
+            If the job did not finish before the timeout.
+        CancelledError
+            If the job was canceled.
+        """
+        if self._cancelled:
+            raise CancelledError(f"Job {self.job_id} was canceled.")
+        if not self.done:
+            _, not_done = wait([self], timeout=timeout)
+            if len(not_done) > 0:
+                raise TimeoutError(
+                    f"Job {self.job_id} did not finish in {timeout} seconds."
+                )
+        if self.exitcode:
+            return None
+        stderr = self.log_location("stderr") or self.stderr
+        return RuntimeError(
+            f"Job {self.job_id} ({self.submission_id}) failed: {stderr}"
+        )
+
+    def add_done_callback(self, fn):
+        """ Attaches a callable that will be called with the job as its only
+        argument when the job finishes. If the job is already finished, the
+        callable is called immediately.
+
+        Parameters
+        ----------
+        fn: callable
+            the callable to be called.
+        """
+        if self._finalized:
+            self._run_callback(fn)
+        else:
+            self._callbacks += (fn,)
+
+    def _finalize(self):
+        """ Calls the attached callables once the job is finished.
+        """
+        self._finalized = True
+        callbacks, self._callbacks = self._callbacks, ()
+        for fn in callbacks:
+            self._run_callback(fn)
+
+    def _run_callback(self, fn):
+        """ Calls an attached callable, the errors are only reported.
+        """
+        try:
+            fn(self)
+        except Exception as e:
+            warnings.warn(
+                f"Exception in job {self.job_id} callback: {e!r}",
+                stacklevel=find_stack_level()
+            )
+
+    async def _adone(self):
+        """ Checks whether the job is finished properly without blocking the
+        event loop.
+        """
+        if self.submission_id is None:
+            return False
+        if self.submission_id == "EXIT":
+            return True
+        return await self._executor.watcher.ais_done(self.submission_id)
+
+    def __await__(self):
+        return self._await_done().__await__()
+
+    async def _await_done(self):
+        """ Waits until the job is finished.
+        """
+        while not await self._adone():
+            await asyncio.sleep(self._executor.watcher._delay_s)
+        return self
+
     @property
     def status(self):
         """ Checks the job status.
         """
+        if self._cancelled:
+            return "CANCELLED"
         if self.submission_id is None:
             return "NOTSTARTED"
         return self._executor.watcher.get_state(self.submission_id)
@@ -309,8 +735,9 @@ class DelayedJob(ABC):
     def exitcode(self):
         """ Check if the code finished properly.
         """
-        if self.paths.stdout.exists():
-            return self._check_is_done(self.paths.stdout)
+        content = self.read_stdout()
+        if content is not None:
+            return self._is_done(content)
         return False
 
     @classmethod
@@ -318,9 +745,177 @@ class DelayedJob(ABC):
         """ Check if the input file finished by done.
         """
         with open(path) as of:
-            content = of.read().split("##########")[0].strip("\n")
+            return cls._is_done(of.read())
+
+    @classmethod
+    def _is_done(cls, content):
+        """ Check if the input log finished by done.
+        """
+        content = content.split("##########")[0].strip("\n")
         return "HOPLASAY-DONE" in content.split("\n")
 
+    @property
+    def checkpointed(self):
+        """ Check if the job saved its state before the walltime and must
+        be continued.
+        """
+        content = self.read_stdout()
+        if content is None:
+            return False
+        content = content.split("##########")[0].strip("\n")
+        return "HOPLASAY-CHECKPOINT" in content.split("\n")
+
+    @property
+    def node(self):
+        """ Return the node that ran the job: the second line of its
+        standard output, or else the scheduler information.
+        """
+        content = self.read_stdout()
+        if content is not None:
+            lines = content.splitlines()
+            if len(lines) > 1 and lines[1].strip() != "":
+                return lines[1].strip().split(".")[0]
+        watcher = self._executor.watcher
+        info = watcher._info_dict.get(self.submission_id)
+        if info is None:
+            return None
+        return watcher.read_node(info)
+
+    def _wrap_command(self, cmd):
+        """ Wraps a command in the checkpoint protocol when the executor
+        enables it: before the walltime, the command receives SIGUSR1,
+        either from the scheduler or from a timer. When the stall monitor
+        uses a heartbeat, its location is exported in the
+        `HOPLA_HEARTBEAT` environment variable.
+        """
+        monitor = self._executor.monitor
+        if monitor is not None and monitor.heartbeat:
+            cmd = f"export HOPLA_HEARTBEAT={self.paths.heartbeat}\n{cmd}"
+        checkpoint = self._executor.checkpoint
+        if checkpoint is None:
+            return cmd
+        timer, stop_timer = "", ""
+        if self._checkpoint_options is None:
+            walltime = dict(self.resources).get(
+                "walltime", self._executor.parameters["walltime"])
+            delay = max(int(walltime * 3600 - checkpoint), 0)
+            timer = (
+                "( trap 'kill $hopla_sleep; exit 0' TERM; "
+                f"sleep {delay} & hopla_sleep=$!; wait $hopla_sleep; "
+                "kill -USR1 $$ ) &\nhopla_timer=$!"
+            )
+            stop_timer = "kill $hopla_timer 2>/dev/null"
+        return load_template("checkpoint_template.txt").render(
+            command=cmd, timer=timer, stop_timer=stop_timer)
+
+    @property
+    def log_files(self):
+        """ Return the log files of the job, indexed by their names.
+        """
+        paths = self.paths
+        return {"stdout": paths.stdout, "stderr": paths.stderr}
+
+    def read_log(self, name):
+        """ Reads a log of the job, from its file or from the packed log
+        store.
+
+        Parameters
+        ----------
+        name: str
+            the log name, e.g. 'stdout' or 'stderr'.
+
+        Returns
+        -------
+        content: str
+            the log content, None if not available.
+        """
+        path = self.log_files.get(name)
+        if path is not None and path.exists():
+            with open(path, errors="replace") as of:
+                return of.read()
+        store = self._executor.log_store
+        if store is not None:
+            return store.read(self.job_id, name)
+        return None
+
+    def read_stdout(self):
+        """ Reads the standard output of the job.
+
+        Returns
+        -------
+        content: str
+            the standard output, None if not available.
+        """
+        return self.read_log("stdout")
+
+    def read_stderr(self):
+        """ Reads the standard error of the job.
+
+        Returns
+        -------
+        content: str
+            the standard error, None if not available.
+        """
+        return self.read_log("stderr")
+
+    def tail(self, n=10, name="stdout"):
+        """ Returns the last lines of a log of the job.
+
+        Parameters
+        ----------
+        n: int, default 10
+            the number of lines.
+        name: str, default 'stdout'
+            the log name.
+
+        Returns
+        -------
+        lines: list of str
+            the last lines of the log, empty if not available.
+        """
+        content = self.read_log(name)
+        if content is None:
+            return []
+        return content.splitlines()[-n:]
+
+    def log_names(self):
+        """ Return the names of the available logs of the job.
+
+        Returns
+        -------
+        names: list of str
+            the log names.
+        """
+        names = [name for name, path in self.log_files.items()
+                 if path.exists()]
+        store = self._executor.log_store
+        if store is not None:
+            names += [name for name in store.names(self.job_id)
+                      if name not in names]
+        return names
+
+    def log_location(self, name):
+        """ Return where a log of the job is stored.
+
+        Parameters
+        ----------
+        name: str
+            the log name.
+
+        Returns
+        -------
+        location: Path/str
+            the log file or its location in the packed log store, None if
+            not available.
+        """
+        path = self.log_files.get(name)
+        if path is not None and path.exists():
+            return path
+        store = self._executor.log_store
+        if store is not None and name in store.names(self.job_id):
+            return store.location(self.job_id, name)
+        return None
+
     def _register_in_watcher(self):
         self._executor.watcher.register_job(self.submission_id)
 
@@ -330,22 +925,28 @@ class DelayedJob(ABC):
         """
         message = ["-" * 40]
         code = "success" if self.exitcode else "failure"
+        if self._cancelled:
+            code = "canceled"
         prefix = f"{self.__class__.__name__}<job_id={self.job_id}>"
         message.append(f"{prefix}exitcode: {code}")
-        if self.paths.submission_file.exists():
+        bundle = self._executor.bundle
+        if bundle is not None and str(self.job_id) in bundle:
+            message.append(f"{prefix}submission: {self.submission_location}")
+        elif self.paths.submission_file.exists():
             message.append(f"{prefix}submission: {self.paths.submission_file}")
         else:
             message.append(f"{prefix}submission: none")
-        if self.paths.stdout.exists():
-            message.append(f"{prefix}stdout: {self.paths.stdout}")
-            with open(self.paths.stdout) as of:
-                info = [line.strip("\n") for line in of]
+        stdout = self.read_stdout()
+        if stdout is not None:
+            message.append(f"{prefix}stdout: {self.log_location('stdout')}")
+            info = stdout.splitlines()
             message.append(f"{prefix}submission_id: {info[0]}")
             message.append(f"{prefix}node: {info[1]}")
         else:
             message.append(f"{prefix}stdout: none")
-        if self.paths.stderr.exists():
-            message.append(f"<{prefix}stderr: {self.paths.stderr}")
+        stderr = self.log_location("stderr")
+        if stderr is not None:
+            message.append(f"<{prefix}stderr: {stderr}")
         elif self.stderr is not None:
             message.append(f"<{prefix}stderr: {self.stderr}")
         else:
@@ -369,35 +970,430 @@ class DelayedJob(ABC):
         opts = hopla_options.get()
         verbose = opts.get("verbose", DEFAULT_OPTIONS["verbose"])
 
-        self.generate_batch()
         if self.submission_id is None or self.done:
+            script = self._prepare_batch()
             if dryrun:
-                print(
-                    f"[command] {self.start_command} "
-                    f"{self.paths.submission_file}"
-                )
+                print(self._dryrun_message(script))
+                self.submission_id = "EXIT"
+            else:
+                if script is None:
+                    self._executor.transport.put(self.batch_files)
+                self._read_submission(*self._submit(script))
+            if verbose:
+                print(f"Job {self.submission_id} - "
+                      f"{self.submission_location} is running!")
+            self._register_in_watcher()
+
+    async def astart(self, dryrun=False):
+        """ Start a job without blocking the event loop.
+
+        Parameters
+        ----------
+        dryrun: bool, default False
+            if True, only print the submission command.
+        """
+        opts = hopla_options.get()
+        verbose = opts.get("verbose", DEFAULT_OPTIONS["verbose"])
+
+        if self.submission_id is None or await self._adone():
+            script = self._prepare_batch()
+            if dryrun:
+                print(self._dryrun_message(script))
                 self.submission_id = "EXIT"
             else:
-                process = subprocess.Popen(
-                    [self.start_command, self.paths.submission_file],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE)
-                stdout, stderr = process.communicate()
-                self.submission_id = self.read_jobid(stdout)
-                if not self.submission_id.isdigit():
-                    self.submission_id = "EXIT"
-                    self.stderr = stderr.decode("utf8")
+                if script is None:
+                    self._executor.transport.put(self.batch_files)
+                self._read_submission(*await self._asubmit(script))
             if verbose:
                 print(f"Job {self.submission_id} - "
-                      f"{self.paths.submission_file} is running!")
+                      f"{self.submission_location} is running!")
             self._register_in_watcher()
 
+    @classmethod
+    def start_jobs(cls, jobs, dryrun=False):
+        """ Start several jobs: with a remote transport, the batch files are
+        uploaded together and the jobs are submitted in a single round
+        trip.
+
+        Parameters
+        ----------
+        jobs: list of DelayedJob
+            the jobs to be started.
+        dryrun: bool, default False
+            if True, only print the submission commands.
+
+        Returns
+        -------
+        started: list of DelayedJob
+            the jobs submitted to the scheduler.
+        """
+        transport = jobs[0]._executor.transport
+        if dryrun or not transport.remote or len(jobs) == 1:
+            for job in jobs:
+                job.start(dryrun=dryrun)
+            return jobs
+        opts = hopla_options.get()
+        verbose = opts.get("verbose", DEFAULT_OPTIONS["verbose"])
+        jobs = [job for job in jobs if job.submission_id is None or job.done]
+        cmds = []
+        for job in jobs:
+            script = job._prepare_batch()
+            args = job._start_arguments(script)
+            if script is None:
+                transport.put(job.batch_files)
+                cmds.append(args)
+            else:
+                if not script.endswith("\n"):
+                    script += "\n"
+                cmds.append(
+                    f"{shlex.join([str(arg) for arg in args])} "
+                    f"<<'HOPLA-EOF'\n{script}HOPLA-EOF"
+                )
+        outputs = transport.run_many(cmds)
+        for job, (_, stdout, stderr) in zip(jobs, outputs, strict=True):
+            job._read_submission(stdout, stderr)
+            if verbose:
+                print(f"Job {job.submission_id} - "
+                      f"{job.submission_location} is running!")
+            job._register_in_watcher()
+        return jobs
+
+    def generate_batch(self):
+        """ Write the batch file.
+        """
+        self._clean_logs()
+        script = self.render_batch()
+        with open(self.paths.submission_file, "w") as of:
+            of.write(script)
+
+    def _clean_logs(self):
+        """ Removes the logs of a previous execution.
+        """
+        paths = self.paths
+        for path in (paths.stdout, paths.stderr):
+            if path.exists():
+                os.remove(path)
+
+    def _prepare_batch(self):
+        """ Prepares the batch script before the submission.
+
+        Returns
+        -------
+        script: str
+            the script piped on the standard input of the start command,
+            or None if the batch file is written.
+        """
+        if not self._executor.stdin:
+            self.generate_batch()
+            return None
+        self._clean_logs()
+        script = self.render_batch()
+        if self._executor.bundle is not None:
+            self._executor.bundle.append(str(self.job_id), script)
+        return script
+
+    def _start_arguments(self, script=None):
+        """ Return the start command arguments: the batch file is omitted
+        when the script is piped on the standard input.
+        """
+        args = [self.start_command, *self.submission_options]
+        if script is None:
+            args.append(self.paths.submission_file)
+        return args
+
+    def _dryrun_message(self, script=None):
+        """ Return the message printed instead of the start command.
+        """
+        message = (f"[command] {self.start_command} "
+                   f"{' '.join(self.submission_options)} ")
+        if script is None:
+            return message + str(self.paths.submission_file)
+        return message + f"< {self.submission_location}"
+
+    @property
+    def submission_location(self):
+        """ Return where the batch script is stored: the batch file, the
+        script bundle entry, or 'stdin' if the script is not archived.
+        """
+        if not self._executor.stdin:
+            return self.paths.submission_file
+        if self._executor.bundle is not None:
+            return f"{self._executor.bundle.path}#{self.job_id}"
+        return "stdin"
+
+    def read_batch(self):
+        """ Reads the submitted batch script.
+
+        Returns
+        -------
+        script: str
+            the batch script, None if not available.
+        """
+        if self._executor.stdin:
+            if self._executor.bundle is None:
+                return None
+            return self._executor.bundle.read(str(self.job_id))
+        if not self.paths.submission_file.exists():
+            return None
+        with open(self.paths.submission_file) as of:
+            return of.read()
+
+    @property
+    def batch_files(self):
+        """ Return the files written by `generate_batch` that the scheduler
+        needs to read.
+        """
+        return [self.paths.submission_file]
+
+    def _read_submission(self, stdout, stderr):
+        """ Sets the submission ID from the outputs of the start command.
+        """
+        self.submission_id = self.read_jobid(stdout)
+        if not self.submission_id.isdigit():
+            self.submission_id = "EXIT"
+            self.stderr = stderr.decode("utf8")
+
+    def _submit(self, script=None):
+        """ Call the scheduler and return the outputs of the start command.
+
+        Parameters
+        ----------
+        script: str, default None
+            the script piped on the standard input of the start command.
+            By default, the batch file is passed.
+
+        Returns
+        -------
+        stdout: bytes
+            the standard output of the start command.
+        stderr: bytes
+            the standard error of the start command.
+        """
+        _, stdout, stderr = self._executor.transport.run(
+            self._start_arguments(script),
+            input=None if script is None else script.encode())
+        return stdout, stderr
+
+    async def _asubmit(self, script=None):
+        """ Call the scheduler asynchronously and return the outputs of the
+        start command.
+
+        Parameters
+        ----------
+        script: str, default None
+            the script piped on the standard input of the start command.
+            By default, the batch file is passed.
+
+        Returns
+        -------
+        stdout: bytes
+            the standard output of the start command.
+        stderr: bytes
+            the standard error of the start command.
+        """
+        _, stdout, stderr = await self._executor.transport.arun(
+            [str(arg) for arg in self._start_arguments(script)],
+            input=None if script is None else script.encode())
+        return stdout, stderr
+
+    @property
+    def submission_options(self):
+        """ Return the options of the start command: the excluded nodes
+        and the dependencies already submitted to the scheduler are
+        delegated to it when supported.
+        """
+        options = []
+        checkpoint = self._executor.checkpoint
+        if checkpoint is not None and self._checkpoint_options is not None:
+            options += [option.format(delay=int(checkpoint))
+                        for option in self._checkpoint_options]
+        tracker = self._executor.exclude_nodes
+        if (tracker is not None and self._exclude_options is not None and
+                len(tracker.excluded) > 0):
+            nodes = ",".join(tracker.excluded)
+            options += [option.format(nodes=nodes)
+                        for option in self._exclude_options]
+        if self._dependency_options is None:
+            return options
+        ids = [dep.submission_id for dep in self._native_dependencies]
+        if len(ids) == 0:
+            return options
+        return options + [option.format(ids=":".join(ids))
+                          for option in self._dependency_options]
+
+    @property
+    def _native_dependencies(self):
+        """ Return the dependencies that can be handled by the scheduler:
+        none when the checkpoint protocol is enabled, since a checkpointed
+        job is continued by a new submission.
+        """
+        if (self._dependency_options is None or
+                self._executor.checkpoint is not None):
+            return []
+        return [
+            dep for dep in self.dependencies
+            if dep._executor is self._executor and
+            dep.submission_id is not None and dep.submission_id.isdigit()
+        ]
+
+    def _check_dependencies(self, dryrun=False):
+        """ Checks whether the job dependencies allow its submission.
+
+        Parameters
+        ----------
+        dryrun: bool, default False
+            if True, the dependencies only need to be started.
+
+        Returns
+        -------
+        state: str
+            'ready' if the job can be submitted, 'waiting' if some
+            dependencies are not finished, or 'failed' if some dependencies
+            failed.
+        """
+        native = self._native_dependencies
+        for dep in self.dependencies:
+            if dep.submission_id is None:
+                return "waiting"
+            if dryrun or any(dep is other for other in native):
+                continue
+            if not dep.done:
+                return "waiting"
+            if not dep.exitcode:
+                return "failed"
+        return "ready"
+
+    def _abort(self, reason):
+        """ Marks the job as finished without submitting it.
+
+        Parameters
+        ----------
+        reason: str
+            the reason why the job is not submitted.
+        """
+        self.submission_id = "EXIT"
+        self.stderr = reason
+
+    @property
+    def template(self):
+        """ Return the batch template where the executor parameters are
+        already rendered. It is compiled once per executor.
+        """
+        key = self._template_key()
+        templates = self._executor._templates
+        if key not in templates:
+            name = key[1]
+            if (self._executor.template is not None and
+                    name == self._template_name):
+                template = self._executor.template
+            else:
+                template = load_template(name)
+            templates[key] = template.partial(**self._static_parameters())
+        return templates[key]
+
+    def _template_key(self):
+        """ Return the key of the batch template in the executor cache: the
+        job class and the template file name first, the resource class
+        last.
+        """
+        return (type(self), self._template_name, self.resources)
+
+    def _static_parameters(self):
+        """ Return the parameters shared by all jobs of the executor and of
+        the same resource class.
+        """
+        if len(self.resources) == 0:
+            return self._executor.parameters
+        return {**self._executor.parameters, **dict(self.resources)}
+
+    def cancelled(self):  # codespell:ignore
+        """ Checks whether the job was canceled.
+
+        Returns
+        -------
+        canceled: bool
+            True if the job was canceled.
+        """
+        return self._cancelled
+
     def stop(self):
         """ Stop a job.
         """
-        if self.submission_id is not None or not self.done:
-            cmd = [self.stop_command, self.job_id]
-            subprocess.check_call(cmd)
+        if self.submission_id not in (None, "EXIT") and not self.done:
+            self.cancel_jobs([self])
+            self._cancelled = True
+
+    @classmethod
+    def cancel_jobs(cls, jobs, signal=None, dryrun=False):
+        """ Cancel started jobs, or send them a signal, with as few
+        scheduler calls as the command line length allows. A failing
+        scheduler call, e.g. because a job finished in the meantime, is
+        only reported.
+
+        Parameters
+        ----------
+        jobs: list of DelayedJob
+            the started jobs.
+        signal: int or str, default None
+            the signal sent to the jobs, e.g. `signal.SIGUSR1` or 'USR1'.
+            By default, the jobs are canceled.
+        dryrun: bool, default False
+            if True, only print the scheduler commands.
+
+        Returns
+        -------
+        submission_ids: list of str
+            the canceled or signaled submission IDs.
+
+        Raises
+        ------
+        ValueError
+            If the job class does not support signals.
+        """
+        submission_ids = cls._cancel_ids(jobs)
+        if len(submission_ids) == 0:
+            return submission_ids
+        if signal is None:
+            cmd = [jobs[0].stop_command]
+        elif cls._signal_command is None:
+            raise ValueError(
+                f"Signals are not supported by {cls.__name__}."
+            )
+        else:
+            name = signal_name(signal)
+            cmd = [arg.format(signal=name) for arg in cls._signal_command]
+        cmds = [cmd + ids for ids in batch_arguments(cmd, submission_ids)]
+        if dryrun:
+            for args in cmds:
+                print(f"[command] {' '.join(args)}")
+            return submission_ids
+        outputs = jobs[0]._executor.transport.run_many(cmds)
+        for args, (returncode, _, stderr) in zip(cmds, outputs, strict=True):
+            if returncode != 0:
+                if not isinstance(stderr, str):
+                    stderr = stderr.decode("utf8", errors="replace")
+                warnings.warn(
+                    f"'{args[0]}' exited with code {returncode} for "
+                    f"{len(args) - len(cmd)} jobs: {stderr.strip()}",
+                    stacklevel=find_stack_level()
+                )
+        return submission_ids
+
+    @classmethod
+    def _cancel_ids(cls, jobs):
+        """ Return the scheduler IDs used to cancel the jobs.
+
+        Parameters
+        ----------
+        jobs: list of DelayedJob
+            the started jobs.
+
+        Returns
+        -------
+        submission_ids: list of str
+            the IDs passed to the scheduler commands.
+        """
+        return [job.submission_id for job in jobs]
 
     @abstractmethod
     def read_jobid(self, string):
@@ -405,8 +1401,8 @@ class DelayedJob(ABC):
         """
 
     @abstractmethod
-    def generate_batch(self):
-        """ Write the batch file.
+    def render_batch(self):
+        """ Return the batch script.
         """
 
     @property
@@ -422,6 +1418,115 @@ class DelayedJob(ABC):
         """
 
 
+def sha256sum(path, chunk_size=2 ** 20):
+    """ Computes the SHA-256 checksum of a file.
+
+    Parameters
+    ----------
+    path: Path/str
+        the file.
+    chunk_size: int, default 1MB
+        the size of the chunks read from the file.
+
+    Returns
+    -------
+    checksum: str
+        the hexadecimal digest of the file.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as of:
+        for chunk in iter(lambda: of.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def slurm_number(value):
+    """ Reads a number from the Slurm JSON outputs.
+
+    Parameters
+    ----------
+    value: int or dict
+        a number, or a dictionary with the 'set', 'infinite' and 'number'
+        keys as in recent Slurm versions.
+
+    Returns
+    -------
+    number: int
+        the number, or None if not set.
+    """
+    if isinstance(value, dict):
+        if not value.get("set", True) or value.get("infinite", False):
+            return None
+        value = value.get("number")
+    return value
+
+
+def signal_name(signal):
+    """ Return the name of a signal without the 'SIG' prefix.
+
+    Parameters
+    ----------
+    signal: int or str
+        a signal number or name, e.g. `signal.SIGUSR1`, 'SIGUSR1' or
+        'USR1'.
+
+    Returns
+    -------
+    name: str
+        the signal name, e.g. 'USR1'.
+
+    Raises
+    ------
+    ValueError
+        If the signal is not known.
+    """
+    if isinstance(signal, str):
+        name = signal.upper().removeprefix("SIG")
+        if not hasattr(signals, f"SIG{name}"):
+            raise ValueError(f"Unknown signal: {signal}")
+        return name
+    return signals.Signals(signal).name.removeprefix("SIG")
+
+
+def batch_arguments(cmd, arguments, max_size=100000):
+    """ Split arguments in chunks so that each command line stays below the
+    system limit, and below `max_size` bytes so that it can also be passed
+    as a single shell argument (e.g. `sh -c` or `ssh`), which is limited to
+    128 KB on Linux.
+
+    Parameters
+    ----------
+    cmd: list of str
+        the command and its options.
+    arguments: list of str
+        the arguments to be passed to the command.
+    max_size: int, default 100000
+        the maximum size of a command line (in bytes).
+
+    Returns
+    -------
+    chunks: list of list of str
+        the arguments of each command line.
+    """
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (ValueError, OSError):
+        arg_max = 131072
+    # Keep half of the limit for the environment
+    limit = min(arg_max // 2, max_size) - sum(len(arg) + 9 for arg in cmd)
+    chunks, chunk, size = [], [], 0
+    for arg in arguments:
+        arg_size = len(arg) + 9
+        if len(chunk) > 0 and size + arg_size > limit:
+            chunks.append(chunk)
+            chunk, size = [], 0
+        chunk.append(arg)
+        size += arg_size
+    if len(chunk) > 0:
+        chunks.append(chunk)
+    return chunks
+
+
 def find_stack_level():
     """
     Find the first place in the stack that is not inside hopla.